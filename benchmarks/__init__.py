@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Performance benchmarks of the library.
+
+Run them from the project root:
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline results.json
+
+Results are JSON, one entry per benchmark with seconds per operation, so a
+run can be compared against a stored one. Some benchmarks have a budget,
+seconds per operation they must not exceed.
+"""
+
+from __future__ import absolute_import
+
+import json
+import platform
+import sys
+import time
+from timeit import default_timer
+
+__all__ = ["benchmark", "run", "compare", "over_budget"]
+__dir__ = __all__
+
+# (name, setup, budget) of every registered benchmark
+BENCHMARKS = []
+
+
+def benchmark(name, budget=None):
+    """Register a benchmark, with an optional budget of seconds per operation.
+
+    The decorated function prepares the inputs and returns a callable doing
+    the work and how many operations one call of it does.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup, budget))
+        return setup
+    return register
+
+
+def _measure(function, operations, repeat, min_time):
+    """Seconds per operation of each repetition."""
+    # one call to warm up caches and lazy loading
+    function()
+    timings = []
+    for _ in range(repeat):
+        calls = 0
+        start = default_timer()
+        elapsed = 0
+        while not calls or elapsed < min_time:
+            function()
+            calls += 1
+            elapsed = default_timer() - start
+        timings.append(elapsed / (calls * operations))
+    return timings
+
+
+def run(names=None, repeat=5, min_time=0.2):
+    """Run benchmarks, all of them or the ones starting by given names."""
+    # registers the benchmarks
+    from benchmarks import cases
+    results = {}
+    for name, setup, budget in BENCHMARKS:
+        if names and not any(name.startswith(n) for n in names):
+            continue
+        function, operations = setup()
+        timings = sorted(_measure(function, operations, repeat, min_time))
+        results[name] = {
+            "operations": operations,
+            "best": timings[0],
+            "median": timings[len(timings) // 2],
+            "worst": timings[-1],
+            "per_second": 1.0 / timings[len(timings) // 2],
+        }
+        if budget is not None:
+            results[name]["budget"] = budget
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "argv": sys.argv,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance=0.1):
+    """Compare median times of a report against a baseline one.
+
+    Returns a dict of benchmark name: ratio (current / baseline) and the
+    list of names slower than the baseline by more than tolerance.
+    """
+    ratios = {}
+    regressions = []
+    for name, result in sorted(report["results"].items()):
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        ratios[name] = result["median"] / base["median"]
+        if ratios[name] > 1 + tolerance:
+            regressions.append(name)
+    return ratios, regressions
+
+
+def over_budget(report):
+    """Names of the benchmarks whose median time is over their budget."""
+    return [name for name, result in sorted(report["results"].items())
+            if result.get("budget") is not None and result["median"] > result["budget"]]
+
+
+def load(path):
+    """Read a report stored as JSON."""
+    with open(path) as report:
+        return json.load(report)
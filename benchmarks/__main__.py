@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Command line of the benchmarks."""
+
+from __future__ import absolute_import
+
+import argparse
+import json
+import sys
+
+from benchmarks import accuracy, compare, load, over_budget, run
+
+
+def main(argv=None):
+    """Run benchmarks, print and optionally store or compare results."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description=__doc__)
+    parser.add_argument("names", nargs="*",
+                        help="run benchmarks starting by these names only")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against this JSON results")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="slowdown ratio considered a regression")
+    parser.add_argument("--accuracy", action="store_true",
+                        help="also report interpolation errors")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds of each repetition")
+    args = parser.parse_args(argv)
+
+    report = run(args.names, repeat=args.repeat, min_time=args.min_time)
+    if args.accuracy:
+        report["accuracy"] = accuracy.run()
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+
+    ratios, regressions = {}, []
+    if args.baseline:
+        ratios, regressions = compare(report, load(args.baseline),
+                                      args.tolerance)
+    over = over_budget(report)
+    for name, result in sorted(report["results"].items()):
+        line = "%-45s %12.3f us/op %12.0f op/s" % (
+               name, result["median"] * 1e6, result["per_second"])
+        if name in ratios:
+            line += "  x%.2f%s" % (ratios[name],
+                                   " REGRESSION" if name in regressions else "")
+        if name in over:
+            line += "  OVER BUDGET of %.3f us/op" % (result["budget"] * 1e6)
+        print(line)
+    for name, columns in sorted(report.get("accuracy", {}).items()):
+        worst = max(columns, key=lambda column: columns[column]["median"])
+        print("%-45s median relative error %.2e, worst column %s %.2e" % (
+              name, sum(c["median"] for c in columns.values()) / len(columns),
+              worst, columns[worst]["median"]))
+    return 1 if regressions or over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Interpolation error of the tables.
+
+Each row is left out in turn and interpolated from the remaining ones, the
+difference to the left out row is the error of the interpolation method.
+Uniform resampling (see Table.resolution) is checked against every row.
+"""
+
+from __future__ import absolute_import
+
+import numpy
+
+from benchmarks.cases import UniformSaturatedWaterTable
+from substances.tables import SaturatedWaterTable
+from substances.tables.interpolation import monotone_cubic
+
+# (table, lookup column) to check
+LOOKUPS = [
+    (SaturatedWaterTable, "temperature"),
+    (SaturatedWaterTable, "pressure"),
+]
+
+
+def _linear(keys, table, value):
+    """Linear interpolation of every column at value."""
+    position = numpy.searchsorted(keys, value)
+    rate = (value - keys[position - 1]) / (keys[position] - keys[position - 1])
+    return table[position - 1] + (table[position] - table[position - 1]) * rate
+
+
+def _cubic(keys, table, value):
+    """Monotone cubic interpolation of every column at value."""
+    position = numpy.searchsorted(keys, value)
+    a, b, c, d = monotone_cubic(keys, table)[position - 1].T
+    t = value - keys[position - 1]
+    return a + t * (b + t * (c + t * d))
+
+
+METHODS = {"linear": _linear, "cubic": _cubic}
+
+
+def leave_one_out(table, property_name, method):
+    """Relative errors of each left out row, one row per inner table row."""
+    keys, rows = table._array_index(property_name)
+    errors = []
+    for left_out in range(1, len(keys) - 1):
+        kept = numpy.arange(len(keys)) != left_out
+        found = METHODS[method](keys[kept], rows[kept], keys[left_out])
+        expected = rows[left_out]
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            error = numpy.abs(found - expected) / numpy.abs(expected)
+        errors.append(numpy.where(expected == 0, numpy.abs(found), error))
+    return numpy.array(errors)
+
+
+def _summary(errors, columns):
+    """Max, mean and median of each column of errors."""
+    return dict((column, {"max": float(errors[:, i].max()),
+                          "mean": float(errors[:, i].mean()),
+                          "median": float(numpy.median(errors[:, i]))})
+                for i, column in enumerate(columns))
+
+
+def run():
+    """Max, mean and median errors of every method, lookup and column.
+
+    Leave-one-out errors of each method are named after the table and the
+    method, resampling errors of the uniform table after its resolution,
+    e.g. saturated_water_temperature.uniform1024. Errors are relative, or
+    absolute where the row value is 0.
+    """
+    results = {}
+    for table, property_name in LOOKUPS:
+        columns = table.columns()
+        for method in sorted(METHODS):
+            errors = leave_one_out(table, property_name, method)
+            name = "%s.%s" % (table._table_of(property_name), method)
+            results[name] = _summary(errors, columns)
+        errors = UniformSaturatedWaterTable.resampling_errors(property_name)
+        name = "%s.uniform%d" % (table._table_of(property_name),
+                                 UniformSaturatedWaterTable.resolution)
+        results[name] = _summary(errors, columns)
+    return results
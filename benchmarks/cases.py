@@ -0,0 +1,465 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmarks of table lookups, units, substances and containers."""
+
+from __future__ import absolute_import
+
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import benchmark
+from containers import Flask
+from models import Graph
+from properties import SpecificEnthalpy
+from substances import SaturatedWater, SaturatedSteam
+from substances.tables import SaturatedWaterTable, SuperheatedSteamTable
+from units import convert
+from units.all import (Bar, Celcius, CubicMeterPerKiloGram, Fahrenheit,
+                       KiloGram, KiloPascal, KJPerKg, Liter, PSI, Atmosphere)
+
+# inputs of each benchmark
+SAMPLES = 1000
+# directory with the packages
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CubicSaturatedWaterTable(SaturatedWaterTable):
+    """Same table, cubic interpolation."""
+
+    interpolation = "cubic"
+
+
+class UniformSaturatedWaterTable(SaturatedWaterTable):
+    """Same table, resampled on a uniform grid."""
+
+    resolution = 1024
+
+
+def _random():
+    """Random generator with fixed seed, runs see the same inputs."""
+    return random.Random(1234)
+
+
+def temperatures():
+    """Uniform temperatures (°C) over the table range."""
+    low, high = SaturatedWaterTable.range("temperature")
+    rand = _random()
+    return [rand.uniform(low, high) for _ in range(SAMPLES)]
+
+
+def pressures():
+    """Pressures (kPa) uniform on log scale, as table rows are."""
+    low, high = SaturatedWaterTable.range("pressure")
+    rand = _random()
+    return [math.exp(rand.uniform(math.log(low), math.log(high)))
+            for _ in range(SAMPLES)]
+
+
+def enthalpies():
+    """Uniform liquid enthalpies (kJ/kg) over the table range."""
+    low, high = SaturatedWaterTable.range("enthalpy_liquid")
+    rand = _random()
+    return [rand.uniform(low, high) for _ in range(SAMPLES)]
+
+
+def table_temperatures():
+    """Temperatures (°C) present on the table rows, exact hits."""
+    rows = [row[0] for row in SaturatedWaterTable._load()]
+    rand = _random()
+    return [rand.choice(rows) for _ in range(SAMPLES)]
+
+
+@benchmark("table.find_state.exact")
+def find_state_exact():
+    values = table_temperatures()
+
+    def run():
+        for value in values:
+            SaturatedWaterTable.find_state("temperature", value)
+    return run, len(values)
+
+
+@benchmark("table.find_state.interpolated.temperature")
+def find_state_temperature():
+    values = temperatures()
+
+    def run():
+        for value in values:
+            SaturatedWaterTable.find_state("temperature", value)
+    return run, len(values)
+
+
+@benchmark("table.find_state.interpolated.pressure")
+def find_state_pressure():
+    values = pressures()
+
+    def run():
+        for value in values:
+            SaturatedWaterTable.find_state("pressure", value)
+    return run, len(values)
+
+
+@benchmark("table.find_state.cubic.temperature")
+def find_state_cubic_temperature():
+    values = temperatures()
+
+    def run():
+        for value in values:
+            CubicSaturatedWaterTable.find_state("temperature", value)
+    return run, len(values)
+
+
+@benchmark("table.find_state.cubic.pressure")
+def find_state_cubic_pressure():
+    values = pressures()
+
+    def run():
+        for value in values:
+            CubicSaturatedWaterTable.find_state("pressure", value)
+    return run, len(values)
+
+
+@benchmark("table.find_states.cubic.temperature")
+def find_states_cubic_temperature():
+    values = temperatures()
+
+    def run():
+        CubicSaturatedWaterTable.find_states("temperature", values)
+    return run, len(values)
+
+
+@benchmark("table.find_state.uniform.temperature")
+def find_state_uniform_temperature():
+    values = temperatures()
+
+    def run():
+        for value in values:
+            UniformSaturatedWaterTable.find_state("temperature", value)
+    return run, len(values)
+
+
+@benchmark("table.find_state.uniform.pressure")
+def find_state_uniform_pressure():
+    values = pressures()
+
+    def run():
+        for value in values:
+            UniformSaturatedWaterTable.find_state("pressure", value)
+    return run, len(values)
+
+
+@benchmark("table.find_states.uniform.temperature")
+def find_states_uniform_temperature():
+    values = temperatures()
+
+    def run():
+        UniformSaturatedWaterTable.find_states("temperature", values)
+    return run, len(values)
+
+
+@benchmark("table.find_state.columns.temperature")
+def find_state_columns_temperature():
+    values = temperatures()
+
+    def run():
+        for value in values:
+            SaturatedWaterTable.find_state("temperature", value, ["pressure"])
+    return run, len(values)
+
+
+@benchmark("table.find_states.columns.temperature")
+def find_states_columns_temperature():
+    values = temperatures()
+
+    def run():
+        SaturatedWaterTable.find_states("temperature", values, columns=["pressure"])
+    return run, len(values)
+
+
+@benchmark("table.find_states.temperature")
+def find_states_temperature():
+    values = temperatures()
+
+    def run():
+        SaturatedWaterTable.find_states("temperature", values)
+    return run, len(values)
+
+
+@benchmark("table.find_all_states")
+def find_all_states():
+    low, high = SaturatedWaterTable.range("enthalpy_vapor")
+    rand = _random()
+    values = [rand.uniform(low, high) for _ in range(SAMPLES)]
+
+    def run():
+        for value in values:
+            SaturatedWaterTable.find_all_states("enthalpy_vapor", value)
+    return run, len(values)
+
+
+def superheated_points():
+    """Pressures (kPa) and temperatures (°C) of superheated steam."""
+    rand = _random()
+    points = []
+    while len(points) < SAMPLES:
+        point = rand.uniform(10, 10000), rand.uniform(350, 800)
+        try:
+            SuperheatedSteamTable.find_state(*point)
+        except Exception:
+            continue
+        points.append(point)
+    return points
+
+
+@benchmark("table.grid.find_state")
+def grid_find_state():
+    points = superheated_points()
+
+    def run():
+        for point in points:
+            SuperheatedSteamTable.find_state(*point)
+    return run, len(points)
+
+
+@benchmark("table.grid.find_states")
+def grid_find_states():
+    pressures, temperatures = zip(*superheated_points())
+
+    def run():
+        SuperheatedSteamTable.find_states(pressures, temperatures)
+    return run, len(pressures)
+
+
+@benchmark("substance.water.temperature")
+def water_temperature():
+    values = [Celcius(value) for value in temperatures()]
+
+    def run():
+        for value in values:
+            SaturatedWater(value).enthalpy
+    return run, len(values)
+
+
+@benchmark("substance.water.pressure")
+def water_pressure():
+    values = [KiloPascal(value) for value in pressures()]
+
+    def run():
+        for value in values:
+            SaturatedWater(value).enthalpy
+    return run, len(values)
+
+
+@benchmark("substance.water.attributes")
+def water_attributes():
+    values = [Celcius(value) for value in temperatures()]
+
+    def run():
+        for value in values:
+            SaturatedWater(value, attributes=("pressure", )).pressure
+    return run, len(values)
+
+
+@benchmark("substance.water.enthalpy")
+def water_enthalpy():
+    values = [SpecificEnthalpy(KJPerKg(value)) for value in enthalpies()]
+
+    def run():
+        for value in values:
+            SaturatedWater(value).temperature
+    return run, len(values)
+
+
+@benchmark("substance.steam.temperature")
+def steam_temperature():
+    values = [Celcius(value) for value in temperatures()]
+
+    def run():
+        for value in values:
+            SaturatedSteam(value).enthalpy
+    return run, len(values)
+
+
+@benchmark("substance.steam.pressure")
+def steam_pressure():
+    values = [KiloPascal(value) for value in pressures()]
+
+    def run():
+        for value in values:
+            SaturatedSteam(value).enthalpy
+    return run, len(values)
+
+
+@benchmark("substance.steam.enthalpy")
+def steam_enthalpy():
+    low, high = SaturatedWaterTable.branches("enthalpy_vapor")[0]
+    rand = _random()
+    values = [SpecificEnthalpy(KJPerKg(rand.uniform(low, high))) for _ in range(SAMPLES)]
+
+    def run():
+        for value in values:
+            SaturatedSteam(value, branch=0).temperature
+    return run, len(values)
+
+
+@benchmark("units.pressure.chain")
+def pressure_chain():
+    values = [Bar(value / 100.0) for value in pressures()]
+
+    def run():
+        for value in values:
+            Bar(Atmosphere(PSI(KiloPascal(value)))).kPa.psi
+    return run, len(values)
+
+
+@benchmark("units.temperature.chain")
+def temperature_chain():
+    values = [Celcius(value) for value in temperatures()]
+
+    def run():
+        for value in values:
+            Celcius(Fahrenheit(value)).kelvin.fahrenheit
+    return run, len(values)
+
+
+@benchmark("units.convert")
+def convert_scalars():
+    values = temperatures()
+
+    def run():
+        for value in values:
+            convert(value, Celcius, Fahrenheit)
+    return run, len(values)
+
+
+@benchmark("units.arithmetic")
+def arithmetic():
+    values = [KiloPascal(value) for value in pressures()]
+    step = Bar(0.01)
+
+    def run():
+        for value in values:
+            (value + step - step) * 2
+    return run, len(values)
+
+
+@benchmark("units.products")
+def products():
+    rand = _random()
+    values = [(CubicMeterPerKiloGram(rand.uniform(0.001, 200)),
+               KiloGram(rand.uniform(0.1, 100))) for _ in range(SAMPLES)]
+
+    def run():
+        for volume, mass in values:
+            (volume * mass).liter / volume
+    return run, len(values)
+
+
+@benchmark("containers.flask.create")
+def flask_create():
+    rand = _random()
+    substances = [SaturatedWater(Celcius(value)) for value in temperatures()]
+    values = [(substance, KiloGram(rand.uniform(0.1, 100)))
+              for substance in substances]
+
+    def run():
+        for substance, mass in values:
+            Flask(substance, mass)
+    return run, len(values)
+
+
+@benchmark("containers.flask.create.volume")
+def flask_create_volume():
+    rand = _random()
+    substances = [SaturatedWater(Celcius(value)) for value in temperatures()]
+    values = [(substance, Liter(rand.uniform(0.1, 100)))
+              for substance in substances]
+
+    def run():
+        for substance, volume in values:
+            Flask(substance, volume)
+    return run, len(values)
+
+
+@benchmark("containers.flask.add")
+def flask_add():
+    rand = _random()
+    # hot and cold streams that mix within the table range
+    flasks = [(Flask(SaturatedWater(Celcius(rand.uniform(5, 100))),
+                     KiloGram(rand.uniform(0.1, 10))),
+               Flask(SaturatedWater(Celcius(rand.uniform(100, 300))),
+                     KiloGram(rand.uniform(0.1, 10))))
+              for _ in range(SAMPLES)]
+
+    def run():
+        for cold, hot in flasks:
+            cold + hot
+    return run, len(flasks)
+
+
+def _cycle():
+    """Graph of a simple steam cycle."""
+    cycle = Graph()
+    cycle.input("condenser_pressure")
+    cycle.input("boiler_pressure")
+    cycle.input("mass")
+    cycle.node("condensate", SaturatedWater, "condenser_pressure")
+    cycle.node("steam", SaturatedSteam, "boiler_pressure")
+    cycle.node("feed", lambda water, mass: water * mass, "condensate", "mass")
+    cycle.node("heat", lambda steam, water: steam.enthalpy - water.enthalpy,
+               "steam", "condensate")
+    return cycle
+
+
+@benchmark("models.update")
+def model_update():
+    """One input changed on each model, then its outputs read."""
+    cycle = _cycle()
+    values = [KiloPascal(value) for value in pressures()]
+    models = [cycle.model(condenser_pressure=KiloPascal(10), boiler_pressure=Bar(80),
+                          mass=KiloGram(1)) for _ in values]
+
+    # new instances each run, same values are not a change
+    values = [(value, KiloPascal(value)) for value in values]
+    runs = [0]
+
+    def run():
+        runs[0] += 1
+        for model, value in zip(models, values):
+            model.set(condenser_pressure=value[runs[0] % 2])
+            model["heat"]
+            model["feed"]
+    return run, len(models)
+
+
+def _startup(code):
+    """Run code on a new interpreter, out of the project directory."""
+    command = [sys.executable, "-c", code]
+    path = os.environ.get("PYTHONPATH")
+    environment = dict(os.environ, PYTHONPATH=ROOT + (os.pathsep + path if path else ""))
+
+    def run():
+        subprocess.check_call(command, cwd=tempfile.gettempdir(), env=environment)
+    return run, 1
+
+
+@benchmark("startup.interpreter")
+def startup_interpreter():
+    """Reference for the other startup ones, the interpreter alone."""
+    return _startup("pass")
+
+
+@benchmark("startup.import", budget=0.05)
+def startup_import():
+    return _startup("import substances")
+
+
+@benchmark("startup.first_state", budget=0.25)
+def startup_first_state():
+    return _startup("from substances import SaturatedWater\n"
+                    "from units.all import Celcius\n"
+                    "SaturatedWater(Celcius(50)).enthalpy")
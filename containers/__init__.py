@@ -2,8 +2,15 @@
 # -*- coding: utf-8 -*-
 """Conteiners for substances."""
 
-from units.amount import Volume, Mass
-from properties import Enthalpy
+from __future__ import absolute_import
+
+import numpy
+
+from instrumentation import instrumented
+from units.amount import Volume, Mass, KiloGram
+from units.arrays import QuantityArray
+from units.energy import KJPerKg, KiloJoule
+from properties import Enthalpy, SpecificEnthalpy
 
 
 class UnsuportedOperation(Exception):
@@ -23,11 +30,24 @@ class Flask(object):
     volume = None
     energy = None
     enthalpy = None
+    # records fills, additions and mixes, see instrumentation
+    instruments = None
 
+    @instrumented
     def __init__(self, substance, amount):
-        """Fill the flask with given amount of substance."""
+        """Fill the flask with given amount of substance.
+
+        The amount can also be a QuantityArray of masses or volumes, then
+        mass, volume, energy and enthalpy are arrays as well.
+        """
         self.substance = substance
-        if isinstance(amount, Volume):
+        if isinstance(amount, QuantityArray):
+            if amount.property_name == "volume":
+                self._update_by_volume(amount)
+                self._update_by_mass(self.mass)
+            elif amount.property_name == "mass":
+                self._update_by_mass(amount)
+        elif isinstance(amount, Volume):
             self._update_by_volume(amount)
             self._update_by_mass(self.mass)
         elif isinstance(amount, Mass):
@@ -41,6 +61,12 @@ class Flask(object):
     def _update_by_mass(self, mass):
         """Update all attributes due volume changes."""
         self.mass = mass
+        if isinstance(mass, QuantityArray):
+            # scalar units can't multiply arrays, so arrays go first
+            self.volume = (mass * self.substance.volume).liter
+            self.energy = mass * self.substance.energy
+            self.enthalpy = Enthalpy(mass * self.substance.enthalpy.specific_energy)
+            return
         self.volume = (self.substance.volume * mass).liter
         self.energy = self.substance.energy * mass
         self.enthalpy = Enthalpy(self.substance.enthalpy * mass)
@@ -57,6 +83,7 @@ class Flask(object):
         """Short representation."""
         return self.__str__()
 
+    @instrumented
     def __add__(self, added):
         """Add flasks of same substance."""
         if isinstance(added, self.__class__):
@@ -70,3 +97,131 @@ class Flask(object):
                 raise UnsuportedOperation()
         else:
             raise UnsuportedOperation()
+
+    @classmethod
+    @instrumented
+    def mix(cls, flasks):
+        """Mix any amount of flasks of the same substance at once.
+
+        Mass and enthalpy are summed in one pass and the state of the mix
+        is looked up once, instead of once per addition. Flasks of arrays
+        count as many flasks.
+        """
+        substance = None
+        mass = enthalpy = 0.0
+        for flask in flasks:
+            if not isinstance(flask, Flask):
+                raise UnsuportedOperation()
+            if substance is None:
+                substance = flask.substance.__class__
+            elif flask.substance.__class__ != substance:
+                raise UnsuportedOperation()
+            mass += numpy.sum(flask.mass.base_value)
+            enthalpy += numpy.sum(QuantityArray(flask.enthalpy.energy, KiloJoule).value)
+        if substance is None:
+            raise ValueError("There are no flasks to mix")
+        specific_enthalpy = SpecificEnthalpy(KJPerKg(enthalpy / mass))
+        return cls(substance(specific_enthalpy), KiloGram(mass))
+
+
+class FlaskArray(object):
+    """Many flasks of one substance, kept as columns of arrays.
+
+        flasks = FlaskArray(SaturatedWater, temperatures, masses, Celcius)
+
+    ``values`` are the states of each flask, anything the substance
+    find_states() takes, and ``amount`` a QuantityArray of masses or
+    volumes. Mass, volume, energy and enthalpy are arrays, like on a Flask
+    of arrays; mixing and splitting work on all flasks at once.
+    """
+
+    __slots__ = ("substance", "states", "mass", "volume", "energy", "enthalpy")
+    # records fills, mixes and splits, see instrumentation
+    instruments = None
+
+    @instrumented
+    def __init__(self, substance, values, amount, unit=None):
+        """Fill the flasks with given amounts of substance states."""
+        states = substance.find_states(values, unit)
+        if amount.property_name == "volume":
+            amount = amount / substance._quantities(states)["volume"]
+        self._fill(substance, states, amount)
+
+    @classmethod
+    def _from_states(cls, substance, states, mass):
+        """Flasks of already known table states."""
+        flasks = cls.__new__(cls)
+        flasks._fill(substance, states, mass)
+        return flasks
+
+    def _fill(self, substance, states, mass):
+        """Set all attributes from the states and masses."""
+        self.substance = substance
+        self.states = states
+        self.mass = QuantityArray(mass, KiloGram)
+        quantities = substance._quantities(states)
+        self.volume = (self.mass * quantities["volume"]).liter
+        self.energy = self.mass * quantities["energy"]
+        self.enthalpy = Enthalpy(self.mass * quantities["enthalpy"])
+
+    def __len__(self):
+        """Amount of flasks."""
+        return len(self.states)
+
+    def __getitem__(self, key):
+        """Flask for an index, FlaskArray for slices and masks."""
+        states = self.states[key]
+        if states.ndim == 1:
+            return Flask(self.substance._from_state(states),
+                         KiloGram(self.mass.value[key]))
+        return self._from_states(self.substance, states, self.mass.value[key])
+
+    def __iter__(self):
+        """Iterate over flasks."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def __unicode__(self):
+        """Unicode representation."""
+        return u"%d flasks of %s" % (len(self), self.substance.name)
+
+    def __str__(self):
+        """String representation."""
+        return self.__unicode__().encode("utf-8")
+
+    def __repr__(self):
+        """Short representation."""
+        return self.__str__()
+
+    @instrumented
+    def mix(self, groups=None):
+        """Mix flasks, all of them in one Flask or by groups.
+
+        ``groups`` has a label for each flask, flasks of the same label are
+        mixed together. Returns a FlaskArray with one flask per label, in
+        sorted label order, solved with a single batch lookup.
+        """
+        mass = self.mass.value
+        enthalpy = self.enthalpy.energy.to(KiloJoule).value
+        if groups is None:
+            specific_enthalpy = SpecificEnthalpy(KJPerKg(enthalpy.sum() / mass.sum()))
+            return Flask(self.substance(specific_enthalpy), KiloGram(mass.sum()))
+        labels, inverse = numpy.unique(groups, return_inverse=True)
+        mass = numpy.bincount(inverse, weights=mass, minlength=len(labels))
+        enthalpy = numpy.bincount(inverse, weights=enthalpy, minlength=len(labels))
+        states = self.substance.find_states(QuantityArray(enthalpy / mass, KJPerKg))
+        return self._from_states(self.substance, states, mass)
+
+    @instrumented
+    def split(self, fractions):
+        """Split each flask in two, return (taken, rest) FlaskArrays.
+
+        ``fractions`` is the mass fraction taken, one for all flasks or one
+        for each. States don't change, so there are no lookups.
+        """
+        fractions = numpy.asarray(fractions, dtype=float)
+        if ((fractions < 0) | (fractions > 1)).any():
+            raise ValueError("Fractions must be from 0 to 1")
+        mass = self.mass.value
+        return (self._from_states(self.substance, self.states, mass * fractions),
+                self._from_states(self.substance, self.states, mass * (1 - fractions)))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Opt-in instrumentation of table lookups, substance states and flasks.
+
+Table, SaturationLineWater, Flask and FlaskArray have an ``instruments``
+attribute, None by default: then the only cost is checking it. Installed
+Instruments count calls, outcomes and latencies of their operations:
+
+    instruments = enable(callback=print_event)
+    ...
+    instruments.snapshot()
+    disable()
+
+    with profile() as instruments:
+        Flask.mix([SaturatedWater(Celcius(20)) * KiloGram(1),
+                   SaturatedWater(Celcius(80)) * KiloGram(2)])
+    print(instruments.report())
+
+Like a StateCache, Instruments can be set on a subclass only, like
+``SaturatedWaterTable.instruments = Instruments()``.
+"""
+
+from __future__ import absolute_import
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from timeit import default_timer as clock
+
+__all__ = ["Instruments", "instrumented", "enable", "disable", "profile",
+           "clock", "BOUNDS"]
+__dir__ = __all__
+
+# upper bounds of the latency histogram buckets, seconds: 1 µs to 1 s
+BOUNDS = tuple(1e-6 * 2 ** power for power in range(21))
+
+
+class Instruments(object):
+    """Counters of operations, thread safe.
+
+    Each operation, like "SaturatedWaterTable.find_state", has its calls,
+    outcomes ("exact", "interpolated", "out_of_range", "ok", exception
+    names...), total seconds, seconds spent on SQLite and a latency
+    histogram. Every callback is called as ``callback(operation, outcome,
+    seconds)`` on each record.
+    """
+
+    def __init__(self, callback=None):
+        """Empty counters, with an optional callback."""
+        self.callbacks = [callback] if callback is not None else []
+        self._lock = Lock()
+        self._operations = {}
+
+    def add_callback(self, callback):
+        """Call ``callback(operation, outcome, seconds)`` on each record."""
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """Stop calling a callback."""
+        self.callbacks.remove(callback)
+
+    def record(self, operation, outcome, seconds, sqlite_seconds=0.0):
+        """Count one call of an operation."""
+        with self._lock:
+            try:
+                counters = self._operations[operation]
+            except KeyError:
+                counters = self._operations[operation] = {
+                    "calls": 0, "outcomes": {}, "seconds": 0.0,
+                    "sqlite_seconds": 0.0, "histogram": [0] * (len(BOUNDS) + 1)}
+            counters["calls"] += 1
+            counters["outcomes"][outcome] = counters["outcomes"].get(outcome, 0) + 1
+            counters["seconds"] += seconds
+            counters["sqlite_seconds"] += sqlite_seconds
+            counters["histogram"][bisect_left(BOUNDS, seconds)] += 1
+        for callback in self.callbacks:
+            callback(operation, outcome, seconds)
+
+    def call(self, operation, function, *args, **kwargs):
+        """Call a function recording it as operation.
+
+        Outcome is "ok", or the name of the exception raised.
+        """
+        started = clock()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as error:
+            self.record(operation, error.__class__.__name__, clock() - started)
+            raise
+        self.record(operation, "ok", clock() - started)
+        return result
+
+    def snapshot(self):
+        """Copy of the counters, as a dict of operation: counters.
+
+        Python seconds are the ones out of SQLite. Histogram is a list of
+        (upper bound seconds, calls) of the buckets with calls, None bound
+        for the slower than the last one.
+        """
+        with self._lock:
+            snapshot = {}
+            for operation, counters in self._operations.items():
+                snapshot[operation] = dict(
+                    counters, outcomes=dict(counters["outcomes"]),
+                    python_seconds=counters["seconds"] - counters["sqlite_seconds"],
+                    mean_seconds=counters["seconds"] / counters["calls"],
+                    histogram=[(bound, calls) for bound, calls in
+                               zip(BOUNDS + (None, ), counters["histogram"]) if calls])
+            return snapshot
+
+    def reset(self):
+        """Drop all counters."""
+        with self._lock:
+            self._operations = {}
+
+    def report(self):
+        """Text table of the operations, slowest total first."""
+        lines = []
+        snapshot = self.snapshot()
+        for operation in sorted(snapshot, key=lambda o: -snapshot[o]["seconds"]):
+            counters = snapshot[operation]
+            lines.append("%-40s %8d calls %10.6f s %8.2f us/call  %s" % (
+                         operation, counters["calls"], counters["seconds"],
+                         counters["mean_seconds"] * 1e6,
+                         ", ".join("%s %d" % item for item in
+                                   sorted(counters["outcomes"].items()))))
+        return "\n".join(lines)
+
+
+def instrumented(method):
+    """Record calls of a method on the ``instruments`` of its class, if any.
+
+    Operation is named by class and method, like "Flask.mix". Works on
+    methods and, under @classmethod, on class methods.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instruments = self.instruments
+        if instruments is None:
+            return method(self, *args, **kwargs)
+        owner = self if isinstance(self, type) else self.__class__
+        return instruments.call("%s.%s" % (owner.__name__, method.__name__),
+                                method, self, *args, **kwargs)
+    return wrapper
+
+
+def _instrumented_classes():
+    """Base classes with an ``instruments`` attribute."""
+    from containers import Flask, FlaskArray
+    from substances.tables import Table
+    from substances.water import SaturationLineWater
+    return (Table, SaturationLineWater, Flask, FlaskArray)
+
+
+def enable(instruments=None, callback=None):
+    """Install Instruments on every instrumented class, and return them.
+
+    New ones are created unless ``instruments`` is given.
+    """
+    if instruments is None:
+        instruments = Instruments(callback)
+    elif callback is not None:
+        instruments.add_callback(callback)
+    for cls in _instrumented_classes():
+        cls.instruments = instruments
+    return instruments
+
+
+def disable():
+    """Remove Instruments of every instrumented class."""
+    for cls in _instrumented_classes():
+        cls.instruments = None
+
+
+@contextmanager
+def profile(callback=None):
+    """Record library calls of a block on new Instruments.
+
+    The ones installed before, if any, are back after the block. This is
+    process wide, calls of other threads during the block are recorded too.
+    """
+    classes = _instrumented_classes()
+    previous = [cls.instruments for cls in classes]
+    instruments = enable(callback=callback)
+    try:
+        yield instruments
+    finally:
+        for cls, installed in zip(classes, previous):
+            cls.instruments = installed
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Models of many states, recomputed incrementally.
+
+A Graph declares inputs and nodes: a node is a function of inputs and
+other nodes, like a substance, a flask or a derived quantity. Nodes can
+only take names declared before them, so the declaration order is already
+an evaluation order:
+
+    cycle = Graph()
+    cycle.input("condenser_pressure")
+    cycle.input("boiler_pressure")
+    cycle.node("condensate", SaturatedWater, "condenser_pressure")
+    cycle.node("steam", SaturatedSteam, "boiler_pressure")
+    cycle.node("heat", lambda steam, water: steam.enthalpy - water.enthalpy,
+               "steam", "condensate")
+
+Models are instances of a graph, each with its own values. The graph is
+shared, so thousands of models cost their values only:
+
+    model = cycle.model(condenser_pressure=KiloPascal(10),
+                        boiler_pressure=Bar(80))
+    model["heat"]
+    model.set(condenser_pressure=KiloPascal(8))
+    model["heat"]        # condensate and heat are recomputed, steam isn't
+
+Nodes are computed on first read, and again only after one of their
+upstream inputs changes.
+"""
+
+from __future__ import absolute_import
+
+__all__ = ["Graph", "Model", "UnknownNode"]
+__dir__ = __all__
+
+
+class UnknownNode(Exception):
+    pass
+
+
+# value of nodes not computed yet
+_MISSING = object()
+
+
+class Graph(object):
+    """Declaration of inputs and nodes, shared by its models."""
+
+    def __init__(self):
+        """Empty graph."""
+        self.names = []
+        self._positions = {}
+        # position: function and positions of its arguments, None for inputs
+        self._functions = []
+        self._arguments = []
+        # position: positions of every node it depends on / depending on it,
+        # in declaration order, worked out on first use
+        self._upstream = None
+        self._downstream = None
+
+    def _position(self, name):
+        """Position of a declared name."""
+        try:
+            return self._positions[name]
+        except KeyError:
+            raise UnknownNode("%s is not declared" % name)
+
+    def _declare(self, name, function, arguments):
+        """Add a name at the end."""
+        if name in self._positions:
+            raise ValueError("%s is already declared" % name)
+        arguments = tuple(self._position(argument) for argument in arguments)
+        self._positions[name] = len(self.names)
+        self.names.append(name)
+        self._functions.append(function)
+        self._arguments.append(arguments)
+        self._upstream = self._downstream = None
+        return name
+
+    def input(self, name):
+        """Declare an input, set on the models."""
+        return self._declare(name, None, ())
+
+    def node(self, name, function, *arguments):
+        """Declare a node, ``function`` of the values of ``arguments`` names."""
+        return self._declare(name, function, arguments)
+
+    def _closures(self):
+        """Upstream and downstream positions of every position."""
+        if self._upstream is None:
+            upstream = []
+            for position, arguments in enumerate(self._arguments):
+                depends = set(arguments)
+                for argument in arguments:
+                    depends.update(upstream[argument])
+                upstream.append(depends)
+            downstream = [[] for _ in self.names]
+            for position, depends in enumerate(upstream):
+                for argument in depends:
+                    downstream[argument].append(position)
+            self._upstream = [sorted(depends) + [position]
+                              for position, depends in enumerate(upstream)]
+            self._downstream = downstream
+        return self._upstream, self._downstream
+
+    def model(self, **inputs):
+        """New model of this graph, with given input values."""
+        model = Model(self)
+        model.set(**inputs)
+        return model
+
+
+class Model(object):
+    """Values of one instance of a graph.
+
+    Names declared on the graph after the model was created are taken in
+    on first use. ``evaluations`` counts node computations, to check how
+    much a change costs.
+    """
+
+    __slots__ = ("graph", "_values", "evaluations")
+
+    def __init__(self, graph):
+        """Model with no input values yet."""
+        self.graph = graph
+        self._values = [_MISSING] * len(graph.names)
+        self.evaluations = 0
+
+    def _grown(self):
+        """Values, with room for the names declared since they were sized."""
+        values = self._values
+        missing = len(self.graph.names) - len(values)
+        if missing:
+            values.extend([_MISSING] * missing)
+        return values
+
+    def set(self, **inputs):
+        """Change input values, nodes depending on them are dropped."""
+        graph = self.graph
+        downstream = graph._closures()[1]
+        values = self._grown()
+        for name, value in inputs.items():
+            position = graph._position(name)
+            if graph._functions[position] is not None:
+                raise ValueError("%s is not an input" % name)
+            if values[position] is value:
+                continue
+            values[position] = value
+            for depending in downstream[position]:
+                values[depending] = _MISSING
+
+    def __getitem__(self, name):
+        """Value of a name, computing the nodes it needs."""
+        graph = self.graph
+        values = self._grown()
+        position = graph._position(name)
+        if values[position] is not _MISSING:
+            return values[position]
+        functions, arguments = graph._functions, graph._arguments
+        for needed in graph._closures()[0][position]:
+            if values[needed] is not _MISSING:
+                continue
+            function = functions[needed]
+            if function is None:
+                raise ValueError("Input %s is not set" % graph.names[needed])
+            values[needed] = function(*[values[argument] for argument
+                                        in arguments[needed]])
+            self.evaluations += 1
+        return values[position]
+
+    def values(self):
+        """Dict of every name and its value, computing missing ones."""
+        return dict((name, self[name]) for name in self.graph.names)
+
+    def __repr__(self):
+        """Short representation."""
+        values = self._grown()
+        computed = sum(value is not _MISSING for value in values)
+        return "<Model %d of %d values computed>" % (computed, len(values))
@@ -2,9 +2,11 @@
 # -*- coding: utf-8 -*-
 """Energy units."""
 
+from __future__ import absolute_import
+
 from units import UnitMismatch, UnlogicalOperation, UnitNotSupported, GenericUnit
 from units.amount import Mass
-from units.energy import Energy, SpecificEnergy
+from units.arrays import QuantityArray
 
 __all__ = ["Enthalpy"]
 __dir__ = __all__
@@ -13,13 +15,21 @@ __dir__ = __all__
 class GenericProperty(object):
     """Base model for properties"""
 
+    __slots__ = ("_base_unit", )
     property_name = ""
-    _base_unit = None
 
     def __init__(self, *args, **kwargs):
         """Can't instance."""
         raise UnitNotSupported("Cannot instance Property directly.")
 
+    def __getstate__(self):
+        """State for pickle, slots have no __dict__."""
+        return self._base_unit
+
+    def __setstate__(self, state):
+        """Restore pickled state."""
+        self._base_unit = state
+
     def __unicode__(self):
         """Unicode representation."""
         return u"%s (%s)" % (self._base_unit, self.property_name)
@@ -76,6 +86,8 @@ class GenericProperty(object):
 
     def __sub__(self, subtractor):
         """Subtraction method."""
+        if subtractor.__class__ is self.__class__:
+            return self.__class__(self._base_unit - subtractor._base_unit)
         return self + (subtractor * -1)
 
     def __isub__(self, subtractor):
@@ -87,11 +99,12 @@ class GenericProperty(object):
 class Enthalpy(GenericProperty):
     """Defines the enthalpy property of the system."""
 
+    __slots__ = ()
     property_name = "enthalpy"
 
     def __init__(self, energy):
-        """It is basicaly a measurement of energy."""
-        if not isinstance(energy, Energy):
+        """It is basicaly a measurement of energy, or an array of them."""
+        if getattr(energy, "property_name", None) != "energy":
             raise UnitMismatch("Energy instance is needed")
         self._base_unit = energy
 
@@ -102,7 +115,8 @@ class Enthalpy(GenericProperty):
 
     def __div__(self, divisor):
         """Division method."""
-        if isinstance(divisor, Mass):
+        if isinstance(divisor, Mass) or (isinstance(divisor, QuantityArray) and
+                                         divisor.property_name == "mass"):
             return SpecificEnthalpy(self._base_unit / divisor)
         return super(self.__class__, self).__div__(divisor)
 
@@ -110,11 +124,12 @@ class Enthalpy(GenericProperty):
 class SpecificEnthalpy(GenericProperty):
     """Defines the specific enthalpy property of a substance."""
 
+    __slots__ = ()
     property_name = "specific enthalpy"
 
     def __init__(self, specific_energy):
         """It is basicaly a measurement of energy rate of a substance."""
-        if not isinstance(specific_energy, SpecificEnergy):
+        if getattr(specific_energy, "property_name", None) != "specific_energy":
             raise UnitMismatch("SpecificEnergy instance is needed")
         self._base_unit = specific_energy
 
@@ -126,6 +141,6 @@ class SpecificEnthalpy(GenericProperty):
     def __mul__(self, multiplier):
         """Multiply method."""
         result = self._base_unit * multiplier
-        if isinstance(result, GenericUnit):
+        if isinstance(result, (GenericUnit, QuantityArray)):
             return result
         return self.__class__(result)
@@ -1,5 +1,46 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-"""Chemical substances and its properties."""
+"""Chemical substances and its properties.
 
-from water import SaturatedWater, SaturatedSteam, SaturationLineWater
+Substances are imported on first use, so importing the package (or one of
+its modules, like substances.stream) doesn't pull every module in.
+"""
+
+from __future__ import absolute_import
+
+import sys
+from importlib import import_module
+from types import ModuleType
+
+__all__ = ["SaturatedWater", "SaturatedSteam", "SaturationLineWater", "WetSteam",
+           "SuperheatedSteam", "CompressedWater"]
+
+# public name: module defining it
+_LAZY = dict((name, "substances.water") for name in __all__)
+
+
+class _Package(ModuleType):
+    """This package, importing the module of a public name on first use."""
+
+    def __getattr__(self, name):
+        """Import the module defining name, and keep it."""
+        try:
+            module = _LAZY[name]
+        except KeyError:
+            raise AttributeError("module %s has no attribute %s" % (self.__name__,
+                                                                     name))
+        value = getattr(import_module(module), name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        """Names of the package, imported or not."""
+        return sorted(set(self.__dict__) | set(_LAZY))
+
+
+_package = _Package(__name__, __doc__)
+_package.__dict__.update(globals())
+# the module dict would be cleared, globals of _Package methods included,
+# once the original module is gone
+_package._module = sys.modules[__name__]
+sys.modules[__name__] = _package
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Convert CSV or JSON lines readings into water/steam properties."""
+
+from __future__ import absolute_import
+
+import argparse
+import sys
+
+from substances.stream import (SUBSTANCES, convert_csv, convert_jsonl,
+                               unit_named)
+
+
+def main(argv=None):
+    """Stream readings from a file or stdin to a file or stdout."""
+    parser = argparse.ArgumentParser(prog="python -m substances",
+                                     description=__doc__)
+    parser.add_argument("substance", choices=sorted(SUBSTANCES))
+    parser.add_argument("column", help="column of the input values")
+    parser.add_argument("unit", help="unit of the input values, like Bar")
+    parser.add_argument("--input", help="readings file, stdin by default")
+    parser.add_argument("--output", help="results file, stdout by default")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="input and output format, by input extension "
+                             "or csv by default")
+    parser.add_argument("--outputs", nargs="+", metavar="ATTRIBUTE[:UNIT]",
+                        help="attributes to add, all of them by default")
+    parser.add_argument("--mixture-column",
+                        help="second input of WetSteam: quality, enthalpy or "
+                             "volume")
+    parser.add_argument("--mixture-unit",
+                        help="unit of the mixture column, none for quality")
+    parser.add_argument("--batch-size", type=int, default=10000,
+                        help="rows solved at once")
+    args = parser.parse_args(argv)
+
+    substance = SUBSTANCES[args.substance]
+    if (substance.__name__ == "WetSteam") != bool(args.mixture_column):
+        parser.error("--mixture-column is needed for WetSteam, and only for it")
+    file_format = args.format
+    if file_format is None:
+        file_format = "jsonl" if (args.input or "").endswith(".jsonl") else "csv"
+    convert = convert_jsonl if file_format == "jsonl" else convert_csv
+    try:
+        unit = unit_named(args.unit)
+        mixture_unit = unit_named(args.mixture_unit) if args.mixture_unit else None
+        input = open(args.input, "rb") if args.input else sys.stdin
+        output = open(args.output, "wb") if args.output else sys.stdout
+    except (IOError, ValueError) as error:
+        parser.error(str(error))
+    try:
+        convert(input, output, substance, args.column, unit, args.outputs,
+                batch_size=args.batch_size, mixture_column=args.mixture_column,
+                mixture_unit=mixture_unit)
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        if args.input:
+            input.close()
+        if args.output:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
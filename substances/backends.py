@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Where substances get their states from.
+
+Each substance class has backends by name (see ``_backends``):
+
+- ``table``: its table, as configured (in memory, SQLite, cached).
+- ``memory``: its table, always on the in memory index.
+- ``sqlite``: its table, always querying the SQLite file.
+- ``if97``: IAPWS-IF97 correlations on NumPy, no table at all.
+
+Backends return the same columns, in the same units, as the table, or
+only the ``columns`` asked for. The one used is the ``backend`` argument
+of the call, else the ``backend`` attribute of the substance class, else
+the global default:
+
+    set_default("if97")
+    SaturatedWater(Celcius(50), backend="sqlite")
+
+Columns that turn along the saturation line, like ``enthalpy_vapor``, are
+looked up on one of their monotone branches, see Table.branches().
+
+Substances without the default backend keep using ``table``. How far
+backends are from each other is reported by cross_check(), or with:
+
+    python -m substances.backends
+"""
+
+from __future__ import absolute_import
+
+import sys
+
+import numpy
+
+from substances.tables import OutOfTableRange, if97
+
+__all__ = ["UnknownBackend", "TableBackend", "SaturationIF97", "SinglePhaseIF97",
+           "default", "set_default", "cross_check", "main"]
+__dir__ = __all__
+
+_default = "table"
+
+
+class UnknownBackend(Exception):
+    pass
+
+
+def default():
+    """Name of the backend used when neither call nor substance say one."""
+    return _default
+
+
+def set_default(name):
+    """Use given backend by default, ``table`` is the initial one."""
+    global _default
+    _default = name
+
+
+def _masked(states, outside, masked, message):
+    """Raise OutOfTableRange for outside rows, or mask them out."""
+    if outside.any() and not masked:
+        raise OutOfTableRange(message)
+    if masked:
+        mask = numpy.repeat(outside, states.shape[-1]).reshape(states.shape)
+        states = numpy.ma.masked_array(states, mask=mask)
+    return states
+
+
+def _project(states, names, columns, backend):
+    """Given columns of states, names being the ones of its last axis."""
+    if columns is None:
+        return states
+    for column in columns:
+        if column not in names:
+            raise UnknownBackend("%s has no %s column" % (backend, column))
+    return states[..., [names.index(column) for column in columns]]
+
+
+class TableBackend(object):
+    """States looked up on a table, see substances.tables.Table.
+
+    ``mode`` None uses the table as it is configured, ``memory`` or
+    ``sqlite`` force the in memory index or the SQLite file.
+    """
+
+    def __init__(self, table, mode=None):
+        """Backend of given table class."""
+        if mode not in (None, "memory", "sqlite"):
+            raise ValueError("mode must be None, memory or sqlite")
+        self.table = table
+        self.mode = mode
+
+    def find_state(self, *keys, **options):
+        """Table state of given keys, like table.find_state()."""
+        if self.mode == "memory":
+            return self.table._find_state_memory(*keys, **options)
+        elif self.mode == "sqlite":
+            return self.table._find_state_sqlite(*keys, **options)
+        return self.table.find_state(*keys, **options)
+
+    def find_states(self, *keys, **options):
+        """Table states of arrays of keys, like table.find_states()."""
+        if self.mode != "sqlite":
+            return self.table.find_states(*keys, **options)
+        return self._query_states(keys[0], keys[1], options.get("masked"),
+                                  options.get("columns"))
+
+    def _query_states(self, property_name, values, masked, columns, branch=None):
+        """States of an array of values, one query per value."""
+        values = numpy.asarray(values, dtype=float)
+        width = len(self.table.columns() if columns is None else columns)
+        states = numpy.full(values.shape + (width, ), numpy.nan)
+        outside = numpy.zeros(values.shape, dtype=bool)
+        for position, value in numpy.ndenumerate(values):
+            try:
+                states[position] = self.table._find_state_sqlite(property_name, value,
+                                                                 columns, branch)
+            except OutOfTableRange:
+                outside[position] = True
+        return _masked(states, outside, masked,
+                       "%d values for %s are out of table: %s" % (
+                           outside.sum(), property_name, values[outside]))
+
+    def branches(self, property_name):
+        """Monotone branches of a column, like table.branches()."""
+        return self.table.branches(property_name)
+
+    def find_branch_state(self, property_name, value, branch, columns=None):
+        """Table state on one branch of a column, see Table.find_branch_state."""
+        if self.mode is None:
+            return self.table.find_branch_state(property_name, value, branch, columns)
+        branch = self.table._branch_number(property_name, branch)
+        return self.find_state(property_name, value, columns=columns, branch=branch)
+
+    def find_branch_states(self, property_name, values, branch, masked=False,
+                           columns=None):
+        """Table states on one branch of a column, see Table.find_branch_states."""
+        if self.mode != "sqlite":
+            return self.table.find_branch_states(property_name, values, branch, masked,
+                                                 columns)
+        return self._query_states(property_name, values, masked, columns,
+                                  self.table._branch_number(property_name, branch))
+
+    def find_all_states(self, property_name, value, columns=None):
+        """Table states of every branch, like table.find_all_states()."""
+        if self.mode is None:
+            return self.table.find_all_states(property_name, value, columns)
+        states = []
+        for branch, (low, high) in enumerate(self.branches(property_name)):
+            if low <= value <= high:
+                state = self.find_branch_state(property_name, value, branch, columns)
+                if not states or not numpy.allclose(states[-1], state):
+                    states.append(state)
+        return states
+
+
+class SaturationIF97(object):
+    """Saturation line states from the IAPWS-IF97 correlations.
+
+    Columns are the ones of SaturatedWaterTable, in the same units, from
+    the triple point to the critical one. Temperature and pressure are
+    solved with the saturation equations, other columns (like
+    ``enthalpy_liquid``) by bisection on temperature, on each monotone
+    branch of the column for the branch lookups. Every column is
+    computed, even when only some are asked for.
+    """
+
+    columns = ("temperature", "pressure", "volume_liquid", "volume_vapor",
+               "energy_liquid", "energy_vaporisation", "energy_vapor",
+               "enthalpy_liquid", "enthalpy_vaporisation", "enthalpy_vapor",
+               "entropy_liquid", "entropy_vaporization", "entropy_vapor")
+    # Kelvin
+    minimum = 273.15
+    maximum = if97.CRITICAL_TEMPERATURE
+    # temperatures sampled to split columns into their monotone branches
+    samples = 4001
+
+    def __init__(self):
+        """Backend with no branches worked out yet."""
+        # column: (low, high) Kelvin of each branch
+        self._branches = {}
+
+    def _states(self, kelvin):
+        """Rows of every column at given temperatures."""
+        pressure, liquid, vapor = if97.saturation(kelvin)
+        (vf, uf, hf, sf), (vg, ug, hg, sg) = liquid, vapor
+        return numpy.stack([kelvin - 273.15, pressure * 1000, vf, vg, uf, ug - uf, ug,
+                            hf, hg - hf, hg, sf, sg - sf, sg], axis=-1)
+
+    def _temperatures(self, property_name, values, low=None, high=None):
+        """Kelvin of the saturation states of given column values.
+
+        Other columns than temperature and pressure are solved between
+        ``low`` and ``high`` Kelvin, the whole line by default.
+        """
+        if property_name == "temperature":
+            return values + 273.15
+        elif property_name == "pressure":
+            with numpy.errstate(invalid="ignore"):
+                return if97.saturation_temperature(values / 1000.0)
+        if property_name not in self.columns:
+            raise UnknownBackend("if97 has no %s column" % property_name)
+        column = self.columns.index(property_name)
+        low = self.minimum if low is None else low
+        high = self.maximum if high is None else high
+        ends = self._states(numpy.array([low, high]))[:, column]
+        increasing = ends[1] > ends[0]
+        low = numpy.full(values.shape, low)
+        high = numpy.full(values.shape, high)
+        for _ in range(60):
+            middle = (low + high) / 2
+            with numpy.errstate(invalid="ignore"):
+                above = (self._states(middle)[..., column] > values) == increasing
+            high = numpy.where(above, middle, high)
+            low = numpy.where(above, low, middle)
+        return (low + high) / 2
+
+    def _branch_temperatures(self, property_name):
+        """Kelvin ranges of the monotone branches of a column, in order.
+
+        Worked out once per column, on ``samples`` temperatures, so turns
+        are known to a fraction of Kelvin.
+        """
+        try:
+            return self._branches[property_name]
+        except KeyError:
+            pass
+        if property_name not in self.columns:
+            raise UnknownBackend("if97 has no %s column" % property_name)
+        kelvin = numpy.linspace(self.minimum, self.maximum, self.samples)
+        steps = numpy.sign(numpy.diff(self._states(kelvin)[:, self.columns.index(
+                                                               property_name)]))
+        turns = [number for number in range(1, len(steps))
+                 if steps[number] * steps[number - 1] < 0]
+        bounds = [self.minimum] + [kelvin[turn] for turn in turns] + [self.maximum]
+        branches = self._branches[property_name] = list(zip(bounds[:-1], bounds[1:]))
+        return branches
+
+    def _branch_range(self, property_name, branch):
+        """Kelvin range of one branch of a column."""
+        branches = self._branch_temperatures(property_name)
+        try:
+            return branches[branch]
+        except IndexError:
+            raise ValueError("%s has %d branches, there is no branch %s" % (
+                             property_name, len(branches), branch))
+
+    def find_states(self, property_name, values, masked=False, columns=None):
+        """Saturation states of an array of values, see Table.find_states."""
+        return self._find_states(property_name, values, masked, columns)
+
+    def _find_states(self, property_name, values, masked, columns, low=None,
+                     high=None):
+        """Saturation states of values solved between low and high Kelvin."""
+        values = numpy.asarray(values, dtype=float)
+        kelvin = self._temperatures(property_name, values, low, high)
+        with numpy.errstate(invalid="ignore"):
+            outside = ~((kelvin >= self.minimum) & (kelvin <= self.maximum))
+        states = self._states(numpy.where(outside, self.minimum, kelvin))
+        if property_name not in ("temperature", "pressure"):
+            # bisection gives the nearest end to values out of the line
+            found = states[..., self.columns.index(property_name)]
+            with numpy.errstate(invalid="ignore"):
+                outside |= ~(numpy.abs(found - values) <= 1e-6 * numpy.abs(values))
+        outside |= numpy.isnan(states).any(axis=-1)
+        states = _project(states, self.columns, columns, "if97")
+        return _masked(states, outside, masked,
+                       "%d values for %s are out of the saturation line: %s" % (
+                           outside.sum(), property_name, values[outside]))
+
+    def find_state(self, property_name, value, columns=None):
+        """Saturation state of a value, see Table.find_state."""
+        return self.find_states(property_name, [value], columns=columns)[0].tolist()
+
+    def branches(self, property_name):
+        """Monotone branches of a column, see Table.branches."""
+        ranges = []
+        for low, high in self._branch_temperatures(property_name):
+            ends = self._states(numpy.array([low, high]))[
+                :, self.columns.index(property_name)]
+            ranges.append((float(ends.min()), float(ends.max())))
+        return ranges
+
+    def find_branch_states(self, property_name, values, branch, masked=False,
+                           columns=None):
+        """Saturation states on one branch, see Table.find_branch_states."""
+        low, high = self._branch_range(property_name, branch)
+        return self._find_states(property_name, values, masked, columns, low, high)
+
+    def find_branch_state(self, property_name, value, branch, columns=None):
+        """Saturation state on one branch, see Table.find_branch_state."""
+        return self.find_branch_states(property_name, [value], branch,
+                                       columns=columns)[0].tolist()
+
+    def find_all_states(self, property_name, value, columns=None):
+        """Saturation states of every branch, see Table.find_all_states."""
+        states = []
+        for branch in range(len(self._branch_temperatures(property_name))):
+            found = self.find_branch_states(property_name, [value], branch, masked=True,
+                                            columns=columns)
+            if not numpy.ma.getmaskarray(found).any():
+                states.append(found[0].tolist())
+        return states
+
+
+class SinglePhaseIF97(object):
+    """Liquid or vapor states from the IAPWS-IF97 correlations.
+
+    Columns are the ones of the single phase tables: pressure (kPa),
+    temperature (°C), volume, energy, enthalpy and entropy. Points past
+    the saturation line get the metastable state of the phase.
+    """
+
+    columns = ("pressure", "temperature", "volume", "energy", "enthalpy", "entropy")
+
+    def __init__(self, liquid):
+        """Backend of the liquid, or the vapor, phase."""
+        self.liquid = liquid
+
+    def find_states(self, pressures, temperatures, masked=False, columns=None):
+        """States of arrays of points, see GridTable.find_states."""
+        pressures, temperatures = numpy.broadcast_arrays(
+            numpy.asarray(pressures, dtype=float), numpy.asarray(temperatures, dtype=float))
+        properties = if97.phase_properties(temperatures + 273.15, pressures / 1000.0,
+                                           self.liquid)
+        states = numpy.stack((pressures, temperatures) + properties, axis=-1)
+        outside = numpy.isnan(states).any(axis=-1)
+        states = _project(states, self.columns, columns, "if97")
+        return _masked(states, outside, masked,
+                       "%d points are out of IAPWS-IF97 regions 1 to 3" % outside.sum())
+
+    def find_state(self, pressure, temperature, columns=None):
+        """State of a point, see GridTable.find_state."""
+        return self.find_states([pressure], [temperature], columns=columns)[0].tolist()
+
+
+def cross_check(substance, values, unit, names=None, floor=1e-3):
+    """Differences between backends of a substance for given values.
+
+    ``unit`` is the one of the values, like Celcius, and tells the column
+    they are looked up by. Returns a dict keyed by "first:second" backend
+    names, of dicts of column: max, mean and median relative difference.
+    Values out of any of the backends are left out. Differences are
+    relative to at least ``floor`` times the largest value of the column,
+    so values near 0 don't make huge relative differences.
+    """
+    from units.arrays import QuantityArray
+    names = sorted(names or substance._backends)
+    values = QuantityArray(numpy.asarray(values, dtype=float), unit)
+    states = dict((name, substance.find_states(values, masked=True, backend=name))
+                  for name in names)
+    inside = ~numpy.any([numpy.ma.getmaskarray(found).any(axis=-1)
+                         for found in states.values()], axis=0)
+    columns = substance.columns()
+    report = {}
+    for position, first in enumerate(names):
+        for second in names[position + 1:]:
+            a = numpy.ma.getdata(states[first])[inside]
+            b = numpy.ma.getdata(states[second])[inside]
+            scale = numpy.maximum(numpy.abs(a), numpy.abs(b))
+            if len(scale):
+                # like the liquid enthalpy, 0 at the triple point
+                scale = numpy.maximum(scale, floor * scale.max(axis=0))
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                difference = numpy.abs(a - b) / scale
+            difference = numpy.where((a == b), 0.0, difference)
+            report["%s:%s" % (first, second)] = dict(
+                (column, {"max": float(difference[:, i].max()),
+                          "mean": float(difference[:, i].mean()),
+                          "median": float(numpy.median(difference[:, i]))})
+                for i, column in enumerate(columns) if len(difference))
+    return report
+
+
+def main(argv=None):
+    """Print differences between the backends of saturated water."""
+    import argparse
+    from substances.water import SaturationLineWater
+    from units.pressure import KiloPascal
+    from units.temperature import Celcius
+    parser = argparse.ArgumentParser(prog="python -m substances.backends",
+                                     description=main.__doc__)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--backends", nargs="+", metavar="NAME",
+                        help="backends to compare, all of them by default")
+    args = parser.parse_args(argv)
+
+    table = SaturationLineWater._table
+    low, high = table.range("temperature")
+    lookups = [("temperature", numpy.linspace(low, high, args.samples), Celcius)]
+    low, high = table.range("pressure")
+    lookups.append(("pressure", numpy.logspace(numpy.log10(low), numpy.log10(high),
+                                               args.samples), KiloPascal))
+    for property_name, values, unit in lookups:
+        report = cross_check(SaturationLineWater, values, unit, args.backends)
+        for pair, columns in sorted(report.items()):
+            worst = max(columns, key=lambda column: columns[column]["max"])
+            print("%-12s %-14s median relative difference %.2e, worst column "
+                  "%s max %.2e" % (property_name, pair,
+                                   numpy.median([c["median"] for c in columns.values()]),
+                                   worst, columns[worst]["max"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Batch lookups split in chunks over a pool of processes.
+
+    with ParallelExecutor(workers=4, chunk_size=100000) as executor:
+        states = executor.find_states(SaturatedWater, temperatures, unit=Celcius)
+
+Workers read the tables from the compiled file (see
+substances.tables.compiled), so they map the same pages instead of each
+one loading its own copy. Results come back in input order.
+"""
+
+from __future__ import absolute_import
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from units.arrays import QuantityArray
+
+__all__ = ["ParallelExecutor", "ChunkError", "ParallelLookupError"]
+__dir__ = __all__
+
+
+class ChunkError(object):
+    """Failure of one chunk: its position, input slice and the error."""
+
+    __slots__ = ("index", "start", "stop", "error")
+
+    def __init__(self, index, start, stop, error):
+        """Chunk ``index`` of inputs[start:stop] raised ``error``."""
+        self.index = index
+        self.start = start
+        self.stop = stop
+        self.error = error
+
+    def __str__(self):
+        """String representation."""
+        return "chunk %d [%d:%d] %s: %s" % (self.index, self.start, self.stop,
+                                            self.error.__class__.__name__,
+                                            self.error)
+
+    def __repr__(self):
+        """Short representation."""
+        return "<ChunkError %s>" % self
+
+
+class ParallelLookupError(Exception):
+    """Some chunks failed.
+
+    ``errors`` has a ChunkError for each of them and ``results`` the result
+    of every chunk, None for the failed ones.
+    """
+
+    def __init__(self, errors, results):
+        """Failed chunks and results of all chunks."""
+        super(ParallelLookupError, self).__init__(
+            "%d chunks failed, first %s" % (len(errors), errors[0]))
+        self.errors = errors
+        self.results = results
+
+
+def _run(target, method, args, kwargs):
+    """Call a method of a class, bound methods don't pickle on Python 2."""
+    return getattr(target, method)(*args, **kwargs)
+
+
+class ParallelExecutor(object):
+    """Evaluate big batches of states on a process pool.
+
+    Inputs are split along their first axis in chunks of ``chunk_size``,
+    each chunk solved with one vectorized find_states() call on a worker.
+    ``workers`` defaults to the amount of CPUs. The pool starts on first use
+    and lasts until shutdown(), or the end of a ``with`` block.
+    """
+
+    def __init__(self, workers=None, chunk_size=100000):
+        """Configure the pool, no process is started yet."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    def __enter__(self):
+        """Use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the workers."""
+        self.shutdown()
+
+    def shutdown(self):
+        """Stop the workers, a later call starts new ones."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _chunks(self, length):
+        """Start and stop of each chunk."""
+        return [(start, min(start + self.chunk_size, length))
+                for start in range(0, length, self.chunk_size)]
+
+    def map(self, target, method, leading, inputs, **kwargs):
+        """Call ``target.method(*leading + chunks, **kwargs)`` for each chunk.
+
+        ``inputs`` are the arguments split in chunks, all the same length.
+        Returns the list of chunk results, in order. Failed chunks raise a
+        single ParallelLookupError once every chunk is done.
+        """
+        length = len(inputs[0])
+        if any(len(values) != length for values in inputs):
+            raise ValueError("Inputs have different lengths")
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        chunks = self._chunks(length)
+        futures = [self._pool.submit(_run, target, method, tuple(leading) + tuple(
+                                     values[start:stop] for values in inputs), kwargs)
+                   for start, stop in chunks]
+        results, errors = [], []
+        for index, (future, (start, stop)) in enumerate(zip(futures, chunks)):
+            error = future.exception()
+            if error is None:
+                results.append(future.result())
+            else:
+                results.append(None)
+                errors.append(ChunkError(index, start, stop, error))
+        if errors:
+            raise ParallelLookupError(errors, results)
+        return results
+
+    @staticmethod
+    def _concatenate(results, masked):
+        """Join chunk results in one array."""
+        if masked:
+            return numpy.ma.concatenate(results)
+        return numpy.concatenate(results)
+
+    def find_states(self, substance, values, *others, **kwargs):
+        """Parallel ``substance.find_states(values, *others, **kwargs)``.
+
+        Keyword arguments, like ``unit`` and ``masked``, go as they are;
+        ``others`` are more per value inputs, like WetSteam mixture states.
+        """
+        if isinstance(values, QuantityArray):
+            kwargs["unit"] = values.unit
+            values = values.value
+        else:
+            values = numpy.asarray(values, dtype=float)
+        inputs = [values]
+        for other in others:
+            if not isinstance(other, QuantityArray):
+                other = numpy.asarray(other, dtype=float)
+                if not other.ndim:
+                    # same one for every value
+                    other = numpy.repeat(other, len(values))
+            inputs.append(other)
+        if not len(values):
+            return substance.find_states(*inputs, **kwargs)
+        return self._concatenate(self.map(substance, "find_states", (), inputs, **kwargs),
+                                 kwargs.get("masked"))
+
+    def find_quantities(self, substance, values, *others, **kwargs):
+        """Same as find_states() but as a dict of QuantityArray."""
+        return substance._quantities(self.find_states(substance, values, *others,
+                                                      **kwargs))
+
+    def find_table_states(self, table, property_name, values, masked=False):
+        """Parallel ``table.find_states(property_name, values, masked)``."""
+        values = numpy.asarray(values, dtype=float)
+        if not len(values):
+            return table.find_states(property_name, values, masked=masked)
+        return self._concatenate(self.map(table, "find_states", (property_name, ),
+                                          [values], masked=masked), masked)
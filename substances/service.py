@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""State lookups served over HTTP/JSON and a Unix socket.
+
+One warm process serves many clients. Lookups arriving within a short
+window are coalesced: values of the same table column are solved together
+with one find_states() call.
+
+    python -m substances.service --http 127.0.0.1:8642 --unix /tmp/water.sock
+
+HTTP takes ``POST /states`` with a JSON request and ``GET /stats``; the
+Unix socket takes one JSON request per line and answers one per line.
+Requests look like:
+
+    {"substance": "SaturatedSteam", "unit": "Bar", "value": 1.5}
+    {"substance": "SaturatedWater", "unit": "Celcius", "values": [20, 80]}
+
+Answers have a ``state`` (or ``states``) with the substance attributes,
+in the units of its instances, null for values out of the tables.
+
+Properties that may be the same on two states, like the enthalpy of
+saturated steam, are looked up on every branch of their column (see
+Table.branches()) outside of the batches. Values on more than one branch
+are null too, unless the request has the ``branch`` to look them up on:
+
+    {"substance": "SaturatedSteam", "unit": "KJPerKg", "value": 2790,
+     "branch": 0}
+"""
+
+from __future__ import absolute_import
+
+import argparse
+import json
+import os
+import sys
+import time
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from collections import deque
+from concurrent.futures import Future
+from SocketServer import StreamRequestHandler, ThreadingMixIn, UnixStreamServer
+from threading import BoundedSemaphore, Condition, Lock, Thread
+
+import numpy
+
+from units.arrays import QuantityArray
+from substances.stream import unit_named
+from substances.water import SaturationLineWater, SaturatedWater, SaturatedSteam
+
+__all__ = ["SUBSTANCES", "Coalescer", "LookupService", "Overloaded", "main"]
+__dir__ = __all__
+
+SUBSTANCES = dict((substance.__name__, substance) for substance in
+                  (SaturationLineWater, SaturatedWater, SaturatedSteam))
+
+
+class Overloaded(Exception):
+    pass
+
+
+class Coalescer(object):
+    """Solve lookups submitted by many threads in shared batches.
+
+    A dispatcher thread waits for the first pending lookup, lets more come
+    for ``window`` seconds, or until ``max_batch`` values are pending, and
+    solves them grouped by table and column.
+    """
+
+    def __init__(self, window=0.002, max_batch=4096):
+        """Start the dispatcher thread."""
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._size = 0
+        self._condition = Condition(Lock())
+        self.batches = 0
+        self.values = 0
+        self._closed = False
+        self._thread = Thread(target=self._dispatch, name="coalescer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, table, property_name, values):
+        """Future of the masked states of ``values`` of a table column."""
+        future = Future()
+        values = numpy.asarray(values, dtype=float).ravel()
+        with self._condition:
+            self._pending.append((table, property_name, values, future))
+            self._size += len(values)
+            self._condition.notify()
+        return future
+
+    def close(self):
+        """Stop the dispatcher once pending lookups are done."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _dispatch(self):
+        """Take pending lookups and solve them, until closed."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+            deadline = time.time() + self.window
+            with self._condition:
+                while self._size < self.max_batch and not self._closed:
+                    left = deadline - time.time()
+                    if left <= 0:
+                        break
+                    self._condition.wait(left)
+                pending, self._pending, self._size = self._pending, [], 0
+            self._solve(pending)
+
+    def _solve(self, pending):
+        """One find_states() call for each table column."""
+        groups = {}
+        for lookup in pending:
+            groups.setdefault(lookup[:2], []).append(lookup)
+        for (table, property_name), lookups in groups.items():
+            try:
+                states = table.find_states(
+                    property_name, numpy.concatenate([l[2] for l in lookups]),
+                    masked=True)
+            except Exception as error:
+                for lookup in lookups:
+                    lookup[3].set_exception(error)
+                continue
+            self.batches += 1
+            self.values += len(states)
+            start = 0
+            for lookup in lookups:
+                stop = start + len(lookup[2])
+                lookup[3].set_result(states[start:stop])
+                start = stop
+
+
+class LookupService(object):
+    """Answer JSON lookup requests, see the module documentation.
+
+    Up to ``max_concurrency`` requests are solved at once, more are
+    refused with Overloaded. Counters are available with stats().
+    """
+
+    def __init__(self, window=0.002, max_batch=4096, max_concurrency=256,
+                 timeout=10.0):
+        """Start the coalescer."""
+        self.coalescer = Coalescer(window, max_batch)
+        self.timeout = timeout
+        self._slots = BoundedSemaphore(max_concurrency)
+        self._lock = Lock()
+        self._started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.refused = 0
+        self._latency = 0.0
+        self._recent = deque(maxlen=1000)
+
+    def close(self):
+        """Stop the coalescer."""
+        self.coalescer.close()
+
+    def answer(self, request):
+        """Answer a decoded request, as a dict."""
+        if not self._slots.acquire(False):
+            with self._lock:
+                self.refused += 1
+            raise Overloaded("Too many concurrent requests")
+        started = time.time()
+        try:
+            return self._answer(request)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            self._slots.release()
+            latency = time.time() - started
+            with self._lock:
+                self.requests += 1
+                self._latency += latency
+                self._recent.append(latency)
+
+    def _answer(self, request):
+        """Solve a request through the coalescer."""
+        try:
+            substance = SUBSTANCES[request["substance"]]
+        except KeyError:
+            raise ValueError("substance must be one of %s" % ", ".join(
+                             sorted(SUBSTANCES)))
+        unit = unit_named(request.get("unit", ""))
+        property_name, table_unit = substance._table_column(unit(0))
+        single = "values" not in request
+        values = [request.get("value")] if single else request["values"]
+        try:
+            values = numpy.asarray(values, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError("values must be numbers")
+        values = QuantityArray(values, unit).to(table_unit).value
+        if unit.property_name in substance._inverse:
+            # branches of a turning column can't share a batch
+            states = substance._find_inverse_states(property_name, values,
+                                                    masked=True,
+                                                    branch=request.get("branch"))
+        else:
+            future = self.coalescer.submit(substance._table, property_name, values)
+            states = future.result(self.timeout)
+        answers = [None if numpy.ma.getmask(state).any() else dict(
+                   (attribute, float(state[column])) for attribute, column, _, _ in
+                   substance._attributes) for state in states]
+        if single:
+            return {"state": answers[0]}
+        return {"states": answers}
+
+    def stats(self):
+        """Counters: requests, errors, latency and batching."""
+        with self._lock:
+            uptime = time.time() - self._started
+            recent = sorted(self._recent)
+            stats = {"uptime": uptime, "requests": self.requests,
+                     "errors": self.errors, "refused": self.refused,
+                     "requests_per_second": self.requests / uptime,
+                     "mean_latency": self._latency / self.requests
+                     if self.requests else 0.0}
+        for name, rank in (("p50_latency", 0.5), ("p99_latency", 0.99)):
+            stats[name] = recent[int(rank * (len(recent) - 1))] if recent else 0.0
+        batches = self.coalescer.batches
+        stats.update(batches=batches, batched_values=self.coalescer.values,
+                     mean_batch=self.coalescer.values / float(batches)
+                     if batches else 0.0)
+        return stats
+
+    def respond(self, body):
+        """Answer raw JSON, return HTTP status and JSON answer."""
+        try:
+            return 200, self.answer(json.loads(body))
+        except Overloaded as error:
+            return 503, {"error": str(error)}
+        except Exception as error:
+            return 400, {"error": "%s: %s" % (error.__class__.__name__, error)}
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    """HTTP/JSON requests."""
+
+    def _send(self, status, answer):
+        """Write a JSON answer."""
+        body = json.dumps(answer)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """Counters of the service."""
+        if self.path != "/stats":
+            return self._send(404, {"error": "Not found"})
+        self._send(200, self.server.service.stats())
+
+    def do_POST(self):
+        """State lookups."""
+        if self.path != "/states":
+            return self._send(404, {"error": "Not found"})
+        length = int(self.headers.getheader("Content-Length") or 0)
+        self._send(*self.server.service.respond(self.rfile.read(length)))
+
+    def log_message(self, format, *args):
+        """Don't log every request, stats() counts them."""
+
+
+class _UnixHandler(StreamRequestHandler):
+    """JSON lines requests."""
+
+    def handle(self):
+        """Answer each line with a line, errors and stats included."""
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            if line.strip() == "stats":
+                answer = self.server.service.stats()
+            else:
+                answer = self.server.service.respond(line)[1]
+            self.wfile.write(json.dumps(answer) + "\n")
+            self.wfile.flush()
+
+
+class _HTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(service, http=None, unix=None):
+    """Start servers of the service, return them, serving on threads."""
+    servers = []
+    if http:
+        host, _, port = http.rpartition(":")
+        servers.append(_HTTPServer((host, int(port)), _HTTPHandler))
+    if unix:
+        if os.path.exists(unix):
+            os.remove(unix)
+        servers.append(_UnixServer(unix, _UnixHandler))
+    for server in servers:
+        server.service = service
+        thread = Thread(target=server.serve_forever, name=server.__class__.__name__)
+        thread.daemon = True
+        thread.start()
+    return servers
+
+
+def main(argv=None):
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(prog="python -m substances.service",
+                                     description="Saturated water lookups service")
+    parser.add_argument("--http", metavar="HOST:PORT")
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("--window", type=float, default=0.002,
+                        help="seconds lookups wait for others to batch with")
+    parser.add_argument("--max-batch", type=int, default=4096)
+    parser.add_argument("--max-concurrency", type=int, default=256,
+                        help="requests solved at once, more get refused")
+    args = parser.parse_args(argv)
+    if not args.http and not args.unix:
+        parser.error("--http and/or --unix is needed")
+
+    service = LookupService(args.window, args.max_batch, args.max_concurrency)
+    # warm up, tables load on first lookup
+    for substance in SUBSTANCES.values():
+        substance._table.find_states("temperature", [])
+    servers = serve(service, args.http, args.unix)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.shutdown()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
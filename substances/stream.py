@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Streaming conversion of readings files into substance properties.
+
+Rows are read in batches of bounded size and each batch is solved with a
+single find_quantities() call, so memory stays the same whatever the file
+size:
+
+    with open("readings.csv") as readings, open("out.csv", "w") as output:
+        convert_csv(readings, output, SaturatedSteam, "p", Bar)
+
+Rows out of the tables get empty outputs (null on JSON lines) instead of
+stopping the stream.
+"""
+
+from __future__ import absolute_import
+
+import csv
+import json
+from itertools import islice
+
+import numpy
+
+from units import GenericUnit
+import units.all
+from units.arrays import QuantityArray
+from substances.water import (SaturationLineWater, SaturatedWater,
+                              SaturatedSteam, WetSteam)
+
+__all__ = ["SUBSTANCES", "unit_named", "parse_outputs", "batches", "solve",
+           "convert_csv", "convert_jsonl"]
+__dir__ = __all__
+
+SUBSTANCES = dict((substance.__name__, substance) for substance in
+                  (SaturationLineWater, SaturatedWater, SaturatedSteam, WetSteam))
+
+
+def unit_named(name):
+    """Unit class of units.all with given name, like Bar or Fahrenheit."""
+    unit = getattr(units.all, name, None)
+    if not isinstance(unit, type) or not issubclass(unit, GenericUnit):
+        raise ValueError("Unknown unit %s" % name)
+    return unit
+
+
+def parse_outputs(substance, specs=None):
+    """List of (attribute, unit) from "attribute" or "attribute:Unit" specs.
+
+    Without specs every attribute of the substance is output, in its own
+    unit. Attributes without unit, like entropy, take none.
+    """
+    units_of = dict((attribute, unit) for attribute, column, unit, wrapper in
+                    substance._attributes)
+    outputs = []
+    for spec in specs or [attribute[0] for attribute in substance._attributes]:
+        attribute, _, unit = spec.partition(":")
+        if attribute not in units_of:
+            raise ValueError("%s has no attribute %s" % (substance.__name__, attribute))
+        if unit and units_of[attribute] is None:
+            raise ValueError("%s has no unit" % attribute)
+        outputs.append((attribute, unit_named(unit) if unit else None))
+    return outputs
+
+
+def batches(rows, size):
+    """Lists of up to ``size`` rows."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _number(value):
+    """Float of a cell, NaN for empty or malformed ones."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def solve(substance, values, unit, outputs, mixture_states=None,
+          mixture_unit=None):
+    """Output columns for a batch of values, in a single table pass.
+
+    Returns a list with a list of values for each output, None where the
+    state is unknown. ``mixture_states`` are the second input of WetSteam,
+    qualities when there is no ``mixture_unit``.
+    """
+    values = numpy.array([_number(value) for value in values])
+    args = ()
+    if mixture_states is not None:
+        mixture_states = numpy.array([_number(value) for value in mixture_states])
+        if mixture_unit is not None:
+            mixture_states = QuantityArray(mixture_states, mixture_unit)
+        args = (mixture_states, )
+    quantities = substance.find_quantities(values, *args, unit=unit, masked=True)
+    columns = []
+    for attribute, output_unit in outputs:
+        quantity = quantities[attribute]
+        if isinstance(quantity, QuantityArray):
+            if output_unit is not None:
+                quantity = quantity.to(output_unit)
+            quantity = quantity.value
+        columns.append(numpy.ma.masked_array(quantity).tolist(None))
+    return columns
+
+
+def convert_csv(input, output, substance, column, unit, outputs=None,
+                batch_size=10000, mixture_column=None, mixture_unit=None):
+    """Read CSV rows, write them back with the output columns appended.
+
+    ``column`` holds the values of ``unit`` to look up, ``outputs`` is a
+    list of specs, see parse_outputs(). Returns the amount of rows.
+    """
+    outputs = parse_outputs(substance, outputs)
+    reader = csv.reader(input)
+    writer = csv.writer(output, lineterminator="\n")
+    header = next(reader)
+    for name in (column, mixture_column):
+        if name and name not in header:
+            raise ValueError("There is no %s column" % name)
+    position = header.index(column)
+    mixture = header.index(mixture_column) if mixture_column else None
+    writer.writerow(header + [attribute for attribute, _ in outputs])
+    count = 0
+    for batch in batches(reader, batch_size):
+        mixture_states = None
+        if mixture is not None:
+            mixture_states = [row[mixture] for row in batch]
+        columns = solve(substance, [row[position] for row in batch], unit,
+                        outputs, mixture_states, mixture_unit)
+        # the writer takes None as an empty cell
+        writer.writerows(row + list(values)
+                         for row, values in zip(batch, zip(*columns)))
+        count += len(batch)
+    return count
+
+
+def convert_jsonl(input, output, substance, column, unit, outputs=None,
+                  batch_size=10000, mixture_column=None, mixture_unit=None):
+    """Same as convert_csv() for JSON lines, outputs are added as keys."""
+    outputs = parse_outputs(substance, outputs)
+    names = [attribute for attribute, _ in outputs]
+    count = 0
+    for batch in batches(input, batch_size):
+        rows = [json.loads(line) for line in batch if line.strip()]
+        mixture_states = None
+        if mixture_column:
+            mixture_states = [row.get(mixture_column) for row in rows]
+        columns = solve(substance, [row.get(column) for row in rows], unit,
+                        outputs, mixture_states, mixture_unit)
+        for row, values in zip(rows, zip(*columns)):
+            row.update(zip(names, values))
+            output.write(json.dumps(row, sort_keys=True))
+            output.write("\n")
+        count += len(rows)
+    return count
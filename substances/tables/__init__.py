@@ -2,66 +2,1041 @@
 # -*- coding: utf-8 -*-
 """Tables for saturated water."""
 
+from __future__ import absolute_import
+
+import math
+import os
 import sqlite3
+from bisect import bisect_left
+from threading import Lock, local
+from timeit import default_timer as clock
+
+import numpy
 
-# conn = sqlite3.connect('tables/saturated_water.sqlite')
+from substances.tables import compiled, if97
+from substances.tables.compiled import MalformedTable
+from substances.tables.interpolation import monotone_cubic
+
+# table files are next to this module, wherever the working directory is
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
 
 
 class OutOfTableRange(Exception):
     pass
 
 
+def _take(array, rows, positions):
+    """Given rows of an array, only the columns at positions unless None."""
+    if positions is None:
+        return array[rows]
+    return array[rows[:, numpy.newaxis], positions]
+
+
+def sorted_unique(rows, column):
+    """Rows sorted by given column, only the first one of repeated values."""
+    unique = []
+    for row in sorted(rows, key=lambda row: row[column]):
+        if not unique or row[column] != unique[-1][column]:
+            unique.append(row)
+    return unique
+
+
 class Table(object):
-    """Table abstraction and it's methods."""
+    """Table abstraction and it's methods.
+
+    The whole table is read once, on first lookup, and kept in memory. It
+    comes from ``compiled_file`` when there is one (see compile()), mapped
+    and shared between processes, or else from the SQLite ``table_file``.
+    For every column used as lookup key the rows are sorted by that column
+    so a state is found by binary search plus one linear interpolation
+    between the bracketing rows.
+
+    With ``interpolation = "cubic"`` the in memory lookups use a monotone
+    cubic through the rows instead, with coefficients computed once per
+    lookup column.
+
+    Setting ``resolution`` resamples the rows of each lookup column, once,
+    on that many points uniform on the key (or on its logarithm, per
+    ``scales``). In memory lookups then work out the cell of a value
+    arithmetically, O(1), instead of bisecting. resampling_errors() tells
+    how far the resampled rows are from the table ones.
+
+    Setting ``in_memory`` to False makes find_state() query the SQLite file
+    instead, through one read only connection per thread. That is linear
+    interpolation only.
+
+    Lookups take the names of the ``columns`` to return, in that order,
+    all of them by default. Only those are fetched and interpolated.
+
+    Lookups can be memoized setting ``cache`` to a StateCache, see
+    substances.tables.cache, and recorded setting ``instruments``, see
+    instrumentation.
+    """
 
     table_file = ""
+    # compiled copy of table_file, written by compile()
+    compiled_file = ""
+    # table of the file for columns without one in key_tables
     table_name = ""
+    # property name: table of the file keyed by it, so each lookup column
+    # has its own sorted, unique and indexed rows
+    key_tables = {}
+    in_memory = True
+    # "linear" or "cubic"
+    interpolation = "linear"
+    # points of the uniform grid lookups are resampled on, None to look up
+    # the rows themselves
+    resolution = None
+    # property name: "log" for keys resampled uniform on their logarithm
+    scales = {}
+    cache = None
+    instruments = None
+    # mmap_size pragma of the SQLite connections, in bytes
+    mmap_size = 2 ** 26
+
+    # one SQLite connection per thread and table file
+    _local = local()
+    # bracket statement and key column position, per table, column and
+    # returned columns
+    _statements = {}
+    # (table class, column names): their positions on the rows
+    _projections = {}
+
+    # In memory data, filled by _load() for each concrete table
+    _columns = None
+    _rows = None
+    _indexes = None
+    _arrays = None
+    _cubic = None
+    _uniform = None
+    # table name: rows array mapped from the compiled file
+    _compiled = None
+    _load_lock = Lock()
+
+    @classmethod
+    def _table_of(cls, property_name):
+        """Table of the file to look up given property."""
+        return cls.key_tables.get(property_name, cls.table_name)
+
+    @classmethod
+    def _load(cls, table_name=None):
+        """Read all rows of a table from disk, only once per table class."""
+        table_name = table_name or cls.table_name
+        if "_rows" not in cls.__dict__:
+            with cls._load_lock:
+                if "_rows" not in cls.__dict__:
+                    cls._indexes = {}
+                    cls._arrays = {}
+                    cls._cubic = {}
+                    cls._uniform = {}
+                    cls._compiled = {}
+                    cls._rows = {}
+        try:
+            return cls._rows[table_name]
+        except KeyError:
+            pass
+        with cls._load_lock:
+            if table_name not in cls._rows:
+                if cls.compiled_file and os.path.exists(cls.compiled_file):
+                    columns, table = compiled.open_compiled(
+                        cls.compiled_file).tables[table_name]
+                    cls._columns = columns
+                    cls._compiled[table_name] = table
+                    cls._rows[table_name] = [tuple(row) for row in table.tolist()]
+                else:
+                    cur = cls._connection().execute(
+                        "SELECT * FROM %s ORDER BY rowid" % table_name)
+                    cls._columns = tuple(d[0] for d in cur.description)
+                    cls._rows[table_name] = cur.fetchall()
+        return cls._rows[table_name]
+
+    @classmethod
+    def _tables(cls):
+        """Names of all tables of the file."""
+        return sorted(set(cls.key_tables.values()) | set([cls.table_name]))
+
+    @classmethod
+    def validate(cls, table_name, columns, rows):
+        """Check rows of a table, raise MalformedTable on the first bad one.
+
+        Rows must have every column, finite values and, on key tables,
+        strictly increasing keys. Subclasses add checks of their own data.
+        """
+        keys = [key for key, name in cls.key_tables.items() if name == table_name]
+        for number, row in enumerate(rows):
+            if len(row) != len(columns):
+                raise MalformedTable("%s row %d has %d columns, not %d: %s" % (
+                                     table_name, number, len(row), len(columns), row))
+            if not numpy.isfinite(row).all():
+                raise MalformedTable("%s row %d isn't finite: %s" % (
+                                     table_name, number, row))
+            for key in keys:
+                column = columns.index(key)
+                if number and not rows[number - 1][column] < row[column]:
+                    raise MalformedTable("%s row %d %s doesn't increase: %s" % (
+                                         table_name, number, key, row))
 
     @classmethod
-    def find_state(cls, property_name, value):
-        """Find substance's state properties."""
+    def compile(cls):
+        """Validate the table file, write it as ``compiled_file`` and check it.
+
+        See substances.tables.compiled for the format.
+        """
+        tables = []
+        for table_name in cls._tables():
+            cur = cls._connection().execute(
+                "SELECT * FROM %s ORDER BY rowid" % table_name)
+            columns = tuple(d[0] for d in cur.description)
+            rows = cur.fetchall()
+            cls.validate(table_name, columns, rows)
+            tables.append((table_name, columns, rows))
+        compiled.write(cls.compiled_file, tables)
+        compiled.CompiledFile(cls.compiled_file).verify()
+
+    @classmethod
+    def _connection(cls):
+        """Read only connection to the table file for the current thread."""
+        try:
+            return cls._local.connections[cls.table_file]
+        except AttributeError:
+            cls._local.connections = {}
+        except KeyError:
+            pass
         conn = sqlite3.connect(cls.table_file)
-        cur = conn.cursor()
-        cur.execute("""SELECT * FROM %s WHERE %s = %s""" % (
-                       cls.table_name, property_name, value))
-        state = cur.fetchone()
-        if not state:
-            cur.execute("""SELECT %s, * FROM %s WHERE %s <= %s ORDER BY %s DESC LIMIT 1""" % (
-                        property_name, cls.table_name, property_name, value, property_name))
-            lower = cur.fetchone()
-            cur.execute("""SELECT %s, * FROM %s WHERE %s >= %s ORDER BY %s ASC LIMIT 1""" % (
-                        property_name, cls.table_name, property_name, value, property_name))
-            higher = cur.fetchone()
-            if not lower or not higher:
-                raise OutOfTableRange("Value '%s' for %s is out of table." % (
-                                      value, property_name))
+        conn.execute("PRAGMA mmap_size = %d" % cls.mmap_size)
+        conn.execute("PRAGMA query_only = ON")
+        cls._local.connections[cls.table_file] = conn
+        return conn
+
+    @classmethod
+    def _bracket_statement(cls, property_name, columns=None, branch=None):
+        """Statement finding exact match and bracketing rows of a column.
+
+        Exact match and both bracketing rows come from a single statement,
+        each tagged by its first column: 0 exact, 1 lower, 2 higher. Rows
+        have every column, or the given ones followed by the key column if
+        it isn't one of them. Returns it with the position of the key
+        column on those rows. With a ``branch`` only rows of its rowid
+        range are, see _branches().
+        """
+        table_name = cls._table_of(property_name)
+        key = (cls.table_file, table_name, property_name, branch,
+               None if columns is None else tuple(columns))
+        try:
+            return cls._statements[key]
+        except KeyError:
+            pass
+        cur = cls._connection().execute("PRAGMA table_info(%s)" % table_name)
+        columns = [row[1] for row in cur.fetchall()]
+        selected = list(columns if key[-1] is None else key[-1])
+        for column in selected + [property_name]:
+            if column not in columns:
+                # column names can't be bound parameters, only known ones get in
+                raise sqlite3.OperationalError("no such column: %s" % column)
+        if property_name not in selected:
+            selected.append(property_name)
+        within = ""
+        if branch is not None:
+            # rows are numbered in rowid order, like the loaded ones
+            first, last = cls._branch(property_name, branch)[4:]
+            within = """ AND rowid BETWEEN
+                (SELECT rowid FROM {table} ORDER BY rowid LIMIT 1 OFFSET %d) AND
+                (SELECT rowid FROM {table} ORDER BY rowid LIMIT 1 OFFSET %d)""" % (
+                first, last)
+        # on key tables these are range seeks on the column index
+        query = """
+            SELECT * FROM (SELECT 0, {selected} FROM {table} WHERE {column} = :value
+                           {within} LIMIT 1)
+            UNION ALL
+            SELECT * FROM (SELECT 1, {selected} FROM {table} WHERE {column} < :value
+                           {within} ORDER BY {column} DESC LIMIT 1)
+            UNION ALL
+            SELECT * FROM (SELECT 2, {selected} FROM {table} WHERE {column} > :value
+                           {within} ORDER BY {column} ASC LIMIT 1)
+            """.format(table=table_name, column=property_name,
+                       selected=", ".join(selected),
+                       within=within.format(table=table_name))
+        statement = cls._statements[key] = (query, selected.index(property_name))
+        return statement
+
+    @classmethod
+    def columns(cls):
+        """Column names of the table, in row order."""
+        cls._load()
+        return cls._columns
+
+    @classmethod
+    def _positions(cls, columns):
+        """Positions on the rows of given column names."""
+        key = (cls, tuple(columns))
+        try:
+            return cls._projections[key]
+        except KeyError:
+            pass
+        names = cls.columns()
+        for column in columns:
+            if column not in names:
+                raise sqlite3.OperationalError("no such column: %s" % column)
+        positions = cls._projections[key] = [names.index(column) for column in columns]
+        return positions
+
+    @classmethod
+    def _index(cls, property_name, branch=None):
+        """Return rows sorted by given column and the sorted column values.
+
+        Rows come from the table keyed by that property, if there is one.
+        When several rows share the same value only the first one, in table
+        order, is kept. With a ``branch`` only its rows are, see _branches().
+        """
+        if branch is not None:
+            return cls._branch(property_name, branch)[:2]
+        rows = cls._load(cls._table_of(property_name))
+        try:
+            return cls._indexes[property_name]
+        except KeyError:
+            pass
+        if property_name not in cls._columns:
+            raise sqlite3.OperationalError("no such column: %s" % property_name)
+        column = cls._columns.index(property_name)
+        ordered = sorted_unique(rows, column)
+        keys = [row[column] for row in ordered]
+        index = cls._indexes[property_name] = (keys, ordered)
+        return index
+
+    @classmethod
+    def _array_index(cls, property_name, branch=None):
+        """Same as _index() but as NumPy arrays, for batch lookups.
+
+        Key tables of a compiled file are already sorted and unique by
+        their key, those are views of the mapped file instead of copies.
+        """
+        if branch is not None:
+            return cls._branch(property_name, branch)[2:4]
+        keys, rows = cls._index(property_name)
+        try:
+            return cls._arrays[property_name]
+        except KeyError:
+            pass
+        table = cls._compiled.get(cls.key_tables.get(property_name))
+        if table is not None:
+            index = (table[:, cls._columns.index(property_name)], table)
+        else:
+            index = (numpy.array(keys, dtype=float), numpy.array(rows, dtype=float))
+        cls._arrays[property_name] = index
+        return index
+
+    @classmethod
+    def _cubic_index(cls, property_name, branch=None):
+        """Cubic coefficients of each segment, as lists and as an array.
+
+        See interpolation.monotone_cubic.
+        """
+        keys, table = cls._array_index(property_name, branch)
+        key = property_name if branch is None else (property_name, branch)
+        try:
+            return cls._cubic[key]
+        except KeyError:
+            pass
+        coefficients = monotone_cubic(keys, table)
+        index = cls._cubic[key] = ([[tuple(column) for column in segment]
+                                    for segment in coefficients.tolist()],
+                                   coefficients)
+        return index
+
+    @classmethod
+    def _uniform_index(cls, property_name, branch=None):
+        """Rows resampled on a uniform grid of a key, see ``resolution``.
+
+        Each grid point is interpolated from the rows, or the rows of a
+        ``branch`` of the key, as set by ``interpolation``, the first and
+        last ones are the table ends. Returns the first and last keys, the
+        scaled key of the first point, points per unit of scaled key,
+        whether the scale is logarithmic, the position of the key column,
+        each cell as a pair of its lower row and the difference to the
+        higher one, and the rows as array.
+        """
+        cls._load(cls._table_of(property_name))
+        key = property_name if branch is None else (property_name, branch)
+        try:
+            return cls._uniform[key]
+        except KeyError:
+            pass
+        keys, table = cls._array_index(property_name, branch)
+        if cls.resolution < 2:
+            raise ValueError("resolution must be at least 2 points")
+        log = cls.scales.get(property_name) == "log"
+        scaled = numpy.log(keys) if log else keys
+        grid = numpy.linspace(scaled[0], scaled[-1], cls.resolution)
+        values = numpy.exp(grid) if log else grid
+        values[0], values[-1] = keys[0], keys[-1]
+        cubic = None
+        if cls.interpolation == "cubic":
+            cubic = cls._cubic_index(property_name, branch)[1]
+        rows = cls._interpolate_rows(keys, table, values, cubic=cubic)
+        index = cls._uniform[key] = (
+            float(keys[0]), float(keys[-1]), float(scaled[0]),
+            (cls.resolution - 1) / float(scaled[-1] - scaled[0]), log,
+            cls._columns.index(property_name),
+            list(zip(rows[:-1].tolist(), numpy.diff(rows, axis=0).tolist())), rows)
+        return index
+
+    @classmethod
+    def resampling_errors(cls, property_name):
+        """Relative errors of the resampled rows, see ``resolution``.
+
+        Every row of the table is looked up on the uniform grid and
+        compared to itself. Returns an array of one row per table row and
+        one column per table column, absolute errors where the table value
+        is 0. ``errors.max(axis=0)`` are the worst of each column.
+        """
+        keys, table = cls._array_index(property_name)
+        found = cls._interpolate_uniform(property_name, keys)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            errors = numpy.abs(found - table) / numpy.abs(table)
+        return numpy.where(table == 0, numpy.abs(found), errors)
+
+    @classmethod
+    def range(cls, property_name, branch=None):
+        """Minimum and maximum values of a column, or of a branch of it."""
+        keys = cls._index(property_name, branch)[0]
+        return keys[0], keys[-1]
+
+    @classmethod
+    def _branches(cls, property_name):
+        """Monotone branches of a column, in table order.
+
+        Rows of the table are split where the column turns, the row of the
+        turn being the last of a branch and the first of the next one. Rows
+        of the same value don't turn it. Each branch has its keys and rows
+        sorted by the column, like _index(), the same as arrays, and the
+        positions of its first and last rows on the table.
+        """
+        rows = cls._load(cls._table_of(property_name))
+        key = ("branches", property_name)
+        try:
+            return cls._indexes[key]
+        except KeyError:
+            pass
+        if property_name not in cls._columns:
+            raise sqlite3.OperationalError("no such column: %s" % property_name)
+        column = cls._columns.index(property_name)
+        runs, start, direction = [], 0, 0
+        for number in range(1, len(rows)):
+            step = rows[number][column] - rows[number - 1][column]
+            if step * direction < 0:
+                runs.append((start, number - 1))
+                start = number - 1
+            if step:
+                direction = step
+        runs.append((start, len(rows) - 1))
+        branches = []
+        for first, last in runs:
+            ordered = sorted_unique(rows[first:last + 1], column)
+            keys = [row[column] for row in ordered]
+            branches.append((keys, ordered, numpy.array(keys, dtype=float),
+                             numpy.array(ordered, dtype=float), first, last))
+        cls._indexes[key] = branches
+        return branches
+
+    @classmethod
+    def _branch(cls, property_name, branch):
+        """One of the _branches() of a column."""
+        return cls._branches(property_name)[cls._branch_number(property_name, branch)]
+
+    @classmethod
+    def _branch_number(cls, property_name, branch):
+        """Position of a branch on branches(), negative ones counting back."""
+        count = len(cls._branches(property_name))
+        if not -count <= branch < count:
+            raise ValueError("%s has %d branches, there is no branch %s" % (
+                             property_name, count, branch))
+        return branch % count
+
+    @classmethod
+    def branches(cls, property_name):
+        """Monotone branches of a column, (minimum, maximum) in table order.
+
+        Values of a column that turns, like enthalpy_vapor, can be on more
+        than one branch. Positions on this list are the ``branch`` of
+        find_branch_state() and find_branch_states().
+        """
+        return [(branch[0][0], branch[0][-1]) for branch in cls._branches(property_name)]
+
+    @classmethod
+    def find_branch_state(cls, property_name, value, branch, columns=None):
+        """Same as find_state(), on one branch of the column, see branches().
+
+        Negative branches count from the last one. Lookups go through the
+        ``cache``, ``instruments``, ``in_memory``, ``interpolation`` and
+        ``resolution`` of the table, on the rows of the branch only.
+        """
+        branch = cls._branch_number(property_name, branch)
+        if cls.instruments is not None:
+            return cls._instrumented_find_state(property_name, value, columns, branch)
+        if cls.cache is not None:
+            return cls._project(cls.cache.find_state(cls, property_name, value, branch),
+                                columns)
+        return cls._lookup(property_name, value, columns, branch)
+
+    @classmethod
+    def find_branch_states(cls, property_name, values, branch, masked=False,
+                           columns=None):
+        """Same as find_states(), on one branch of the column.
+
+        See find_branch_state().
+        """
+        return cls._find_states(property_name, values, masked, columns,
+                                cls._branch_number(property_name, branch))
+
+    @classmethod
+    def find_all_states(cls, property_name, value, columns=None):
+        """States of every branch of the column holding value, in table order.
+
+        Empty when there is none. Values at a turn of the column are on two
+        branches, their state is returned once.
+        """
+        states = []
+        for branch, (low, high) in enumerate(cls.branches(property_name)):
+            if low <= value <= high:
+                state = cls.find_branch_state(property_name, value, branch, columns)
+                if not states or not numpy.allclose(states[-1], state):
+                    states.append(state)
+        return states
+
+    @classmethod
+    def find_state(cls, property_name, value, columns=None):
+        """Find substance's state properties.
+
+        Only ``columns`` are returned, in that order, if given. Columns that
+        turn, see branches(), mix up the rows of both sides here: look them
+        up with find_branch_state() or find_all_states() instead.
+        """
+        if cls.instruments is not None:
+            return cls._instrumented_find_state(property_name, value, columns)
+        if cls.cache is not None:
+            # the cache keeps whole states
+            return cls._project(cls.cache.find_state(cls, property_name, value),
+                                columns)
+        return cls._lookup(property_name, value, columns)
+
+    @classmethod
+    def _project(cls, state, columns):
+        """Given columns of a whole state, all of them for None."""
+        if columns is None:
+            return state
+        return [state[position] for position in cls._positions(columns)]
+
+    @classmethod
+    def _lookup(cls, property_name, value, columns=None, branch=None):
+        """Find state properties, without cache."""
+        if cls.in_memory:
+            return cls._find_state_memory(property_name, value, columns, branch)
+        return cls._find_state_sqlite(property_name, value, columns, branch)
+
+    @classmethod
+    def _find_state_memory(cls, property_name, value, columns=None, branch=None):
+        """Find state properties on the in memory index."""
+        if cls.resolution:
+            return cls._find_state_uniform(property_name, value, columns, branch)
+        keys, rows = cls._index(property_name, branch)
+        cubic = None
+        if cls.interpolation == "cubic":
+            cubic = cls._cubic_index(property_name, branch)[0]
+        return cls._interpolate(keys, rows, property_name, value, columns, cubic)
+
+    @classmethod
+    def _interpolate(cls, keys, rows, property_name, value, columns=None, cubic=None):
+        """State of value on rows sorted by their unique keys.
+
+        Interpolation is linear, or with the ``cubic`` coefficients of each
+        segment if given, see _cubic_index().
+        """
+        if not keys or not keys[0] <= value <= keys[-1]:
+            raise OutOfTableRange("Value '%s' for %s is out of table." % (
+                                  value, property_name))
+        position = bisect_left(keys, value)
+        if keys[position] == value:
+            if columns is None:
+                return rows[position]
+            return cls._project(rows[position], columns)
+        if cubic is not None:
+            t = value - keys[position - 1]
+            segment = cubic[position - 1]
+            if columns is not None:
+                segment = cls._project(segment, columns)
+            return [a + t * (b + t * (c + t * d)) for a, b, c, d in segment]
+        lower, higher = rows[position - 1], rows[position]
+        # interpolation rate
+        rate = (value - keys[position - 1]) / (keys[position] - keys[position - 1])
+        # interpolated state
+        if columns is None:
+            return [l + (h - l) * rate for l, h in zip(lower, higher)]
+        return [lower[i] + (higher[i] - lower[i]) * rate for i in cls._positions(columns)]
+
+    @classmethod
+    def _find_state_uniform(cls, property_name, value, columns=None, branch=None):
+        """Find state properties on the resampled rows, no bisection."""
+        low, high, start, scale, log, column, cells, _ = cls._uniform_index(
+            property_name, branch)
+        if not low <= value <= high:
+            raise OutOfTableRange("Value '%s' for %s is out of table." % (
+                                  value, property_name))
+        position = ((math.log(value) if log else value) - start) * scale
+        cell = min(int(position), len(cells) - 1)
+        rate = position - cell
+        lower, difference = cells[cell]
+        if columns is None:
+            state = [l + d * rate for l, d in zip(lower, difference)]
+            state[column] = value
+            return state
+        state = [lower[position] + difference[position] * rate
+                 for position in cls._positions(columns)]
+        if property_name in columns:
+            state[list(columns).index(property_name)] = value
+        return state
+
+    @classmethod
+    def _instrumented_find_state(cls, property_name, value, columns=None, branch=None):
+        """Same as find_state(), recording the lookup on the instruments.
+
+        Outcome is "exact" for a value on a row, "interpolated",
+        "out_of_range", "cached" for lookups through the cache (it has its
+        own stats) or the name of any other exception raised. Branch
+        lookups are recorded as find_branch_state.
+        """
+        operation = "%s.%s" % (cls.__name__, "find_state" if branch is None else
+                               "find_branch_state")
+        started = clock()
+        sqlite_seconds = 0.0
+        try:
+            if cls.cache is not None:
+                outcome = "cached"
+                state = cls._project(cls.cache.find_state(cls, property_name, value,
+                                                          branch), columns)
+            elif cls.in_memory:
+                state = cls._find_state_memory(property_name, value, columns, branch)
+                keys = cls._index(property_name, branch)[0]
+                outcome = "interpolated"
+                if keys[bisect_left(keys, value)] == value:
+                    outcome = "exact"
+            else:
+                found, column = cls._query_brackets(property_name, value, columns,
+                                                    branch)
+                sqlite_seconds = clock() - started
+                outcome = "exact" if 0 in found else "interpolated"
+                state = cls._from_brackets(found, column, property_name, value,
+                                           columns)
+        except Exception as error:
+            outcome = "out_of_range"
+            if not isinstance(error, OutOfTableRange):
+                outcome = error.__class__.__name__
+            cls.instruments.record(operation, outcome, clock() - started,
+                                   sqlite_seconds)
+            raise
+        cls.instruments.record(operation, outcome, clock() - started, sqlite_seconds)
+        return state
+
+    @classmethod
+    def _find_state_sqlite(cls, property_name, value, columns=None, branch=None):
+        """Find state properties with one query on the table file."""
+        found, column = cls._query_brackets(property_name, value, columns, branch)
+        return cls._from_brackets(found, column, property_name, value, columns)
+
+    @classmethod
+    def _query_brackets(cls, property_name, value, columns=None, branch=None):
+        """Exact and bracketing rows, tagged 0, 1 and 2, and key column."""
+        query, column = cls._bracket_statement(property_name, columns, branch)
+        return dict((row[0], row[1:]) for row in
+                    cls._connection().execute(query, {"value": value})), column
+
+    @classmethod
+    def _from_brackets(cls, found, column, property_name, value, columns=None):
+        """State of value from the rows of _query_brackets()."""
+        # the key column is appended to rows of other columns, see
+        # _bracket_statement()
+        width = None if columns is None else len(columns)
+        if 0 in found:
+            return found[0][:width]
+        if 1 not in found or 2 not in found:
+            raise OutOfTableRange("Value '%s' for %s is out of table." % (
+                                  value, property_name))
+        lower, higher = found[1], found[2]
+        # interpolation rate
+        rate = (value - lower[column]) / (higher[column] - lower[column])
+        # interpolated state
+        return [l + (h - l) * rate for l, h in zip(lower[:width], higher[:width])]
+
+    @classmethod
+    def find_states(cls, property_name, values, masked=False, columns=None):
+        """Find states for an array of values at once.
+
+        Returns an array with one row per value and one column per table
+        column (see columns()), or per name of ``columns`` if given. Values
+        out of table raise OutOfTableRange for the whole batch, unless
+        ``masked`` is set: then a masked array is returned with those rows
+        masked out.
+        """
+        return cls._find_states(property_name, values, masked, columns)
+
+    @classmethod
+    def _find_states(cls, property_name, values, masked, columns, branch=None):
+        """Batch lookups of find_states(), or of find_branch_states()."""
+        keys, table = cls._array_index(property_name, branch)
+        values = numpy.asarray(values, dtype=float)
+        shape = values.shape
+        values = values.ravel()
+        with numpy.errstate(invalid="ignore"):
+            # written this way so NaN is out of range too
+            outside = ~((values >= keys[0]) & (values <= keys[-1]))
+        if outside.any() and not masked:
+            raise OutOfTableRange("%d values for %s are out of table: %s" % (
+                                  outside.sum(), property_name, values[outside]))
+        positions = None if columns is None else cls._positions(columns)
+        if cls.resolution:
+            states = cls._interpolate_uniform(property_name,
+                                              numpy.where(outside, keys[0], values),
+                                              positions, branch)
+        else:
+            cubic = None
+            if cls.interpolation == "cubic":
+                cubic = cls._cubic_index(property_name, branch)[1]
+            states = cls._interpolate_rows(keys, table, values, positions, cubic)
+        states = states.reshape(shape + (states.shape[-1], ))
+        if masked:
+            mask = numpy.repeat(outside, states.shape[-1]).reshape(states.shape)
+            states = numpy.ma.masked_array(states, mask=mask)
+        return states
+
+    @staticmethod
+    def _interpolate_rows(keys, table, values, positions=None, cubic=None):
+        """States of a flat array of values, interpolated from sorted rows.
+
+        Only the columns at ``positions`` are, if given. Interpolation is
+        linear, or with the ``cubic`` coefficients array if given.
+        """
+        position = numpy.searchsorted(keys, values).clip(1, len(keys) - 1)
+        higher = _take(table, position, positions)
+        if cubic is not None:
+            a, b, c, d = numpy.rollaxis(_take(cubic, position - 1, positions), 2)
+            t = (values - keys[position - 1])[:, numpy.newaxis]
+            states = a + t * (b + t * (c + t * d))
+        else:
+            lower = _take(table, position - 1, positions)
             # interpolation rate
-            rate = (value - lower[0]) / (higher[0] - lower[0])
-            # interpolated state
-            state = [l + (h - l) * rate for l, h in zip(lower[1:], higher[1:])]
+            rate = (values - keys[position - 1]) / (keys[position] - keys[position - 1])
+            states = lower + (higher - lower) * rate[:, numpy.newaxis]
+        # exact matches are taken as they are
+        exact = keys[position] == values
+        states[exact] = higher[exact]
+        return states
+
+    @classmethod
+    def _interpolate_uniform(cls, property_name, values, positions=None, branch=None):
+        """States of a flat array of values in range, on the resampled rows.
+
+        Only the columns at ``positions`` are, if given.
+        """
+        start, scale, log, column, _, table = cls._uniform_index(property_name,
+                                                                 branch)[2:]
+        position = ((numpy.log(values) if log else values) - start) * scale
+        cell = numpy.minimum(position.astype(int), len(table) - 2)
+        lower = _take(table, cell, positions)
+        states = lower + ((_take(table, cell + 1, positions) - lower) *
+                          (position - cell)[:, numpy.newaxis])
+        if positions is None:
+            states[:, column] = values
+        elif column in positions:
+            states[:, positions.index(column)] = values
+        return states
+
+
+class GridTable(Table):
+    """Table of states on a grid of two key columns.
+
+    Rows hold the state of each grid point, keys included. The grid index
+    is built once: sorted keys of each axis and the states of every point,
+    NaN where the grid has no state. A state is found bisecting each axis,
+    O(log n), plus bilinear interpolation between the cell corners. Values
+    needing a corner without state are out of table.
+
+    find_state() goes through ``cache``, with StateCache.find_point(), and
+    ``instruments`` like on Table. Grids are looked up in memory only:
+    ``in_memory`` set to False raises ValueError, ``interpolation`` and
+    ``resolution`` don't apply.
+    """
+
+    # key columns of the grid, first and second axis
+    axes = ()
+
+    @classmethod
+    def validate(cls, table_name, columns, rows):
+        """Check rows, there must be one for each grid point at most."""
+        super(GridTable, cls).validate(table_name, columns, rows)
+        first, second = (columns.index(axis) for axis in cls.axes)
+        points = set()
+        for number, row in enumerate(rows):
+            point = (row[first], row[second])
+            if point in points:
+                raise MalformedTable("%s row %d repeats the point %s: %s" % (
+                                     table_name, number, point, row))
+            points.add(point)
+
+    @classmethod
+    def _grid(cls):
+        """Return keys of each axis, states array and states lists.
+
+        States array has a row per first axis key, a column per second
+        axis key and the table columns along its last axis. Lists are the
+        same, None for missing points, for the scalar lookups.
+        """
+        rows = cls._load()
+        try:
+            return cls._indexes[cls.axes]
+        except KeyError:
+            pass
+        first, second = (cls._columns.index(axis) for axis in cls.axes)
+        first_keys = sorted(set(row[first] for row in rows))
+        second_keys = sorted(set(row[second] for row in rows))
+        first_index = dict((key, i) for i, key in enumerate(first_keys))
+        second_index = dict((key, i) for i, key in enumerate(second_keys))
+        states = numpy.full((len(first_keys), len(second_keys), len(cls._columns)),
+                            numpy.nan)
+        lists = [[None] * len(second_keys) for _ in first_keys]
+        for row in rows:
+            i, j = first_index[row[first]], second_index[row[second]]
+            states[i, j] = row
+            lists[i][j] = tuple(row)
+        index = cls._indexes[cls.axes] = (first_keys, second_keys, states, lists)
+        return index
+
+    @classmethod
+    def _check_in_memory(cls):
+        """Raise ValueError unless the grid is looked up in memory."""
+        if not cls.in_memory:
+            raise ValueError("%s is looked up in memory only, in_memory must be "
+                             "True" % cls.__name__)
+
+    @classmethod
+    def find_state(cls, first_value, second_value, columns=None):
+        """Find state properties at a point, keys in ``axes`` order.
+
+        Only ``columns`` are returned, in that order, if given.
+        """
+        if cls.instruments is not None:
+            return cls._instrumented_find_state(first_value, second_value, columns)
+        if cls.cache is not None:
+            # the cache keeps whole states
+            return cls._project(cls.cache.find_point(cls, first_value, second_value),
+                                columns)
+        return cls._lookup(first_value, second_value, columns)
+
+    @classmethod
+    def _lookup(cls, first_value, second_value, columns=None):
+        """Find state properties at a point, without cache."""
+        cls._check_in_memory()
+        return cls._find_state_memory(first_value, second_value, columns)
+
+    @classmethod
+    def _instrumented_find_state(cls, first_value, second_value, columns=None):
+        """Same as find_state(), recording the lookup on the instruments.
+
+        Outcomes are the ones of Table._instrumented_find_state(), "exact"
+        being a point of the grid.
+        """
+        started = clock()
+        try:
+            if cls.cache is not None:
+                outcome = "cached"
+                state = cls._project(cls.cache.find_point(cls, first_value,
+                                                          second_value), columns)
+            else:
+                state = cls._lookup(first_value, second_value, columns)
+                first_keys, second_keys = cls._grid()[:2]
+                outcome = "interpolated"
+                if (first_keys[bisect_left(first_keys, first_value)] == first_value and
+                        second_keys[bisect_left(second_keys, second_value)] ==
+                        second_value):
+                    outcome = "exact"
+        except Exception as error:
+            outcome = "out_of_range"
+            if not isinstance(error, OutOfTableRange):
+                outcome = error.__class__.__name__
+            cls.instruments.record("%s.find_state" % cls.__name__, outcome,
+                                   clock() - started, 0.0)
+            raise
+        cls.instruments.record("%s.find_state" % cls.__name__, outcome,
+                               clock() - started, 0.0)
         return state
 
+    @classmethod
+    def _find_state_memory(cls, first_value, second_value, columns=None):
+        """Find state properties at a point on the grid index."""
+        first_keys, second_keys, _, lists = cls._grid()
+        if not (first_keys[0] <= first_value <= first_keys[-1] and
+                second_keys[0] <= second_value <= second_keys[-1]):
+            raise OutOfTableRange("Point '%s, %s' for %s is out of table." % (
+                                  first_value, second_value, ", ".join(cls.axes)))
+        i = min(max(bisect_left(first_keys, first_value), 1), len(first_keys) - 1)
+        j = min(max(bisect_left(second_keys, second_value), 1), len(second_keys) - 1)
+        # interpolation rates
+        t = (first_value - first_keys[i - 1]) / (first_keys[i] - first_keys[i - 1])
+        u = (second_value - second_keys[j - 1]) / (second_keys[j] - second_keys[j - 1])
+        corners = [(lists[i - 1][j - 1], (1 - t) * (1 - u)),
+                   (lists[i][j - 1], t * (1 - u)),
+                   (lists[i - 1][j], (1 - t) * u),
+                   (lists[i][j], t * u)]
+        # corners of no weight may miss, on the edges of the grid
+        corners = [(state, weight) for state, weight in corners if weight]
+        if any(state is None for state, weight in corners):
+            raise OutOfTableRange("Point '%s, %s' for %s is out of table." % (
+                                  first_value, second_value, ", ".join(cls.axes)))
+        positions = (range(len(cls._columns)) if columns is None else
+                     cls._positions(columns))
+        return [sum(state[column] * weight for state, weight in corners)
+                for column in positions]
+
+    @classmethod
+    def find_states(cls, first_values, second_values, masked=False, columns=None):
+        """Find states for arrays of points at once.
+
+        Both arrays are broadcast together. Returns an array with the shape
+        of the points plus a last axis with the table columns, or the
+        ``columns`` given. Points out of table raise OutOfTableRange for
+        the whole batch, unless ``masked`` is set: then their rows are
+        masked out. Like on Table, batch lookups are neither cached nor
+        recorded.
+        """
+        cls._check_in_memory()
+        first_keys, second_keys, states, _ = cls._grid()
+        first_values, second_values = numpy.broadcast_arrays(
+            numpy.asarray(first_values, dtype=float),
+            numpy.asarray(second_values, dtype=float))
+        shape = first_values.shape
+        first_values, second_values = first_values.ravel(), second_values.ravel()
+        first_keys = numpy.array(first_keys)
+        second_keys = numpy.array(second_keys)
+        i = numpy.searchsorted(first_keys, first_values).clip(1, len(first_keys) - 1)
+        j = numpy.searchsorted(second_keys, second_values).clip(1, len(second_keys) - 1)
+        # interpolation rates
+        t = ((first_values - first_keys[i - 1]) /
+             (first_keys[i] - first_keys[i - 1]))[:, numpy.newaxis]
+        u = ((second_values - second_keys[j - 1]) /
+             (second_keys[j] - second_keys[j - 1]))[:, numpy.newaxis]
+        if columns is None:
+            rows, cells, positions = i, j, slice(None)
+        else:
+            rows, cells = i[:, numpy.newaxis], j[:, numpy.newaxis]
+            positions = cls._positions(columns)
+        corners = [states[rows - 1, cells - 1, positions],
+                   states[rows, cells - 1, positions],
+                   states[rows - 1, cells, positions],
+                   states[rows, cells, positions]]
+        found = numpy.zeros(corners[0].shape)
+        with numpy.errstate(invalid="ignore"):
+            for corner, weight in zip(corners, ((1 - t) * (1 - u), t * (1 - u),
+                                                (1 - t) * u, t * u)):
+                # corners of no weight may miss, on the edges of the grid
+                found += numpy.where(weight == 0, 0.0, corner * weight)
+            outside = ~((first_values >= first_keys[0]) &
+                        (first_values <= first_keys[-1]) &
+                        (second_values >= second_keys[0]) &
+                        (second_values <= second_keys[-1]))
+        outside |= numpy.isnan(found).any(axis=-1)
+        if outside.any() and not masked:
+            raise OutOfTableRange("%d points for %s are out of table: %s" % (
+                                  outside.sum(), ", ".join(cls.axes),
+                                  list(zip(first_values[outside],
+                                           second_values[outside]))))
+        found = found.reshape(shape + (found.shape[-1], ))
+        if masked:
+            mask = numpy.repeat(outside, found.shape[-1]).reshape(found.shape)
+            found = numpy.ma.masked_array(found, mask=mask)
+        return found
+
+    @classmethod
+    def _create(cls, pressures, temperatures, vapor):
+        """Write the table of a single phase grid, computed with IAPWS-IF97.
+
+        ``pressures`` in kPa and ``temperatures`` in Celcius are the axes.
+        Points on the other side of the saturation line, next to it, get
+        the metastable state of the phase so cells crossing the line can be
+        interpolated. Other points of that side are left out.
+        """
+        pressure, temperature = numpy.meshgrid(numpy.array(pressures, dtype=float),
+                                               numpy.array(temperatures, dtype=float),
+                                               indexing="ij")
+        kelvin, mega_pascal = temperature + 273.15, pressure / 1000.0
+        states = numpy.array(if97.phase_properties(kelvin, mega_pascal, not vapor))
+        with numpy.errstate(invalid="ignore"):
+            saturation = if97.saturation_temperature(mega_pascal)
+            subcritical = mega_pascal < if97.CRITICAL_PRESSURE
+            stable = ~subcritical | ((kelvin >= saturation) if vapor else
+                                     (kelvin <= saturation))
+        # first point past the line on each pressure
+        step = 1 if vapor else -1
+        margin = ~stable & numpy.roll(stable, -step, axis=1)
+        margin[:, -1 if vapor else 0] = False
+        keep = (stable | margin) & ~numpy.isnan(states).any(axis=0)
+        rows = numpy.column_stack([pressure[keep], temperature[keep]] +
+                                  [column[keep] for column in states]).tolist()
+        cls.validate(cls.table_name, ("pressure", "temperature", "volume", "energy",
+                                      "enthalpy", "entropy"), rows)
+
+        conn = sqlite3.connect(cls.table_file)
+        c = conn.cursor()
+        c.execute("DROP TABLE IF EXISTS %s" % cls.table_name)
+        c.execute("""CREATE TABLE %s (pressure real, temperature real, volume real,
+                     energy real, enthalpy real, entropy real)""" % cls.table_name)
+        c.execute("CREATE UNIQUE INDEX %s_key ON %s (pressure, temperature)" % (
+                  cls.table_name, cls.table_name))
+        c.executemany("INSERT INTO %s VALUES (?,?,?,?,?,?)" % cls.table_name, rows)
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        cls.compile()
+
 
 class SaturatedWaterTable(Table):
 
-    table_file = "substances/tables/saturated_water.sqlite"
-    table_name = "saturated_water"
+    table_file = os.path.join(DIRECTORY, "saturated_water.sqlite")
+    compiled_file = os.path.join(DIRECTORY, "saturated_water.bin")
+    table_name = "saturated_water_temperature"
+    key_tables = {"temperature": "saturated_water_temperature",
+                  "pressure": "saturated_water_pressure"}
+    scales = {"pressure": "log"}
+
+    # allowed difference between vapor and liquid plus vaporisation values,
+    # absolute or relative to the vapor value, whatever is bigger
+    tolerance = (0.1, 0.001)
+
+    @classmethod
+    def validate(cls, table_name, columns, rows):
+        """Check rows, vapor values must be liquid plus vaporisation ones.
+
+        That catches values shifted to other columns too.
+        """
+        super(SaturatedWaterTable, cls).validate(table_name, columns, rows)
+        for number, row in enumerate(rows):
+            for liquid, vaporisation, vapor in ((4, 5, 6), (7, 8, 9), (10, 11, 12)):
+                absolute, relative = cls.tolerance
+                if abs(row[liquid] + row[vaporisation] - row[vapor]) > max(
+                        absolute, relative * abs(row[vapor])):
+                    raise MalformedTable(
+                        "%s row %d %s + %s isn't %s: %s" % (
+                            table_name, number, columns[liquid],
+                            columns[vaporisation], columns[vapor], row))
 
     @classmethod
     def create(cls):
         """
-        Create and populate the table.
+        Create and populate the tables.
 
         This function was used to create the file tables/saturated_water.sqlite
-        present on this project.
+        present on this project. Rows ordered by temperature and the ones
+        ordered by pressure go to separate tables, each one sorted, without
+        repeated keys and indexed by its key. Rows are validated first and
+        the file is compiled afterwards, see compile().
         """
-        conn = sqlite3.connect(cls.table_file)
-        c = conn.cursor()
-        c.execute('''CREATE TABLE saturated_water (temperature real, pressure real,
-                     volume_liquid real, volume_vapor real, energy_liquid real,
-                     energy_vaporisation real, energy_vapor real, enthalpy_liquid real,
-                     enthalpy_vaporisation real, enthalpy_vapor real, entropy_liquid real,
-                     entropy_vaporization real, entropy_vapor real)''')
 
         # Temperature: Celcius
         # Pressure: kPa
@@ -69,7 +1044,7 @@ class SaturatedWaterTable(Table):
         # Energy: kJ/kg
         # Enthalpy: kJ/kg
         # Entropy: kJ/kg K
-        values = [  # temperature, pressure, liquid volume, vapor volume, internal energy liquid, internalenergy vaporisation, internal energy vapor, enthalpy liquid, enthalpy vaporisation, enthalpy vapor, entropy liquid, entropy vaporization, entropy vapor
+        by_temperature = [  # temperature, pressure, liquid volume, vapor volume, internal energy liquid, internalenergy vaporisation, internal energy vapor, enthalpy liquid, enthalpy vaporisation, enthalpy vapor, entropy liquid, entropy vaporization, entropy vapor
             (0.01, 0.6113, 0.001000, 206.132, 0.00, 2375.33, 2375.33, 0.00, 2501.35, 2501.35, 0.0000, 9.1562, 9.1562),
             (5, 0.8721, 0.001000, 147.118, 20.97, 2361.27, 2382.24, 20.98, 2489.57, 2510.54, 0.0761, 8.9496, 9.0257),
             (10, 1.2276, 0.001000, 106.377, 41.99, 2347.16, 2389.15, 41.99, 2477.75, 2519.74, 0.1510, 8.7498, 8.9007),
@@ -107,46 +1082,47 @@ class SaturatedWaterTable(Table):
             (170, 791.7, 0.001114, 0.24283, 718.31, 1858.14, 2576.46, 719.20, 2049.50, 2768.70, 2.0418, 4.6244, 6.6663),
             (175, 892.0, 0.001121, 0.21680, 740.16, 1840.03, 2580.19, 741.16, 2032.42, 2773.58, 2.0909, 4.5347, 6.6256),
             (180, 1002.2, 0.001127, 0.19405, 762.08, 1821.62, 2583.70, 763.21, 2014.96, 2778.16, 2.1395, 4.4461, 6.5857),
-            (185, 1122.7, 0.001134, 0.17409, 784.08, 1802.90, 2586.98, 785.36, 2782.43, 2.1878, 4.3586, 6.5464, 1997.07),
-            (190, 1254.4, 0.001141, 0.15654, 806.17, 1783.84, 2590.01, 807.61, 2786.37, 2.2358, 4.2720, 6.5078, 1978.76),
-            (195, 1397.8, 0.001149, 0.14105, 828.36, 1764.43, 2592.79, 829.96, 2789.96, 2.2835, 4.1863, 6.4697, 1959.99),
-            (200, 1553.8, 0.001156, 0.12736, 850.64, 1744.66, 2595.29, 852.43, 2793.18, 2.3308, 4.1014, 6.4322, 1940.75),
-            (205, 1723.0, 0.001164, 0.11521, 873.02, 1724.49, 2597.52, 875.03, 2796.03, 2.3779, 4.0172, 6.3951, 1921.00),
-            (210, 1906.3, 0.001173, 0.10441, 895.51, 1703.93, 2599.44, 897.75, 2798.48, 2.4247, 3.9337, 6.3584, 1900.73),
-            (215, 2104.2, 0.001181, 0.09479, 918.12, 1682.94, 2601.06, 920.61, 2800.51, 2.4713, 3.8507, 6.3221, 1879.91),
-            (220, 2317.8, 0.001190, 0.08619, 940.85, 1661.49, 2602.35, 943.61, 2802.12, 2.5177, 3.7683, 6.2860, 1858.51),
-            (225, 2547.7, 0.001199, 0.07849, 963.72, 1639.58, 2603.30, 966.77, 2803.27, 2.5639, 3.6863, 6.2502, 1836.50),
-            (230, 2794.9, 0.001209, 0.07158, 986.72, 1617.17, 2603.89, 990.10, 2803.95, 2.6099, 3.6047, 6.2146, 1813.85),
-            (235, 3060.1, 0.001219, 0.06536, 1009.88, 1594.24, 2604.11, 1013.61, 2804.13, 2.6557, 3.5233, 6.1791, 1790.53),
-            (240, 3344.2, 0.001229, 0.05976, 1033.19, 1570.75, 2603.95, 1037.31, 2803.81, 2.7015, 3.4422, 6.1436, 1766.50),
-            (245, 3648.2, 0.001240, 0.05470, 1056.69, 1546.68, 2603.37, 1061.21, 2802.95, 2.7471, 3.3612, 6.1083, 1741.73),
-            (250, 3973.0, 0.001251, 0.05013, 1080.37, 1522.00, 2602.37, 1085.34, 2801.52, 2.7927, 3.2802, 6.0729, 1716.18),
-            (255, 4319.5, 0.001263, 0.04598, 1104.26, 1496.66, 2600.93, 1109.72, 2799.51, 2.8382, 3.1992, 6.0374, 1689.80),
-            (260, 4688.6, 0.001276, 0.04220, 1128.37, 1470.64, 2599.01, 1134.35, 2796.89, 2.8837, 3.1181, 6.0018, 1662.54),
-            (265, 5081.3, 0.001289, 0.03877, 1152.72, 1443.87, 2596.60, 1159.27, 2793.61, 2.9293, 3.0368, 5.9661, 1634.34),
-            (270, 5498.7, 0.001302, 0.03564, 1177.33, 1416.33, 2593.66, 1184.49, 2789.65, 2.9750, 2.9551, 5.9301, 1605.16),
-            (275, 5941.8, 0.001317, 0.03279, 1202.23, 1387.94, 2590.17, 1210.05, 2784.97, 3.0208, 2.8730, 5.8937, 1574.92),
-            (280, 6411.7, 0.001332, 0.03017, 1227.43, 1358.66, 2586.09, 1235.97, 2779.53, 3.0667, 2.7903, 5.8570, 1543.55),
-            (285, 6909.4, 0.001348, 0.02777, 1252.98, 1328.41, 2581.38, 1262.29, 2773.27, 3.1129, 2.7069, 5.8198, 1510.97),
-            (290, 7436.0, 0.001366, 0.02557, 1278.89, 1297.11, 2575.99, 1289.04, 2766.13, 3.1593, 2.6227, 5.7821, 1477.08),
-            (295, 7992.8, 0.001384, 0.02354, 1305.21, 1264.67, 2569.87, 1316.27, 2758.05, 3.2061, 2.5375, 5.7436, 1441.78),
-            (300, 8581.0, 0.001404, 0.02167, 1331.97, 1230.99, 2562.96, 1344.01, 2748.94, 3.2533, 2.4511, 5.7044, 1404.93),
-            (305, 9201.8, 0.001425, 0.01995, 1359.22, 1195.94, 2555.16, 1372.33, 2738.72, 3.3009, 2.3633, 5.6642, 1366.38),
-            (310, 9856.6, 0.001447, 0.01835, 1387.03, 1159.37, 2546.40, 1401.29, 2727.27, 3.3492, 2.2737, 5.6229, 1325.97),
-            (315, 10547, 0.001472, 0.01687, 1415.44, 1121.11, 2536.55, 1430.97, 2714.44, 3.3981, 2.1821, 5.5803, 1283.48),
-            (320, 11274, 0.001499, 0.01549, 1444.55, 1080.93, 2525.48, 1461.45, 2700.08, 3.4479, 2.0882, 5.5361, 1238.64),
-            (325, 12040, 0.001528, 0.01420, 1474.44, 1038.57, 2513.01, 1492.84, 2683.97, 3.4987, 1.9913, 5.4900, 1191.13),
-            (330, 12845, 0.001561, 0.01300, 1505.24, 993.66, 2498.91, 1525.29, 2665.85, 3.5506, 1.8909, 5.4416, 1140.56),
-            (335, 13694, 0.001597, 0.01186, 1537.11, 945.77, 2482.88, 1558.98, 2645.35, 3.6040, 1.7863, 5.3903, 1086.37),
-            (340, 14586, 0.001638, 0.01080, 1570.26, 894.26, 2464.53, 1594.15, 2622.01, 3.6593, 1.6763, 5.3356, 1027.86),
-            (345, 15525, 0.001685, 0.00978, 1605.01, 838.29, 2443.30, 1631.17, 2595.19, 3.7169, 1.5594, 5.2763, 964.02),
-            (350, 16514, 0.001740, 0.00881, 1641.81, 776.58, 2418.39, 1670.54, 2563.92, 3.7776, 1.4336, 5.2111, 893.38),
-            (355, 17554, 0.001807, 0.00787, 1681.41, 707.11, 2388.52, 1713.13, 2526.72, 3.8427, 1.2951, 5.1378, 813.59),
-            (360, 18651, 0.001892, 0.00694, 1725.19, 626.29, 2351.47, 1760.48, 2481.00, 3.9146, 1.1379, 5.0525, 720.52),
-            (365, 19807, 0.002011, 0.00599, 1776.13, 526.54, 2302.67, 1815.96, 2421.40, 3.9983, 0.9487, 4.9470, 605.44),
-            (370, 21028, 0.002213, 0.00493, 1843.84, 384.69, 2228.53, 1890.37, 2332.12, 4.1104, 0.6868, 4.7972, 441.75),
-            (374.1, 22089, 0.003155, 0.00315, 2029.58, 0.00, 2029.58, 2099.26, 2099.26, 4.4297, 0.0000, 4.4297, 0.00),
-            # from here is ordered by pressure
+            (185, 1122.7, 0.001134, 0.17409, 784.08, 1802.90, 2586.98, 785.36, 1997.07, 2782.43, 2.1878, 4.3586, 6.5464),
+            (190, 1254.4, 0.001141, 0.15654, 806.17, 1783.84, 2590.01, 807.61, 1978.76, 2786.37, 2.2358, 4.2720, 6.5078),
+            (195, 1397.8, 0.001149, 0.14105, 828.36, 1764.43, 2592.79, 829.96, 1959.99, 2789.96, 2.2835, 4.1863, 6.4697),
+            (200, 1553.8, 0.001156, 0.12736, 850.64, 1744.66, 2595.29, 852.43, 1940.75, 2793.18, 2.3308, 4.1014, 6.4322),
+            (205, 1723.0, 0.001164, 0.11521, 873.02, 1724.49, 2597.52, 875.03, 1921.00, 2796.03, 2.3779, 4.0172, 6.3951),
+            (210, 1906.3, 0.001173, 0.10441, 895.51, 1703.93, 2599.44, 897.75, 1900.73, 2798.48, 2.4247, 3.9337, 6.3584),
+            (215, 2104.2, 0.001181, 0.09479, 918.12, 1682.94, 2601.06, 920.61, 1879.91, 2800.51, 2.4713, 3.8507, 6.3221),
+            (220, 2317.8, 0.001190, 0.08619, 940.85, 1661.49, 2602.35, 943.61, 1858.51, 2802.12, 2.5177, 3.7683, 6.2860),
+            (225, 2547.7, 0.001199, 0.07849, 963.72, 1639.58, 2603.30, 966.77, 1836.50, 2803.27, 2.5639, 3.6863, 6.2502),
+            (230, 2794.9, 0.001209, 0.07158, 986.72, 1617.17, 2603.89, 990.10, 1813.85, 2803.95, 2.6099, 3.6047, 6.2146),
+            (235, 3060.1, 0.001219, 0.06536, 1009.88, 1594.24, 2604.11, 1013.61, 1790.53, 2804.13, 2.6557, 3.5233, 6.1791),
+            (240, 3344.2, 0.001229, 0.05976, 1033.19, 1570.75, 2603.95, 1037.31, 1766.50, 2803.81, 2.7015, 3.4422, 6.1436),
+            (245, 3648.2, 0.001240, 0.05470, 1056.69, 1546.68, 2603.37, 1061.21, 1741.73, 2802.95, 2.7471, 3.3612, 6.1083),
+            (250, 3973.0, 0.001251, 0.05013, 1080.37, 1522.00, 2602.37, 1085.34, 1716.18, 2801.52, 2.7927, 3.2802, 6.0729),
+            (255, 4319.5, 0.001263, 0.04598, 1104.26, 1496.66, 2600.93, 1109.72, 1689.80, 2799.51, 2.8382, 3.1992, 6.0374),
+            (260, 4688.6, 0.001276, 0.04220, 1128.37, 1470.64, 2599.01, 1134.35, 1662.54, 2796.89, 2.8837, 3.1181, 6.0018),
+            (265, 5081.3, 0.001289, 0.03877, 1152.72, 1443.87, 2596.60, 1159.27, 1634.34, 2793.61, 2.9293, 3.0368, 5.9661),
+            (270, 5498.7, 0.001302, 0.03564, 1177.33, 1416.33, 2593.66, 1184.49, 1605.16, 2789.65, 2.9750, 2.9551, 5.9301),
+            (275, 5941.8, 0.001317, 0.03279, 1202.23, 1387.94, 2590.17, 1210.05, 1574.92, 2784.97, 3.0208, 2.8730, 5.8937),
+            (280, 6411.7, 0.001332, 0.03017, 1227.43, 1358.66, 2586.09, 1235.97, 1543.55, 2779.53, 3.0667, 2.7903, 5.8570),
+            (285, 6909.4, 0.001348, 0.02777, 1252.98, 1328.41, 2581.38, 1262.29, 1510.97, 2773.27, 3.1129, 2.7069, 5.8198),
+            (290, 7436.0, 0.001366, 0.02557, 1278.89, 1297.11, 2575.99, 1289.04, 1477.08, 2766.13, 3.1593, 2.6227, 5.7821),
+            (295, 7992.8, 0.001384, 0.02354, 1305.21, 1264.67, 2569.87, 1316.27, 1441.78, 2758.05, 3.2061, 2.5375, 5.7436),
+            (300, 8581.0, 0.001404, 0.02167, 1331.97, 1230.99, 2562.96, 1344.01, 1404.93, 2748.94, 3.2533, 2.4511, 5.7044),
+            (305, 9201.8, 0.001425, 0.01995, 1359.22, 1195.94, 2555.16, 1372.33, 1366.38, 2738.72, 3.3009, 2.3633, 5.6642),
+            (310, 9856.6, 0.001447, 0.01835, 1387.03, 1159.37, 2546.40, 1401.29, 1325.97, 2727.27, 3.3492, 2.2737, 5.6229),
+            (315, 10547, 0.001472, 0.01687, 1415.44, 1121.11, 2536.55, 1430.97, 1283.48, 2714.44, 3.3981, 2.1821, 5.5803),
+            (320, 11274, 0.001499, 0.01549, 1444.55, 1080.93, 2525.48, 1461.45, 1238.64, 2700.08, 3.4479, 2.0882, 5.5361),
+            (325, 12040, 0.001528, 0.01420, 1474.44, 1038.57, 2513.01, 1492.84, 1191.13, 2683.97, 3.4987, 1.9913, 5.4900),
+            (330, 12845, 0.001561, 0.01300, 1505.24, 993.66, 2498.91, 1525.29, 1140.56, 2665.85, 3.5506, 1.8909, 5.4416),
+            (335, 13694, 0.001597, 0.01186, 1537.11, 945.77, 2482.88, 1558.98, 1086.37, 2645.35, 3.6040, 1.7863, 5.3903),
+            (340, 14586, 0.001638, 0.01080, 1570.26, 894.26, 2464.53, 1594.15, 1027.86, 2622.01, 3.6593, 1.6763, 5.3356),
+            (345, 15525, 0.001685, 0.00978, 1605.01, 838.29, 2443.30, 1631.17, 964.02, 2595.19, 3.7169, 1.5594, 5.2763),
+            (350, 16514, 0.001740, 0.00881, 1641.81, 776.58, 2418.39, 1670.54, 893.38, 2563.92, 3.7776, 1.4336, 5.2111),
+            (355, 17554, 0.001807, 0.00787, 1681.41, 707.11, 2388.52, 1713.13, 813.59, 2526.72, 3.8427, 1.2951, 5.1378),
+            (360, 18651, 0.001892, 0.00694, 1725.19, 626.29, 2351.47, 1760.48, 720.52, 2481.00, 3.9146, 1.1379, 5.0525),
+            (365, 19807, 0.002011, 0.00599, 1776.13, 526.54, 2302.67, 1815.96, 605.44, 2421.40, 3.9983, 0.9487, 4.9470),
+            (370, 21028, 0.002213, 0.00493, 1843.84, 384.69, 2228.53, 1890.37, 441.75, 2332.12, 4.1104, 0.6868, 4.7972),
+            (374.1, 22089, 0.003155, 0.00315, 2029.58, 0.00, 2029.58, 2099.26, 0.00, 2099.26, 4.4297, 0.0000, 4.4297),
+        ]
+        by_pressure = [
             (0.01, 0.6113, 0.001000, 206.132, 0, 2375.3, 2375.3, 0.00, 2501.30, 2501.30, 0.0000, 9.1562, 9.1562),
             (6.98, 1, 0.001000, 129.20802, 29.29, 2355.69, 2384.98, 29.29, 2484.89, 2514.18, 0.1059, 8.8697, 8.9756),
             (13.03, 1.5, 0.001001, 87.98013, 54.70, 2338.63, 2393.32, 54.70, 2470.59, 2525.30, 0.1956, 8.6322, 8.8278),
@@ -163,7 +1139,7 @@ class SaturatedWaterTable(Table):
             (69.10, 30, 0.001022, 5.22918, 289.18, 2179.22, 2468.40, 289.21, 2336.07, 2625.28, 0.9439, 6.8247, 7.7686),
             (75.87, 40, 0.001026, 3.99345, 317.51, 2159.49, 2477.00, 317.55, 2319.19, 2636.74, 1.0258, 6.6441, 7.6700),
             (81.33, 50, 0.001030, 3.24034, 340.42, 2143.43, 2483.85, 340.47, 2305.40, 2645.87, 1.0910, 6.5029, 7.5939),
-            (91.77, 75, 0.001037, 2.21711, 394.29, 2112.39, 2496.67, 384.36, 2278.59, 2662.96, 1.2129, 6.2434, 7.4563),
+            (91.77, 75, 0.001037, 2.21711, 384.31, 2112.39, 2496.67, 384.36, 2278.59, 2662.96, 1.2129, 6.2434, 7.4563),
             (99.62, 100, 0.001043, 1.69400, 417.33, 2088.72, 2506.06, 417.44, 2258.02, 2675.46, 1.3025, 6.0568, 7.3593),
             (105.99, 125, 0.001048, 1.37490, 444.16, 2069.32, 2513.48, 444.30, 2241.05, 2685.35, 1.3739, 5.9104, 7.2843),
             (111.37, 150, 0.001053, 1.15933, 466.92, 2052.72, 2519.64, 467.08, 2226.46, 2693.54, 1.4335, 5.7897, 7.2232),
@@ -224,7 +1200,86 @@ class SaturatedWaterTable(Table):
             (374.14, 22089, 0.003155, 0.00315, 2029.58, 0.0, 2029.58, 2099.26, 0.0, 2099.26, 4.4297, 0.0, 4.4297),
         ]
 
-        c.executemany('INSERT INTO saturated_water VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)',
-                      values)
+        columns = ("temperature", "pressure", "volume_liquid", "volume_vapor",
+                   "energy_liquid", "energy_vaporisation", "energy_vapor",
+                   "enthalpy_liquid", "enthalpy_vaporisation", "enthalpy_vapor",
+                   "entropy_liquid", "entropy_vaporization", "entropy_vapor")
+        tables = {}
+        for property_name, values in (("temperature", by_temperature),
+                                      ("pressure", by_pressure)):
+            table_name = cls.key_tables[property_name]
+            tables[table_name] = sorted_unique(values, columns.index(property_name))
+            cls.validate(table_name, columns, tables[table_name])
+
+        conn = sqlite3.connect(cls.table_file)
+        c = conn.cursor()
+        # the former single table, mixing both orders
+        c.execute("DROP TABLE IF EXISTS saturated_water")
+        for property_name in ("temperature", "pressure"):
+            table_name = cls.key_tables[property_name]
+            c.execute("DROP TABLE IF EXISTS %s" % table_name)
+            c.execute('''CREATE TABLE %s (temperature real, pressure real,
+                         volume_liquid real, volume_vapor real, energy_liquid real,
+                         energy_vaporisation real, energy_vapor real, enthalpy_liquid real,
+                         enthalpy_vaporisation real, enthalpy_vapor real, entropy_liquid real,
+                         entropy_vaporization real, entropy_vapor real)''' % table_name)
+            c.execute("CREATE UNIQUE INDEX %s_key ON %s (%s)" % (
+                      table_name, table_name, property_name))
+            c.executemany("INSERT INTO %s VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)" % table_name,
+                          tables[table_name])
         conn.commit()
+        conn.execute("VACUUM")
         conn.close()
+        cls.compile()
+
+
+class SuperheatedSteamTable(GridTable):
+    """Superheated steam, on a grid of pressure (kPa) and temperature (°C)."""
+
+    table_file = os.path.join(DIRECTORY, "superheated_steam.sqlite")
+    compiled_file = os.path.join(DIRECTORY, "superheated_steam.bin")
+    table_name = "superheated_steam"
+    axes = ("pressure", "temperature")
+
+    @classmethod
+    def create(cls):
+        """
+        Create and populate the table.
+
+        States are computed with the IAPWS-IF97 correlations, see
+        substances.tables.if97, up to 800 °C.
+        """
+        pressures = (10, 20, 50, 100, 200, 300, 400, 500, 600, 800, 1000, 1200,
+                     1400, 1600, 1800, 2000, 2500, 3000, 3500, 4000, 4500, 5000,
+                     6000, 7000, 8000, 9000, 10000, 11000, 12000, 13000, 14000,
+                     15000, 16000, 17000, 18000, 19000, 20000, 21000, 22000,
+                     23000, 24000, 25000, 27500, 30000, 35000, 40000, 50000,
+                     60000)
+        # finer near the critical point, where states change the most
+        temperatures = sorted(set(range(25, 801, 25)) | set(range(300, 451, 5)))
+        cls._create(pressures, temperatures, vapor=True)
+
+
+class CompressedWaterTable(GridTable):
+    """Compressed liquid water, on a grid of pressure (kPa) and temperature (°C)."""
+
+    table_file = os.path.join(DIRECTORY, "compressed_water.sqlite")
+    compiled_file = os.path.join(DIRECTORY, "compressed_water.bin")
+    table_name = "compressed_water"
+    axes = ("pressure", "temperature")
+
+    @classmethod
+    def create(cls):
+        """
+        Create and populate the table.
+
+        States are computed with the IAPWS-IF97 correlations, see
+        substances.tables.if97.
+        """
+        pressures = (100, 200, 500, 1000, 2000, 3000, 4000, 5000, 7500, 10000,
+                     12500, 15000, 16000, 17000, 18000, 19000, 20000, 21000,
+                     22000, 23000, 24000, 25000, 27500, 30000, 40000, 50000,
+                     60000, 80000, 100000)
+        # finer near the critical point, where states change the most
+        temperatures = [0.01] + sorted(set(range(10, 381, 10)) | set(range(300, 381, 5)))
+        cls._create(pressures, temperatures, vapor=False)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Memoization of table lookups."""
+
+from __future__ import absolute_import
+
+from collections import OrderedDict
+from threading import Lock
+
+__all__ = ["StateCache"]
+__dir__ = __all__
+
+
+class StateCache(object):
+    """Bounded LRU cache of table states.
+
+    Install it on a table class to cache its lookups, or on Table to cache
+    every table:
+
+        SaturatedWaterTable.cache = StateCache(size=4096, quantum=0.01)
+
+    States are keyed by table, property name and value, or by grid table,
+    its axes and both values of the point. With ``quantum`` values are
+    rounded to a multiple of it, and the state of the rounded value is the
+    one looked up and cached. It can be a number or a dict of property
+    name: quantum, properties missing on the dict are not rounded. Values
+    rounded out of the table range are looked up and cached as they are,
+    so the table bounds stay reachable.
+    """
+
+    def __init__(self, size=1024, quantum=None):
+        """Create an empty cache holding up to ``size`` states."""
+        self.size = size
+        self.quantum = quantum
+        self._states = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key_value(self, property_name, value):
+        """Value used as key, rounded to the quantum if there is one."""
+        quantum = self.quantum
+        if isinstance(quantum, dict):
+            quantum = quantum.get(property_name)
+        if not quantum:
+            return value
+        return round(value / float(quantum)) * quantum
+
+    def _rounded(self, table, property_name, value, branch=None):
+        """Key value of a lookup, the value itself if rounded out of table."""
+        rounded = self._key_value(property_name, value)
+        low, high = table.range(property_name, branch)
+        return rounded if low <= rounded <= high else value
+
+    def find_state(self, table, property_name, value, branch=None):
+        """Cached table.find_state() without the cache.
+
+        Or table.find_branch_state() for a ``branch``, keyed by it too.
+        """
+        value = self._rounded(table, property_name, value, branch)
+        key = (table, property_name, value)
+        if branch is not None:
+            key += (branch, )
+        return self._cached(key, table._lookup, property_name, value, None, branch)
+
+    def find_point(self, table, first_value, second_value):
+        """Cached GridTable.find_state() without the cache.
+
+        Keys are rounded with the quantum of each axis.
+        """
+        first, second = table.axes
+        first_value = self._rounded(table, first, first_value)
+        second_value = self._rounded(table, second, second_value)
+        return self._cached((table, table.axes, first_value, second_value),
+                            table._lookup, first_value, second_value)
+
+    def _cached(self, key, lookup, *values):
+        """State of key, from lookup(*values) on a miss."""
+        with self._lock:
+            try:
+                state = self._states.pop(key)
+            except KeyError:
+                self.misses += 1
+            else:
+                # most recently used go to the end
+                self._states[key] = state
+                self.hits += 1
+                return state
+        state = tuple(lookup(*values))
+        with self._lock:
+            self._states[key] = state
+            while len(self._states) > self.size:
+                self._states.popitem(last=False)
+                self.evictions += 1
+        return state
+
+    def invalidate(self, table=None, property_name=None):
+        """Drop cached states, all of them or the ones of a table/property."""
+        with self._lock:
+            if table is None and property_name is None:
+                self._states.clear()
+                return
+            for key in list(self._states):
+                if table not in (None, key[0]):
+                    continue
+                # grid states are keyed by both axes
+                names = key[1] if isinstance(key[1], tuple) else (key[1], )
+                if property_name is not None and property_name not in names:
+                    continue
+                del self._states[key]
+
+    def stats(self):
+        """Counters of the cache, as a dict."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "length": len(self._states),
+                    "size": self.size}
+
+    def reset_stats(self):
+        """Zero hits, misses and evictions counters."""
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
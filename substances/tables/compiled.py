@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Compiled table files, read through a shared memory map.
+
+A compiled file holds tables as plain little endian float64 columns, one
+after the other, behind a small header:
+
+    magic (8 bytes) | version, header length (2 uint32) | JSON header | data
+
+The JSON header lists, for each table, its columns, amount of rows and the
+data offset, plus a CRC32 of the data. The data starts 8 bytes aligned so
+each table maps straight to a NumPy array, without parsing nor copies:
+processes opening the same file share the same physical pages.
+"""
+
+from __future__ import absolute_import
+
+import json
+import mmap
+import os
+import struct
+import zlib
+
+import numpy
+
+__all__ = ["MAGIC", "VERSION", "MalformedTable", "CompiledFile", "write",
+           "open_compiled"]
+__dir__ = __all__
+
+MAGIC = b"THDTABLE"
+VERSION = 1
+_PREFIX = struct.Struct("<II")
+_DTYPE = numpy.dtype("<f8")
+
+
+class MalformedTable(Exception):
+    pass
+
+
+def _aligned(offset):
+    """Next multiple of the float size."""
+    return (offset + _DTYPE.itemsize - 1) // _DTYPE.itemsize * _DTYPE.itemsize
+
+
+def write(path, tables):
+    """Write tables to a compiled file.
+
+    ``tables`` is a list of (name, columns, rows). The file is written next
+    to ``path`` and renamed over it, so readers never map a partial file.
+    """
+    header = {"version": VERSION, "tables": []}
+    data = []
+    offset = 0
+    for name, columns, rows in tables:
+        values = numpy.array(rows, dtype=_DTYPE).reshape(len(rows), len(columns))
+        header["tables"].append({"name": name, "columns": list(columns),
+                                 "rows": len(rows), "offset": offset})
+        # column major, each column contiguous
+        data.append(numpy.ascontiguousarray(values.T).tobytes())
+        offset += values.nbytes
+    data = b"".join(data)
+    header["crc32"] = zlib.crc32(data) & 0xffffffff
+    encoded = json.dumps(header, sort_keys=True).encode("utf-8")
+    start = _aligned(len(MAGIC) + _PREFIX.size + len(encoded))
+    encoded += b" " * (start - len(MAGIC) - _PREFIX.size - len(encoded))
+    partial = "%s.%d.tmp" % (path, os.getpid())
+    with open(partial, "wb") as compiled:
+        compiled.write(MAGIC)
+        compiled.write(_PREFIX.pack(VERSION, len(encoded)))
+        compiled.write(encoded)
+        compiled.write(data)
+    os.rename(partial, path)
+
+
+class CompiledFile(object):
+    """Read only memory map of a compiled file.
+
+    ``tables`` maps table names to (columns, rows) with rows an array of
+    shape (rows, columns) viewing the map. Use open_compiled() to share one
+    map for each file in the process.
+    """
+
+    def __init__(self, path):
+        """Map the file and check its header."""
+        self.path = path
+        with open(path, "rb") as compiled:
+            self._map = mmap.mmap(compiled.fileno(), 0, access=mmap.ACCESS_READ)
+        prefix = len(MAGIC) + _PREFIX.size
+        if len(self._map) < prefix or self._map[:len(MAGIC)] != MAGIC:
+            raise MalformedTable("%s is not a compiled table file" % path)
+        version, length = _PREFIX.unpack(self._map[len(MAGIC):prefix])
+        if version != VERSION:
+            raise MalformedTable("%s has version %d, %d is supported" % (
+                                 path, version, VERSION))
+        self.header = json.loads(self._map[prefix:prefix + length].decode("utf-8"))
+        self._start = prefix + length
+        self.tables = {}
+        for table in self.header["tables"]:
+            rows, columns = table["rows"], len(table["columns"])
+            if self._start + table["offset"] + rows * columns * _DTYPE.itemsize > \
+                    len(self._map):
+                raise MalformedTable("%s is truncated" % path)
+            values = numpy.frombuffer(self._map, dtype=_DTYPE, count=rows * columns,
+                                      offset=self._start + table["offset"])
+            self.tables[table["name"]] = (tuple(table["columns"]),
+                                          values.reshape(columns, rows).T)
+
+    def verify(self):
+        """Check the data against the header checksum.
+
+        It reads every page, open_compiled() does it once per file.
+        """
+        if zlib.crc32(self._map[self._start:]) & 0xffffffff != self.header["crc32"]:
+            raise MalformedTable("%s data doesn't match its checksum" % self.path)
+
+
+_files = {}
+
+
+def open_compiled(path):
+    """Compiled file of given path, mapped and verified once per process."""
+    key = os.path.abspath(path)
+    try:
+        return _files[key]
+    except KeyError:
+        pass
+    compiled = CompiledFile(path)
+    compiled.verify()
+    _files[key] = compiled
+    return compiled
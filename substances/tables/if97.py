@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""IAPWS-IF97 correlations of water and steam, on NumPy arrays.
+
+Basic equations of regions 1 (liquid), 2 (vapor), 3 (near the critical
+point) and 4 (saturation line) of the IAPWS Industrial Formulation 1997,
+Revised Release of August 2007. They are used to compute the grids of the
+single phase tables and by the analytic backends, see substances.backends.
+
+As on the release, temperatures are in Kelvin and pressures in MPa.
+Properties are returned as (volume m³/kg, energy kJ/kg, enthalpy kJ/kg,
+entropy kJ/kg K) arrays.
+"""
+
+from __future__ import absolute_import
+
+import numpy
+
+__all__ = ["R", "CRITICAL_TEMPERATURE", "CRITICAL_PRESSURE", "region1",
+           "region2", "region3", "saturation_pressure",
+           "saturation_temperature", "boundary23_pressure",
+           "boundary23_temperature", "region", "properties",
+           "phase_properties", "saturation"]
+__dir__ = __all__
+
+# specific gas constant, kJ/kg K
+R = 0.461526
+CRITICAL_TEMPERATURE = 647.096
+CRITICAL_PRESSURE = 22.064
+CRITICAL_DENSITY = 322.0
+# region 1 and 3 boundary temperature, its saturation pressure
+TEMPERATURE_13 = 623.15
+PRESSURE_13 = 16.529164252605
+# upper bounds of the regions computed here
+MAX_TEMPERATURE = 1073.15
+MAX_PRESSURE = 100.0
+
+_R1_I = (
+    0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 4, 4, 4,
+    5, 8, 8, 21, 23, 29, 30, 31, 32)
+_R1_J = (
+    -2, -1, 0, 1, 2, 3, 4, 5, -9, -7, -1, 0, 1, 3, -3, 0, 1, 3, 17, -4, 0, 6,
+    -5, -2, 10, -8, -11, -6, -29, -31, -38, -39, -40, -41)
+_R1_N = (
+    0.14632971213167, -0.84548187169114, -3.756360367204, 3.3855169168385,
+    -0.95791963387872, 0.15772038513228, -0.016616417199501,
+    0.00081214629983568, 0.00028319080123804, -0.00060706301565874,
+    -0.018990068218419, -0.032529748770505, -0.021841717175414,
+    -5.283835796993e-05, -0.00047184321073267, -0.00030001780793026,
+    4.7661393906987e-05, -4.4141845330846e-06, -7.2694996297594e-16,
+    -3.1679644845054e-05, -2.8270797985312e-06, -8.5205128120103e-10,
+    -2.2425281908e-06, -6.5171222895601e-07, -1.4341729937924e-13,
+    -4.0516996860117e-07, -1.2734301741641e-09, -1.7424871230634e-10,
+    -6.8762131295531e-19, 1.4478307828521e-20, 2.6335781662795e-23,
+    -1.1947622640071e-23, 1.8228094581404e-24, -9.3537087292458e-26)
+
+# region 2 ideal gas part
+_R2_J0 = (0, 1, -5, -4, -3, -2, -1, 2, 3)
+_R2_N0 = (
+    -9.6927686500217, 10.086655968018, -0.005608791128302, 0.071452738081455,
+    -0.40710498223928, 1.4240819171444, -4.383951131945, -0.28408632460772,
+    0.021268463753307)
+# region 2 residual part
+_R2_I = (
+    1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 5, 6, 6, 6, 7, 7, 7,
+    8, 8, 9, 10, 10, 10, 16, 16, 18, 20, 20, 20, 21, 22, 23, 24, 24, 24)
+_R2_J = (
+    0, 1, 2, 3, 6, 1, 2, 4, 7, 36, 0, 1, 3, 6, 35, 1, 2, 3, 7, 3, 16, 35, 0,
+    11, 25, 8, 36, 13, 4, 10, 14, 29, 50, 57, 20, 35, 48, 21, 53, 39, 26, 40,
+    58)
+_R2_N = (
+    -0.0017731742473213, -0.017834862292358, -0.045996013696365,
+    -0.057581259083432, -0.05032527872793, -3.3032641670203e-05,
+    -0.00018948987516315, -0.0039392777243355, -0.043797295650573,
+    -2.6674547914087e-05, 2.0481737692309e-08, 4.3870667284435e-07,
+    -3.227767723857e-05, -0.0015033924542148, -0.040668253562649,
+    -7.8847309559367e-10, 1.2790717852285e-08, 4.8225372718507e-07,
+    2.2922076337661e-06, -1.6714766451061e-11, -0.0021171472321355,
+    -23.895741934104, -5.905956432427e-18, -1.2621808899101e-06,
+    -0.038946842435739, 1.1256211360459e-11, -8.2311340897998,
+    1.9809712802088e-08, 1.0406965210174e-19, -1.0234747095929e-13,
+    -1.0018179379511e-09, -8.0882908646985e-11, 0.10693031879409,
+    -0.33662250574171, 8.9185845355421e-25, 3.0629316876232e-13,
+    -4.2002467698208e-06, -5.9056029685639e-26, 3.7826947613457e-06,
+    -1.2768608934681e-15, 7.3087610595061e-29, 5.5414715350778e-17,
+    -9.436970724121e-07)
+
+# region 3, besides the logarithmic term
+_R3_N1 = 1.0658070028513
+_R3_I = (
+    0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4,
+    4, 5, 5, 5, 6, 6, 6, 7, 8, 9, 9, 10, 10, 11)
+_R3_J = (
+    0, 1, 2, 7, 10, 12, 23, 2, 6, 15, 17, 0, 2, 6, 7, 22, 26, 0, 2, 4, 16, 26,
+    0, 2, 4, 26, 1, 3, 26, 0, 2, 26, 2, 26, 2, 26, 0, 1, 26)
+_R3_N = (
+    -15.732845290239, 20.944396974307, -7.6867707878716, 2.6185947787954,
+    -2.808078114862, 1.2053369696517, -0.0084566812812502, -1.2654315477714,
+    -1.1524407806681, 0.88521043984318, -0.64207765181607, 0.38493460186671,
+    -0.85214708824206, 4.8972281541877, -3.0502617256965, 0.039420536879154,
+    0.12558408424308, -0.2799932969871, 1.389979956946, -2.018991502357,
+    -0.0082147637173963, -0.47596035734923, 0.0439840744735,
+    -0.44476435428739, 0.90572070719733, 0.70522450087967, 0.10770512626332,
+    -0.32913623258954, -0.50871062041158, -0.022175400873096,
+    0.094260751665092, 0.16436278447961, -0.013503372241348,
+    -0.014834345352472, 0.00057922953628084, 0.0032308904703711,
+    8.0964802996215e-05, -0.00016557679795037, -4.4923899061815e-05)
+
+# region 4
+_R4_N = (
+    0.11670521452767e4, -0.72421316703206e6, -0.17073846940092e2,
+    0.12020824702470e5, -0.32325550322333e7, 0.14915108613530e2,
+    -0.48232657361591e4, 0.40511340542057e6, -0.23855557567849,
+    0.65017534844798e3)
+
+# boundary between regions 2 and 3
+_B23_N = (
+    0.34805185628969e3, -0.11671859879975e1, 0.10192970039326e-2,
+    0.57254459862746e3, 0.13918839778870e2)
+
+
+def _terms(x, y, i, j, n):
+    """Sum of n x^i y^j and its derivatives by x and y, x times y times.
+
+    Returns (sum, d/dx, d²/dx², d/dy, d²/dy², d²/dxdy), summing over the
+    last axis so x and y of any shape are evaluated at once.
+    """
+    x = numpy.asarray(x, dtype=float)[..., numpy.newaxis]
+    y = numpy.asarray(y, dtype=float)[..., numpy.newaxis]
+    i = numpy.array(i, dtype=float)
+    j = numpy.array(j, dtype=float)
+    n = numpy.array(n, dtype=float)
+    xi, yj = x ** i, y ** j
+    return (numpy.sum(n * xi * yj, axis=-1),
+            numpy.sum(n * i * x ** (i - 1) * yj, axis=-1),
+            numpy.sum(n * i * (i - 1) * x ** (i - 2) * yj, axis=-1),
+            numpy.sum(n * xi * j * y ** (j - 1), axis=-1),
+            numpy.sum(n * xi * j * (j - 1) * y ** (j - 2), axis=-1),
+            numpy.sum(n * i * x ** (i - 1) * j * y ** (j - 1), axis=-1))
+
+
+def region1(temperature, pressure):
+    """Compressed liquid, Gibbs free energy equation."""
+    temperature = numpy.asarray(temperature, dtype=float)
+    pi = numpy.asarray(pressure, dtype=float) / 16.53
+    tau = 1386.0 / temperature
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        g, g_p, _, g_t, _, _ = _terms(7.1 - pi, tau - 1.222, _R1_I, _R1_J, _R1_N)
+    # derivatives are by (7.1 - pi)
+    g_p = -g_p
+    rt = R * temperature
+    volume = pi * g_p * rt / (pi * 16.53) / 1000.0
+    return (volume, rt * (tau * g_t - pi * g_p), rt * tau * g_t,
+            R * (tau * g_t - g))
+
+
+def region2(temperature, pressure):
+    """Superheated vapor, Gibbs free energy equation.
+
+    It holds in the metastable vapor region too, close to the saturation
+    line.
+    """
+    temperature = numpy.asarray(temperature, dtype=float)
+    pi = numpy.asarray(pressure, dtype=float)
+    tau = 540.0 / temperature
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        g0, _, _, g0_t, _, _ = _terms(1.0, tau, numpy.zeros(len(_R2_J0)),
+                                      _R2_J0, _R2_N0)
+        gr, gr_p, _, gr_t, _, _ = _terms(pi, tau - 0.5, _R2_I, _R2_J, _R2_N)
+        g0 = g0 + numpy.log(pi)
+    g_p = 1 / pi + gr_p
+    g_t = g0_t + gr_t
+    rt = R * temperature
+    volume = pi * g_p * rt / pi / 1000.0
+    return (volume, rt * (tau * g_t - pi * g_p), rt * tau * g_t,
+            R * (tau * g_t - (g0 + gr)))
+
+
+def _region3_helmholtz(density, temperature):
+    """Pressure, its derivative by density and properties of region 3."""
+    delta = density / CRITICAL_DENSITY
+    tau = CRITICAL_TEMPERATURE / temperature
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        f, f_d, f_dd, f_t, _, _ = _terms(delta, tau, _R3_I, _R3_J, _R3_N)
+        f = f + _R3_N1 * numpy.log(delta)
+    f_d = f_d + _R3_N1 / delta
+    f_dd = f_dd - _R3_N1 / delta ** 2
+    rt = R * temperature
+    pressure = density * rt * delta * f_d / 1000.0
+    slope = rt * (2 * delta * f_d + delta ** 2 * f_dd) / 1000.0
+    energy = rt * tau * f_t
+    return pressure, slope, (1 / density, energy, energy + rt * delta * f_d,
+                             R * (tau * f_t - f))
+
+
+def region3(temperature, pressure, liquid=None):
+    """Near critical region, Helmholtz free energy equation.
+
+    The equation is of density and temperature, so the density of each
+    pressure is solved. Above the critical temperature isotherms are
+    monotone and it is bisected. Below it Newton iterations start from
+    the liquid (region 1) or the vapor (region 2) density: liquid above the
+    saturation pressure and vapor under it, or as ``liquid`` says, to get
+    metastable states. Points that don't converge are NaN.
+    """
+    temperature, pressure = numpy.broadcast_arrays(
+        numpy.asarray(temperature, dtype=float), numpy.asarray(pressure, dtype=float))
+    if liquid is None:
+        with numpy.errstate(invalid="ignore"):
+            liquid = pressure > saturation_pressure(temperature)
+    liquid = numpy.broadcast_to(liquid, temperature.shape)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        density = 1 / numpy.where(liquid, region1(temperature, pressure)[0],
+                                  region2(temperature, pressure)[0])
+    supercritical = temperature >= CRITICAL_TEMPERATURE
+    low = numpy.full(temperature.shape, 50.0)
+    high = numpy.full(temperature.shape, 1100.0)
+    for _ in range(60):
+        middle = (low + high) / 2
+        with numpy.errstate(invalid="ignore"):
+            above = _region3_helmholtz(middle, temperature)[0] > pressure
+        high = numpy.where(above, middle, high)
+        low = numpy.where(above, low, middle)
+    density = numpy.where(supercritical, (low + high) / 2, density)
+    for _ in range(100):
+        found, slope, _ = _region3_helmholtz(density, temperature)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            step = (found - pressure) / slope
+            # never more than a fifth of the density, far from the root
+            step = numpy.clip(step, -0.2 * density, 0.2 * density)
+            density = density - step
+            if not (numpy.abs(step / density) > 1e-12).any():
+                break
+    found, slope, state = _region3_helmholtz(density, temperature)
+    with numpy.errstate(invalid="ignore"):
+        bad = ~((slope > 0) & (numpy.abs(found - pressure) < 1e-8 * pressure))
+    return tuple(numpy.where(bad, numpy.nan, column) for column in state)
+
+
+def saturation_pressure(temperature):
+    """Saturation pressure of temperatures, up to the critical one."""
+    n = _R4_N
+    temperature = numpy.asarray(temperature, dtype=float)
+    theta = temperature + n[8] / (temperature - n[9])
+    a = theta ** 2 + n[0] * theta + n[1]
+    b = n[2] * theta ** 2 + n[3] * theta + n[4]
+    c = n[5] * theta ** 2 + n[6] * theta + n[7]
+    with numpy.errstate(invalid="ignore"):
+        return (2 * c / (-b + numpy.sqrt(b ** 2 - 4 * a * c))) ** 4
+
+
+def saturation_temperature(pressure):
+    """Saturation temperature of pressures, up to the critical one."""
+    n = _R4_N
+    beta = numpy.asarray(pressure, dtype=float) ** 0.25
+    e = beta ** 2 + n[2] * beta + n[5]
+    f = n[0] * beta ** 2 + n[3] * beta + n[6]
+    g = n[1] * beta ** 2 + n[4] * beta + n[7]
+    with numpy.errstate(invalid="ignore"):
+        d = 2 * g / (-f - numpy.sqrt(f ** 2 - 4 * e * g))
+        return (n[9] + d - numpy.sqrt((n[9] + d) ** 2 - 4 * (n[8] + n[9] * d))) / 2
+
+
+def boundary23_pressure(temperature):
+    """Pressure of the boundary between regions 2 and 3."""
+    n = _B23_N
+    temperature = numpy.asarray(temperature, dtype=float)
+    return n[0] + n[1] * temperature + n[2] * temperature ** 2
+
+
+def boundary23_temperature(pressure):
+    """Temperature of the boundary between regions 2 and 3."""
+    n = _B23_N
+    with numpy.errstate(invalid="ignore"):
+        return n[3] + numpy.sqrt((numpy.asarray(pressure, dtype=float) - n[4]) / n[2])
+
+
+def region(temperature, pressure):
+    """Region of each point: 1, 2 or 3, 0 out of the ones computed here.
+
+    Points right on the saturation line are taken as liquid.
+    """
+    temperature = numpy.asarray(temperature, dtype=float)
+    pressure = numpy.asarray(pressure, dtype=float)
+    with numpy.errstate(invalid="ignore"):
+        inside = ((temperature >= 273.15) & (temperature <= MAX_TEMPERATURE) &
+                  (pressure > 0) & (pressure <= MAX_PRESSURE))
+        low = temperature <= TEMPERATURE_13
+        liquid = low & (pressure >= saturation_pressure(temperature))
+        vapor = (low & ~liquid) | (~low & (pressure <= boundary23_pressure(temperature)))
+    return numpy.where(inside, numpy.where(liquid, 1, numpy.where(vapor, 2, 3)), 0)
+
+
+def properties(temperature, pressure):
+    """Properties of the stable phase of each point, NaN out of regions."""
+    temperature, pressure = numpy.broadcast_arrays(
+        numpy.asarray(temperature, dtype=float), numpy.asarray(pressure, dtype=float))
+    regions = region(temperature, pressure)
+    result = [numpy.full(temperature.shape, numpy.nan) for _ in range(4)]
+    for number, equation in ((1, region1), (2, region2), (3, region3)):
+        where = regions == number
+        if where.any():
+            for column, values in zip(result, equation(temperature[where],
+                                                       pressure[where])):
+                column[where] = values
+    return tuple(result)
+
+
+def _metastable(temperature, pressure, liquid):
+    """Properties of one phase with no regard to the stable one."""
+    if temperature.size == 0:
+        return tuple(numpy.empty(temperature.shape) for _ in range(4))
+    low = temperature <= TEMPERATURE_13
+    result = [numpy.full(temperature.shape, numpy.nan) for _ in range(4)]
+    for where, equation in ((low, region1 if liquid else region2),
+                            (~low, lambda t, p: region3(t, p, liquid))):
+        if where.any():
+            for column, values in zip(result, equation(temperature[where],
+                                                       pressure[where])):
+                column[where] = values
+    return tuple(result)
+
+
+def phase_properties(temperature, pressure, liquid):
+    """Properties of the liquid, or the vapor, phase of each point.
+
+    Points of the other side of the saturation line get the metastable
+    state of the phase, from the same equations extended past the line.
+    """
+    temperature, pressure = numpy.broadcast_arrays(
+        numpy.asarray(temperature, dtype=float), numpy.asarray(pressure, dtype=float))
+    result = properties(temperature, pressure)
+    with numpy.errstate(invalid="ignore"):
+        saturation = saturation_temperature(pressure)
+        other = ((pressure < CRITICAL_PRESSURE) &
+                 ((temperature > saturation) if liquid else (temperature < saturation)))
+    if other.any():
+        for column, values in zip(result, _metastable(temperature[other],
+                                                      pressure[other], liquid)):
+            column[other] = values
+    return result
+
+
+def saturation(temperature):
+    """Saturation pressure, liquid and vapor properties of temperatures.
+
+    Temperatures go up to the critical one, near it region 3 may not
+    converge and properties are NaN.
+    """
+    temperature = numpy.asarray(temperature, dtype=float)
+    pressure = saturation_pressure(temperature)
+    return (pressure, _metastable(temperature, pressure, True),
+            _metastable(temperature, pressure, False))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Interpolation of table columns."""
+
+from __future__ import absolute_import
+
+import numpy
+
+__all__ = ["monotone_cubic"]
+__dir__ = __all__
+
+
+def _edge_slope(h0, h1, d0, d1):
+    """Slope at an end point, non centered three points shape preserving."""
+    slope = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+    wrong_sign = numpy.sign(slope) != numpy.sign(d0)
+    overshoot = (numpy.sign(d0) != numpy.sign(d1)) & (numpy.abs(slope) > 3 * numpy.abs(d0))
+    slope = numpy.where(overshoot, 3 * d0, slope)
+    return numpy.where(wrong_sign, 0.0, slope)
+
+
+def monotone_cubic(keys, rows):
+    """Coefficients of the monotone cubic (Fritsch-Carlson) of each column.
+
+    ``keys`` are the sorted, unique, lookup column values and ``rows`` the
+    table rows in the same order. Returns an array of shape (segments,
+    columns, 4) with a, b, c and d so that for ``keys[i] <= x <= keys[i+1]``
+    and ``t = x - keys[i]`` a column value is a + t * (b + t * (c + t * d)).
+    The curve goes through every row and never overshoots between them.
+    """
+    x = numpy.asarray(keys, dtype=float)
+    y = numpy.asarray(rows, dtype=float)
+    h = numpy.diff(x)[:, numpy.newaxis]
+    delta = numpy.diff(y, axis=0) / h
+    slopes = numpy.empty_like(y)
+    if len(x) == 2:
+        slopes[:] = delta
+    else:
+        d0, d1 = delta[:-1], delta[1:]
+        h0, h1 = h[:-1], h[1:]
+        w1, w2 = 2 * h1 + h0, h1 + 2 * h0
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            harmonic = (w1 + w2) / (w1 / d0 + w2 / d1)
+        # local extremes and flat segments get an horizontal tangent
+        slopes[1:-1] = numpy.where(d0 * d1 > 0, harmonic, 0.0)
+        slopes[0] = _edge_slope(h[0], h[1], delta[0], delta[1])
+        slopes[-1] = _edge_slope(h[-1], h[-2], delta[-1], delta[-2])
+    c = (3 * delta - 2 * slopes[:-1] - slopes[1:]) / h
+    d = (slopes[:-1] + slopes[1:] - 2 * delta) / h ** 2
+    return numpy.dstack((y[:-1], slopes[:-1], c, d))
@@ -2,16 +2,25 @@
 # -*- coding: utf-8 -*-
 """Chemical substances and its properties."""
 
-from substances.tables import SaturatedWaterTable
+from __future__ import absolute_import
+
+import numpy
+
+from instrumentation import instrumented
+from substances import backends
+from substances.tables import (SaturatedWaterTable, SuperheatedSteamTable,
+                               CompressedWaterTable, OutOfTableRange)
 from units import UndefinedUnit, GenericUnit, UnitMismatch, UnitNotSupported
 from units.temperature import Celcius
 from units.pressure import KiloPascal
 from units.energy import KJPerKg
 from units.amount import CubicMeterPerKiloGram, Mass, Volume
+from units.arrays import QuantityArray
 from containers import Flask
 from properties import GenericProperty, SpecificEnthalpy, Enthalpy
 
-__dir__ = ['SaturationLineWater', 'SaturatedWater', 'SaturatedSteam']
+__dir__ = ['SaturationLineWater', 'SaturatedWater', 'SaturatedSteam', 'WetSteam',
+           'SuperheatedSteam', 'CompressedWater']
 __all__ = __dir__
 
 
@@ -19,21 +28,186 @@ class UnknownState(Exception):
     pass
 
 
+class StateAttribute(object):
+    """Substance attribute built from its table state on first access.
+
+    The built value is kept on a slot of the instance, so states that are
+    never read cost nothing but the raw table row. Columns left out of the
+    lookup, see SaturationLineWater.__init__, are None on the row.
+    """
+
+    def __init__(self, name, column, unit, wrapper, slot):
+        """Attribute of given column, unit and wrapper kept on slot."""
+        self.name = name
+        self.column = column
+        self.unit = unit
+        self.wrapper = wrapper
+        self.slot = slot
+
+    def __get__(self, instance, owner):
+        """Build the attribute value if it was not done yet."""
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = instance._state[self.column]
+            if value is None:
+                raise UnknownState("%s was not looked up, it isn't one of the "
+                                   "requested attributes" % self.name)
+            if self.unit is not None:
+                value = self.unit(value)
+            if self.wrapper is not None:
+                value = self.wrapper(value)
+            self.slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance, value):
+        """Replace the attribute value."""
+        self.slot.__set__(instance, value)
+
+
+def _new_slots(attributes, base):
+    """Slots for given attributes that base class does not have yet."""
+    return tuple("_" + attribute[0] for attribute in attributes
+                 if "_" + attribute[0] not in base.__slots__)
+
+
+def _column(states, column, positions):
+    """Values of a table column on states holding the columns at positions.
+
+    All of them for None positions. None if the column isn't one of them.
+    """
+    if positions is None:
+        return states[..., column]
+    if column not in positions:
+        return None
+    return states[..., positions.index(column)]
+
+
+def _bind_attributes(cls):
+    """Create a StateAttribute for each attribute of a substance class."""
+    for attribute, column, unit, wrapper in cls._attributes:
+        setattr(cls, attribute, StateAttribute(attribute, column, unit, wrapper,
+                                               getattr(cls, "_" + attribute)))
+
+
 class SaturationLineWater(object):
     """Abstraction of saturated water."""
 
     name = "Water on saturation line"
     _table = SaturatedWaterTable
+    # backend name: backend, see substances.backends
+    _backends = {
+        "table": backends.TableBackend(SaturatedWaterTable),
+        "memory": backends.TableBackend(SaturatedWaterTable, "memory"),
+        "sqlite": backends.TableBackend(SaturatedWaterTable, "sqlite"),
+        "if97": backends.SaturationIF97(),
+    }
+    # backend of this class, None for the global default
+    backend = None
+    # records _set_state() calls, see instrumentation
+    instruments = None
+    # attribute, table column, unit and property wrapping the unit. Each one
+    # is built from the table state on first access, see StateAttribute.
+    _attributes = (
+        ("temperature", 0, Celcius, None),
+        ("pressure", 1, KiloPascal, None),
+        ("volume_liquid", 2, CubicMeterPerKiloGram, None),
+        ("volume_vapor", 3, CubicMeterPerKiloGram, None),
+        ("energy_liquid", 4, KJPerKg, None),
+        ("energy_vaporisation", 5, KJPerKg, None),
+        ("energy_vapor", 6, KJPerKg, None),
+        ("enthalpy_liquid", 7, KJPerKg, SpecificEnthalpy),
+        ("enthalpy_vaporisation", 8, KJPerKg, SpecificEnthalpy),
+        ("enthalpy_vapor", 9, KJPerKg, SpecificEnthalpy),
+        ("entropy_liquid", 10, None, None),
+        ("entropy_vaporization", 11, None, None),
+        ("entropy_vapor", 12, None, None),
+    )
+    # unit property name of quantities known by a column that may turn
+    # along the line: table column and unit, see _find_inverse()
+    _inverse = {}
+    # attribute: table columns of the properties computed from the state
+    _derived = {}
+    # attributes of the representation, always looked up
+    _shown = ("temperature", )
+    # (class, attributes): table column positions and names, see _projection()
+    _projections = {}
+    __slots__ = ("_state", ) + tuple("_" + a[0] for a in _attributes)
+
+    def __init__(self, property_state, backend=None, attributes=None, branch=None):
+        """The substance instance need one known property value.
+
+        ``backend`` is the name of the one finding the state, see
+        substances.backends. When the names of the ``attributes`` to be
+        read are given only those are looked up, reading others raises
+        UnknownState:
+
+            SaturatedWater(Celcius(50), attributes=("pressure", ))
+
+        Some properties are the same on two states of the line, like the
+        enthalpy of saturated steam. Those need the ``branch`` of the state
+        (see find_all() and Table.branches()), else raise UnknownState:
 
-    def __init__(self, property_state):
-        """The substance instance need one known property value."""
+            SaturatedSteam(SpecificEnthalpy(KJPerKg(2790)), branch=0)
+        """
         if not any([isinstance(property_state, GenericUnit),
                     isinstance(property_state, GenericProperty)]):
             raise UndefinedUnit("Unit instance is needed")
-        self._set_state(property_state)
+        self._set_state(property_state, backend, attributes, branch=branch)
 
-    def _find_state(self, property_state):
-        """Find thermodynamics state of the substance with given properties."""
+    @classmethod
+    def _projection(cls, attributes):
+        """Table columns of given attributes.
+
+        Returns their positions and names, plus for every table column its
+        position on the looked up ones, or one past them if left out.
+        """
+        key = (cls, tuple(attributes))
+        try:
+            return cls._projections[key]
+        except KeyError:
+            pass
+        columns = dict((attribute[0], (attribute[1], )) for attribute in cls._attributes)
+        columns.update(cls._derived)
+        positions = set()
+        for attribute in attributes:
+            if attribute not in columns:
+                raise AttributeError("%s has no %s attribute" % (cls.__name__,
+                                                                  attribute))
+            positions.update(columns[attribute])
+        names = cls.columns()
+        positions = sorted(positions)
+        projection = cls._projections[key] = (
+            positions, tuple(names[position] for position in positions),
+            [positions.index(position) if position in positions else len(positions)
+             for position in range(len(names))])
+        return projection
+
+    @classmethod
+    def _backend(cls, name=None):
+        """Backend of given name, or the one of the class or the default."""
+        if name is None and cls.backend is None:
+            name = backends.default()
+            if name not in cls._backends:
+                name = "table"
+        name = name or cls.backend
+        try:
+            return cls._backends[name]
+        except KeyError:
+            raise backends.UnknownBackend("%s has no %s backend, only %s" % (
+                                          cls.__name__, name,
+                                          ", ".join(sorted(cls._backends))))
+
+    def _find_state(self, property_state, backend=None, columns=None, branch=None):
+        """Find thermodynamics state of the substance with given properties.
+
+        Only ``columns`` are looked up, in that order, if given.
+        """
+        inverse = self._inverse_value(property_state)
+        if inverse is not None:
+            return self._find_inverse(inverse[0], inverse[1], backend, columns, branch)
         property_name = property_state.property_name
         if property_name == "temperature":
             value = Celcius(property_state).value
@@ -43,24 +217,191 @@ class SaturationLineWater(object):
             raise UnknownState("Water saturation line have ambiguous enthalpy")
         else:
             raise UnitNotSupported("%s is not supported" % property_name)
-        return self._table.find_state(property_name, value)
-
-    def _set_state(self, property_state):
-        """Set instance atributes for given state."""
-        data = self._find_state(property_state)
-        self.temperature = Celcius(data[0])
-        self.pressure = KiloPascal(data[1])
-        self.volume_liquid = CubicMeterPerKiloGram(data[2])
-        self.volume_vapor = CubicMeterPerKiloGram(data[3])
-        self.energy_liquid = KJPerKg(data[4])
-        self.energy_vaporisation = KJPerKg(data[5])
-        self.energy_vapor = KJPerKg(data[6])
-        self.enthalpy_liquid = SpecificEnthalpy(KJPerKg(data[7]))
-        self.enthalpy_vaporisation = SpecificEnthalpy(KJPerKg(data[8]))
-        self.enthalpy_vapor = SpecificEnthalpy(KJPerKg(data[9]))
-        self.entropy_liquid = data[10]
-        self.entropy_vaporization = data[11]
-        self.entropy_vapor = data[12]
+        return self._backend(backend).find_state(property_name, value, columns=columns)
+
+    @classmethod
+    def _inverse_value(cls, property_state):
+        """Table column and value of a quantity of ``_inverse``, else None."""
+        if isinstance(property_state, GenericProperty):
+            property_state = property_state._base_unit
+        try:
+            column, unit = cls._inverse[property_state.property_name]
+        except KeyError:
+            return None
+        return column, unit(property_state).value
+
+    @classmethod
+    def _find_inverse(cls, column, value, backend=None, columns=None, branch=None):
+        """State of a column value, on given branch or on the only one with it."""
+        found = cls._backend(backend)
+        if branch in (None, 0, -1) and len(found.branches(column)) == 1:
+            return found.find_state(column, value, columns=columns)
+        if branch is not None:
+            return found.find_branch_state(column, value, branch, columns)
+        states = found.find_all_states(column, value, columns)
+        if len(states) == 1:
+            return states[0]
+        if not states:
+            raise OutOfTableRange("Value '%s' for %s is out of table." % (value, column))
+        raise UnknownState("%d states of %s have %s %s, a branch is needed" % (
+                           len(states), cls.name, column, value))
+
+    @classmethod
+    def find_all(cls, property_state, backend=None):
+        """Every state of the substance with given property, one per branch.
+
+        For the properties that may be the same on more than one state of
+        the line, like the enthalpy of saturated steam. States are in
+        branch order, none if the value is out of the line.
+        """
+        inverse = cls._inverse_value(property_state)
+        if inverse is None:
+            raise UnitNotSupported("%s is known by a single state" %
+                                   property_state.property_name)
+        return [cls._from_state(state)
+                for state in cls._backend(backend).find_all_states(*inverse)]
+
+    @classmethod
+    def _table_column(cls, quantity):
+        """Table column and table unit to look up given quantity."""
+        property_name = quantity.property_name
+        if property_name in cls._inverse:
+            return cls._inverse[property_name]
+        elif property_name == "temperature":
+            return property_name, Celcius
+        elif property_name == "pressure":
+            return property_name, KiloPascal
+        elif property_name == "specific_energy":
+            raise UnknownState("Water saturation line have ambiguous enthalpy")
+        else:
+            raise UnitNotSupported("%s is not supported" % property_name)
+
+    @classmethod
+    def find_states(cls, values, unit=None, masked=False, backend=None,
+                    columns=None, branch=None):
+        """Find thermodynamics states for an array of values.
+
+        ``values`` is a QuantityArray or plain values of given unit class.
+        Returns an array with one row per value holding every table column,
+        in the order of ``columns()``, or the ``columns`` names given. See
+        Table.find_states. Values on more than one branch, when no
+        ``branch`` is given, raise UnknownState like the out of table ones.
+        """
+        if not isinstance(values, QuantityArray):
+            if unit is None:
+                raise UndefinedUnit("Unit is needed for plain values")
+            values = QuantityArray(values, unit)
+        property_name, table_unit = cls._table_column(values)
+        if values.property_name in cls._inverse:
+            return cls._find_inverse_states(property_name, values.to(table_unit).value,
+                                            masked, backend, columns, branch)
+        return cls._backend(backend).find_states(property_name,
+                                                 values.to(table_unit).value,
+                                                 masked=masked, columns=columns)
+
+    @classmethod
+    def _find_inverse_states(cls, column, values, masked=False, backend=None,
+                             columns=None, branch=None):
+        """Same as _find_inverse(), for an array of values."""
+        found = cls._backend(backend)
+        if branch in (None, 0, -1) and len(found.branches(column)) == 1:
+            return found.find_states(column, values, masked=masked, columns=columns)
+        if branch is not None:
+            return found.find_branch_states(column, values, branch, masked=masked,
+                                            columns=columns)
+        states = ambiguous = None
+        for number in range(len(found.branches(column))):
+            on_branch = found.find_branch_states(column, values, number, masked=True,
+                                                 columns=columns)
+            if states is None:
+                states = on_branch
+                ambiguous = numpy.zeros(values.shape, dtype=bool)
+                continue
+            hit = ~numpy.ma.getmaskarray(on_branch).any(axis=-1)
+            taken = ~numpy.ma.getmaskarray(states).any(axis=-1)
+            # branches share the state at their turn
+            same = numpy.isclose(numpy.ma.getdata(on_branch), numpy.ma.getdata(states))
+            ambiguous |= hit & taken & ~same.all(axis=-1)
+            states[hit & ~taken] = on_branch[hit & ~taken]
+        if ambiguous.any():
+            if not masked:
+                raise UnknownState("%d values for %s are on more than one branch, "
+                                   "one is needed: %s" % (ambiguous.sum(), column,
+                                                          values[ambiguous]))
+            states[ambiguous] = numpy.ma.masked
+        outside = numpy.ma.getmaskarray(states).any(axis=-1)
+        if outside.any() and not masked:
+            raise OutOfTableRange("%d values for %s are out of table: %s" % (
+                                  outside.sum(), column, values[outside]))
+        return states if masked else numpy.ma.getdata(states)
+
+    @classmethod
+    def find_quantities(cls, values, unit=None, masked=False, backend=None,
+                        attributes=None, branch=None):
+        """Same as find_states() but as a dict of QuantityArray.
+
+        Keys are the attributes an instance of this class would have, or
+        the ``attributes`` given: only their columns are looked up.
+        """
+        if attributes is None:
+            return cls._quantities(cls.find_states(values, unit, masked=masked,
+                                                   backend=backend, branch=branch))
+        positions, columns, _ = cls._projection(attributes)
+        quantities = cls._quantities(cls.find_states(values, unit, masked=masked,
+                                                     backend=backend, columns=columns,
+                                                     branch=branch),
+                                     positions)
+        return dict((attribute, quantities[attribute]) for attribute in attributes)
+
+    @classmethod
+    def _quantities(cls, states, positions=None):
+        """Dict of attribute: QuantityArray for given table states.
+
+        ``positions`` are the table columns states hold, all of them by
+        default. Attributes of other columns are left out.
+        """
+        quantities = {}
+        for attribute, column, unit, wrapper in cls._attributes:
+            values = _column(states, column, positions)
+            if values is None:
+                continue
+            quantities[attribute] = values if unit is None else QuantityArray(values, unit)
+        return quantities
+
+    @classmethod
+    def columns(cls):
+        """Names of the columns returned by find_states()."""
+        return cls._table.columns()
+
+    @instrumented
+    def _set_state(self, property_state, backend=None, attributes=None, **options):
+        """Keep the table state, attributes are built from it when used.
+
+        With ``attributes`` only their columns are looked up, the others
+        are None. Options go to _find_state().
+        """
+        if attributes is None:
+            self._state = tuple(self._find_state(property_state, backend, **options))
+            return
+        _, columns, expand = self._projection(tuple(attributes) + self._shown)
+        state = list(self._find_state(property_state, backend, columns, **options))
+        state.append(None)
+        self._state = tuple(map(state.__getitem__, expand))
+
+    @classmethod
+    def _from_state(cls, state):
+        """Create an instance of an already known table state."""
+        instance = cls.__new__(cls)
+        instance._state = tuple(state)
+        return instance
+
+    def __getstate__(self):
+        """Pickle the table state only."""
+        return self._state
+
+    def __setstate__(self, state):
+        """Restore the table state."""
+        self._state = state
 
     def __unicode__(self):
         """Unicode representation."""
@@ -76,7 +417,7 @@ class SaturationLineWater(object):
 
     def __mul__(self, multiplier):
         """Allow to multiply substance to amount and result a container."""
-        if isinstance(multiplier, Mass) or isinstance(multiplier, Volume):
+        if isinstance(multiplier, (Mass, Volume, QuantityArray)):
             return Flask(self, multiplier)
         else:
             return super(self.__class__, self).__mul__(multiplier)
@@ -86,39 +427,341 @@ class SaturatedWater(SaturationLineWater):
     """Liquid water on saturated state."""
 
     name = "Saturated water"
-
-    def _find_state(self, property_state):
-        """Find thermodynamics state of the substance with given properties."""
-        if property_state.property_name == "specific enthalpy":
-            property_name = "enthalpy_liquid"
-            value = property_state.specific_energy.kJperkg.value
-            return self._table.find_state(property_name, value)
-        return super(SaturatedWater, self)._find_state(property_state)
-
-    def _set_state(self, property_state):
-        """Set instance atributes for given state."""
-        data = self._find_state(property_state)
-        self.temperature = Celcius(data[0])
-        self.pressure = KiloPascal(data[1])
-        self.volume = CubicMeterPerKiloGram(data[2])
-        self.energy = KJPerKg(data[4])
-        self.enthalpy = SpecificEnthalpy(KJPerKg(data[7]))
-        self.enthalpy_vaporisation = SpecificEnthalpy(KJPerKg(data[8]))
-        self.entropy = data[10]
+    _attributes = (
+        ("temperature", 0, Celcius, None),
+        ("pressure", 1, KiloPascal, None),
+        ("volume", 2, CubicMeterPerKiloGram, None),
+        ("energy", 4, KJPerKg, None),
+        ("enthalpy", 7, KJPerKg, SpecificEnthalpy),
+        ("enthalpy_vaporisation", 8, KJPerKg, SpecificEnthalpy),
+        ("entropy", 10, None, None),
+    )
+    _inverse = {"specific_energy": ("enthalpy_liquid", KJPerKg),
+                "specific_volume": ("volume_liquid", CubicMeterPerKiloGram)}
+    __slots__ = _new_slots(_attributes, SaturationLineWater)
 
 
 class SaturatedSteam(SaturationLineWater):
     """Liquid water on saturated state."""
 
     name = "Saturated steam"
+    _attributes = (
+        ("temperature", 0, Celcius, None),
+        ("pressure", 1, KiloPascal, None),
+        ("volume", 3, CubicMeterPerKiloGram, None),
+        ("energy", 6, KJPerKg, None),
+        ("enthalpy", 9, KJPerKg, SpecificEnthalpy),
+        ("entropy", 12, None, None),
+    )
+    _inverse = {"specific_energy": ("enthalpy_vapor", KJPerKg),
+                "specific_volume": ("volume_vapor", CubicMeterPerKiloGram)}
+    _derived = {"enthalpy_condensation": (8, )}
+    __slots__ = _new_slots(_attributes, SaturationLineWater)
+
+    @property
+    def enthalpy_condensation(self):
+        """Specific enthalpy released by condensation."""
+        if self._state[8] is None:
+            raise UnknownState("enthalpy_condensation was not looked up, it isn't "
+                               "one of the requested attributes")
+        return SpecificEnthalpy(KJPerKg(self._state[8]) * -1)
+
+    @classmethod
+    def _quantities(cls, states, positions=None):
+        """Dict of attribute: QuantityArray for given table states."""
+        quantities = super(SaturatedSteam, cls)._quantities(states, positions)
+        vaporisation = _column(states, 8, positions)
+        if vaporisation is not None:
+            quantities["enthalpy_condensation"] = QuantityArray(vaporisation * -1,
+                                                                KJPerKg)
+        return quantities
+
+
+class WetSteam(SaturationLineWater):
+    """Mixture of saturated water and saturated steam.
+
+    Known by its saturation temperature or pressure plus one of: quality
+    (steam mass fraction, from 0 to 1), specific enthalpy or specific
+    volume of the mixture.
+
+        WetSteam(Bar(0.1), 0.92)
+        WetSteam(Bar(0.1), SpecificEnthalpy(KJPerKg(2400)))
+        WetSteam(Celcius(45), CubicMeterPerKiloGram(12))
+    """
+
+    name = "Wet steam"
+    # mixture columns are appended to the saturation ones, see _mix()
+    _attributes = (
+        ("temperature", 0, Celcius, None),
+        ("pressure", 1, KiloPascal, None),
+        ("quality", 13, None, None),
+        ("volume", 14, CubicMeterPerKiloGram, None),
+        ("energy", 15, KJPerKg, None),
+        ("enthalpy", 16, KJPerKg, SpecificEnthalpy),
+        ("entropy", 17, None, None),
+    )
+    __slots__ = _new_slots(_attributes, SaturationLineWater)
+
+    def __init__(self, property_state, mixture_state, backend=None):
+        """Saturation temperature or pressure and a mixture property."""
+        if not any([isinstance(property_state, GenericUnit),
+                    isinstance(property_state, GenericProperty)]):
+            raise UndefinedUnit("Unit instance is needed")
+        self._set_state((property_state, mixture_state), backend)
+
+    def _find_state(self, property_states, backend=None, columns=None):
+        """Saturation state plus the mixture columns, see _mix()."""
+        property_state, mixture_state = property_states
+        state = tuple(super(WetSteam, self)._find_state(property_state, backend))
+        if isinstance(mixture_state, GenericProperty):
+            mixture_state = mixture_state._base_unit
+        property_name = getattr(mixture_state, "property_name", None)
+        if property_name is None:
+            quality = float(mixture_state)
+        elif property_name == "specific_energy":
+            if not state[8]:
+                raise UnknownState("Enthalpy doesn't tell the quality at the "
+                                   "critical point")
+            quality = (KJPerKg(mixture_state).value - state[7]) / state[8]
+        elif property_name == "specific_volume":
+            if state[3] == state[2]:
+                raise UnknownState("Volume doesn't tell the quality at the "
+                                   "critical point")
+            quality = ((CubicMeterPerKiloGram(mixture_state).value - state[2]) /
+                       (state[3] - state[2]))
+        else:
+            raise UnitNotSupported("%s is not supported" % property_name)
+        if not 0 <= quality <= 1:
+            raise UnknownState("Quality %s is out of the wet region" % quality)
+        volume = state[2] + quality * (state[3] - state[2])
+        return state + (quality, volume, state[4] + quality * state[5],
+                        state[7] + quality * state[8],
+                        state[10] + quality * state[11])
+
+    def __unicode__(self):
+        """Unicode representation."""
+        return u"%s at %s, quality %.2f" % (self.name, self.temperature,
+                                           self.quality)
+
+    @classmethod
+    def find_states(cls, values, mixture_states, unit=None, masked=False,
+                    backend=None):
+        """Find states of many mixtures at once.
+
+        ``values`` are saturation temperatures or pressures, like on
+        SaturationLineWater.find_states. ``mixture_states`` are qualities,
+        as plain numbers, or a QuantityArray of specific enthalpies or
+        specific volumes. Mixtures out of the wet region raise UnknownState
+        for the whole batch, unless ``masked`` is set: then their rows are
+        masked out. Rows have the table columns plus quality, volume,
+        energy, enthalpy and entropy of the mixture.
+        """
+        states = super(WetSteam, cls).find_states(values, unit, masked=masked,
+                                                  backend=backend)
+        if isinstance(mixture_states, QuantityArray):
+            property_name = mixture_states.property_name
+            if property_name == "specific_energy":
+                quality = ((mixture_states.to(KJPerKg).value - states[..., 7]) /
+                           states[..., 8])
+            elif property_name == "specific_volume":
+                quality = ((mixture_states.to(CubicMeterPerKiloGram).value -
+                            states[..., 2]) / (states[..., 3] - states[..., 2]))
+            else:
+                raise UnitNotSupported("%s is not supported" % property_name)
+        else:
+            quality = numpy.asarray(mixture_states, dtype=float)
+            quality = quality + numpy.zeros(states.shape[:-1])
+        with numpy.errstate(invalid="ignore"):
+            # written this way so NaN is out of the region too
+            outside = numpy.ma.filled(~((quality >= 0) & (quality <= 1)), False)
+        if outside.any():
+            if not masked:
+                raise UnknownState("%d qualities are out of the wet region: %s" % (
+                                   outside.sum(), quality[outside]))
+        mixed = cls._mix(states, quality)
+        if masked:
+            # whole rows, the mixed columns of them included
+            outside = outside | numpy.ma.getmaskarray(states).any(axis=-1)
+        if outside.any():
+            mixed = numpy.ma.masked_array(mixed)
+            mixed[outside] = numpy.ma.masked
+        return mixed
+
+    @classmethod
+    def find_quantities(cls, values, mixture_states, unit=None, masked=False,
+                        backend=None):
+        """Same as find_states() but as a dict of QuantityArray."""
+        return cls._quantities(cls.find_states(values, mixture_states, unit,
+                                               masked=masked, backend=backend))
+
+    @staticmethod
+    def _mix(states, quality):
+        """Append quality, volume, energy, enthalpy and entropy columns."""
+        volume = states[..., 2] + quality * (states[..., 3] - states[..., 2])
+        energy = states[..., 4] + quality * states[..., 5]
+        enthalpy = states[..., 7] + quality * states[..., 8]
+        entropy = states[..., 10] + quality * states[..., 11]
+        concatenate = numpy.concatenate
+        if numpy.ma.isMaskedArray(states):
+            concatenate = numpy.ma.concatenate
+        return concatenate([states] + [column[..., numpy.newaxis] for column in
+                                       (quality, volume, energy, enthalpy, entropy)],
+                           axis=-1)
+
+
+class SinglePhaseWater(SaturationLineWater):
+    """Abstraction of water out of the saturation line, in a single phase.
+
+    Known by its pressure and temperature, in any order:
+
+        SuperheatedSteam(Bar(10), Celcius(300))
+    """
+
+    name = "Single phase water"
+    _table = None
+    _backends = {}
+    # True for the vapor side of the saturation line, False for the liquid
+    _vapor = None
+    _attributes = (
+        ("pressure", 0, KiloPascal, None),
+        ("temperature", 1, Celcius, None),
+        ("volume", 2, CubicMeterPerKiloGram, None),
+        ("energy", 3, KJPerKg, None),
+        ("enthalpy", 4, KJPerKg, SpecificEnthalpy),
+        ("entropy", 5, None, None),
+    )
+    _shown = ("pressure", "temperature")
+    __slots__ = _new_slots(_attributes, SaturationLineWater)
+
+    def __init__(self, first_state, second_state, backend=None, attributes=None):
+        """The substance instance need its pressure and temperature.
+
+        ``backend`` and ``attributes`` are the same as on
+        SaturationLineWater.
+        """
+        property_states = (first_state, second_state)
+        if not all([isinstance(property_state, (GenericUnit, GenericProperty))
+                    for property_state in property_states]):
+            raise UndefinedUnit("Unit instance is needed")
+        self._set_state(property_states, backend, attributes)
+
+    @staticmethod
+    def _pressure_temperature(property_states):
+        """Pressure and temperature out of two unit instances."""
+        states = dict((property_state.property_name, property_state)
+                      for property_state in property_states)
+        if set(states) != set(["pressure", "temperature"]):
+            raise UnitNotSupported("Pressure and temperature are needed")
+        return states["pressure"], states["temperature"]
+
+    def _find_state(self, property_states, backend=None, columns=None):
+        """Find thermodynamics state of the substance with given properties."""
+        pressure, temperature = self._pressure_temperature(property_states)
+        pressure = KiloPascal(pressure).value
+        temperature = Celcius(temperature).value
+        if self._wrong_side(numpy.array([pressure]), numpy.array([temperature]))[0]:
+            raise UnknownState("%s is beyond the saturation line at %s kPa, %s °C" % (
+                               self.name, pressure, temperature))
+        return self._backend(backend).find_state(pressure, temperature, columns=columns)
+
+    @classmethod
+    def _wrong_side(cls, pressures, temperatures):
+        """Mask of the points beyond the saturation line for this phase.
+
+        Points over the critical pressure are on both sides.
+        """
+        line = SaturatedWaterTable.find_states(
+            "pressure", numpy.clip(pressures, 0.6113, 22089.0), masked=True)
+        saturation = numpy.ma.filled(line[..., 0], numpy.nan)
+        with numpy.errstate(invalid="ignore"):
+            saturation[pressures > 22089.0] = numpy.nan
+            if cls._vapor:
+                return temperatures < saturation
+            return temperatures > saturation
+
+    @classmethod
+    def find_states(cls, pressures, temperatures, pressure_unit=None,
+                    temperature_unit=None, masked=False, backend=None, columns=None):
+        """Find thermodynamics states for arrays of pressures and temperatures.
+
+        Both are QuantityArray or plain values of given unit class. Returns
+        an array with one row per point holding every table column, in the
+        order of ``columns()``, or the ``columns`` names given. Points out
+        of the table or beyond the saturation line raise for the whole
+        batch, unless ``masked`` is set: then their rows are masked out.
+        """
+        quantities = []
+        for values, unit, table_unit in ((pressures, pressure_unit, KiloPascal),
+                                         (temperatures, temperature_unit, Celcius)):
+            if not isinstance(values, QuantityArray):
+                if unit is None:
+                    raise UndefinedUnit("Unit is needed for plain values")
+                values = QuantityArray(values, unit)
+            if values.property_name != table_unit.property_name:
+                raise UnitMismatch("%s is needed, not %s" % (
+                                   table_unit.property_name, values.property_name))
+            quantities.append(values.to(table_unit).value)
+        pressures, temperatures = numpy.broadcast_arrays(*quantities)
+        outside = cls._wrong_side(pressures, temperatures)
+        if outside.any() and not masked:
+            raise UnknownState("%d points are beyond the saturation line for %s" % (
+                               outside.sum(), cls.name))
+        states = cls._backend(backend).find_states(pressures, temperatures,
+                                                   masked=masked, columns=columns)
+        if masked and outside.any():
+            states[outside] = numpy.ma.masked
+        return states
+
+    @classmethod
+    def find_quantities(cls, pressures, temperatures, pressure_unit=None,
+                        temperature_unit=None, masked=False, backend=None,
+                        attributes=None):
+        """Same as find_states() but as a dict of QuantityArray.
+
+        Only the ``attributes`` given are looked up, if any.
+        """
+        if attributes is None:
+            return cls._quantities(cls.find_states(pressures, temperatures,
+                                                   pressure_unit, temperature_unit,
+                                                   masked=masked, backend=backend))
+        positions, columns, _ = cls._projection(attributes)
+        quantities = cls._quantities(cls.find_states(pressures, temperatures,
+                                                     pressure_unit, temperature_unit,
+                                                     masked=masked, backend=backend,
+                                                     columns=columns), positions)
+        return dict((attribute, quantities[attribute]) for attribute in attributes)
+
+    def __unicode__(self):
+        """Unicode representation."""
+        return u"%s at %s, %s" % (self.name, self.pressure, self.temperature)
+
+
+class SuperheatedSteam(SinglePhaseWater):
+    """Steam over its saturation temperature."""
+
+    name = "Superheated steam"
+    _table = SuperheatedSteamTable
+    _backends = {
+        "table": backends.TableBackend(SuperheatedSteamTable),
+        "if97": backends.SinglePhaseIF97(liquid=False),
+    }
+    _vapor = True
+    __slots__ = ()
+
+
+class CompressedWater(SinglePhaseWater):
+    """Liquid water under its saturation temperature."""
+
+    name = "Compressed water"
+    _table = CompressedWaterTable
+    _backends = {
+        "table": backends.TableBackend(CompressedWaterTable),
+        "if97": backends.SinglePhaseIF97(liquid=True),
+    }
+    _vapor = False
+    __slots__ = ()
+
 
-    def _set_state(self, property_state):
-        """Set instance atributes for given state."""
-        data = self._find_state(property_state)
-        self.temperature = Celcius(data[0])
-        self.pressure = KiloPascal(data[1])
-        self.volume = CubicMeterPerKiloGram(data[3])
-        self.energy = KJPerKg(data[6])
-        self.enthalpy = SpecificEnthalpy(KJPerKg(data[9]))
-        self.enthalpy_condensation = SpecificEnthalpy(KJPerKg(data[8]) * -1)
-        self.entropy = data[12]
+for _substance in (SaturationLineWater, SaturatedWater, SaturatedSteam, WetSteam,
+                   SinglePhaseWater):
+    _bind_attributes(_substance)
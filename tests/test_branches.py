@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests of the lookups of columns that turn, see Table.branches()."""
+
+from __future__ import absolute_import
+
+import unittest
+
+from instrumentation import Instruments
+from properties import SpecificEnthalpy
+from substances.tables import SaturatedWaterTable
+from substances.tables.cache import StateCache
+from substances.water import SaturatedWater, SaturatedSteam
+from units.energy import KJPerKg
+
+
+class BranchSettingsTest(unittest.TestCase):
+    """Branch lookups go through the settings of the table."""
+
+    def tearDown(self):
+        SaturatedWaterTable.cache = None
+        SaturatedWaterTable.instruments = None
+        SaturatedWaterTable.in_memory = True
+
+    def test_single_branch_is_a_plain_lookup(self):
+        SaturatedWaterTable.cache = StateCache()
+        SaturatedWaterTable.instruments = Instruments()
+        for enthalpy in (209.3, 300, 209.3):
+            SaturatedWater(SpecificEnthalpy(KJPerKg(enthalpy)))
+        counters = SaturatedWaterTable.instruments.snapshot()
+        self.assertEqual(counters["SaturatedWaterTable.find_state"]["calls"], 3)
+        self.assertEqual(SaturatedWaterTable.cache.stats()["hits"], 1)
+
+    def test_branch_is_cached(self):
+        SaturatedWaterTable.cache = StateCache()
+        for _ in range(2):
+            SaturatedSteam(SpecificEnthalpy(KJPerKg(2790)), branch=1)
+        self.assertEqual(SaturatedWaterTable.cache.stats()["hits"], 1)
+
+    def test_branch_on_sqlite(self):
+        states = []
+        for in_memory in (True, False):
+            SaturatedWaterTable.in_memory = in_memory
+            states.append([SaturatedSteam(SpecificEnthalpy(KJPerKg(2790)),
+                                          branch=branch).temperature.value
+                           for branch in (0, 1)])
+        for memory, sqlite in zip(*states):
+            self.assertAlmostEqual(memory, sqlite)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests of the lookup service."""
+
+from __future__ import absolute_import
+
+import json
+import unittest
+
+from substances.service import LookupService
+
+
+class TurningColumnTest(unittest.TestCase):
+    """Lookups of a column that turns along the saturation line."""
+
+    def setUp(self):
+        self.service = LookupService()
+
+    def tearDown(self):
+        self.service.close()
+
+    def respond(self, **request):
+        return self.service.respond(json.dumps(request))
+
+    def test_states_are_not_mixed_across_branches(self):
+        status, answer = self.respond(substance="SaturatedSteam", unit="KJPerKg",
+                                      values=[2790, 2500, 2804.13])
+        self.assertEqual(status, 200)
+        ambiguous, vapor, turn = answer["states"]
+        # on both branches
+        self.assertIsNone(ambiguous)
+        # on the high temperature branch only, not 23.89 °C at 1237.86 kPa
+        self.assertAlmostEqual(vapor["enthalpy"], 2500.0)
+        self.assertGreater(vapor["temperature"], 235.0)
+        self.assertGreater(vapor["pressure"], 3060.1)
+        self.assertAlmostEqual(turn["temperature"], 235.0)
+
+    def test_branch(self):
+        states = [self.respond(substance="SaturatedSteam", unit="KJPerKg",
+                               value=2790, branch=branch)[1]["state"]
+                  for branch in (0, 1)]
+        self.assertLess(states[0]["temperature"], 235.0)
+        self.assertGreater(states[1]["temperature"], 235.0)
+        for state in states:
+            self.assertAlmostEqual(state["enthalpy"], 2790.0)
+
+    def test_unknown_branch(self):
+        status, answer = self.respond(substance="SaturatedSteam", unit="KJPerKg",
+                                      value=2790, branch=2)
+        self.assertEqual(status, 400)
+        self.assertIn("no branch 2", answer["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
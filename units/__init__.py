@@ -1,6 +1,21 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-"""Abstraction of phisical properties and it's units."""
+"""Abstraction of phisical properties and it's units.
+
+Every unit class is registered with the scale and offset of its values
+relative to the base unit of its property, see register(). Conversions
+between any two units are then a single multiply and add:
+
+    convert(14.7, PSI, KiloPascal)
+    convert(numpy.array([20.0, 100.0]), Celcius, Fahrenheit)
+"""
+
+from __future__ import absolute_import
+
+# unit class: (scale, offset) so that base_value = value * scale + offset
+_units = {}
+# (from unit, to unit): (scale, offset), worked out on first use
+_conversions = {}
 
 
 class UnitNotSupported(Exception):
@@ -26,11 +41,13 @@ class UnlogicalOperation(Exception):
 
 
 class GenericUnit(object):
-    """Every unit must extend this object."""
+    """Every unit must extend this object.
 
-    # Unit value
-    value = None
-    base_value = None
+    Units hold their value and the same value on the base unit of the
+    property, nothing else, so every subclass declares empty __slots__.
+    """
+
+    __slots__ = ("value", "base_value")
     symbol = u""
     property_name = ""
 
@@ -38,6 +55,14 @@ class GenericUnit(object):
         """Can't instance."""
         raise UnitNotSupported("Cannot instance %s directly." % self.__class__)
 
+    def __getstate__(self):
+        """State for pickle, slots have no __dict__."""
+        return (self.value, self.base_value)
+
+    def __setstate__(self, state):
+        """Restore pickled state."""
+        self.value, self.base_value = state
+
     def __unicode__(self):
         """Unicode representation."""
         if self.value >= 0.01:
@@ -80,10 +105,13 @@ class GenericUnit(object):
 
     def __add__(self, added):
         """Addition method."""
-        if self.issameproperty(added):
-            return self.__class__(self.value + self.__class__(added).value)
+        cls = self.__class__
+        if added.__class__ is cls:
+            return cls(self.value + added.value)
         elif isinstance(added, float) or isinstance(added, int):
-            return self.__class__(self.value + added)
+            return cls(self.value + added)
+        elif self.issameproperty(added):
+            return cls(self.value + cls(added).value)
         else:
             raise UnlogicalOperation(self, added)
 
@@ -94,6 +122,11 @@ class GenericUnit(object):
 
     def __sub__(self, subtractor):
         """Subtraction method."""
+        cls = self.__class__
+        if subtractor.__class__ is cls:
+            return cls(self.value - subtractor.value)
+        elif isinstance(subtractor, float) or isinstance(subtractor, int):
+            return cls(self.value - subtractor)
         return self + (subtractor * -1)
 
     def __isub__(self, subtractor):
@@ -107,3 +140,55 @@ class GenericUnit(object):
             return self.property_name == other.property_name
         except AttributeError:
             return False
+
+    def to(self, unit):
+        """Same quantity in another unit of same property, see convert()."""
+        converted = unit.__new__(unit)
+        converted.value = convert(self.value, self.__class__, unit)
+        converted.base_value = self.base_value
+        return converted
+
+
+def register(unit, scale=1.0, offset=0.0):
+    """Register a unit class, its base_value = value * scale + offset.
+
+    Subclasses of a registered unit, like aliases, take its scale and
+    offset unless registered themselves.
+    """
+    _units[unit] = (float(scale), float(offset))
+    _conversions.clear()
+    return unit
+
+
+def scale_offset(unit):
+    """Return scale and offset so that base_value = value * scale + offset."""
+    for cls in unit.__mro__:
+        try:
+            return _units[cls]
+        except KeyError:
+            pass
+    raise UnitNotSupported("%s is not a registered unit" % unit)
+
+
+def conversion(from_unit, to_unit):
+    """Return scale and offset so that to value = from value * scale + offset."""
+    try:
+        return _conversions[(from_unit, to_unit)]
+    except KeyError:
+        pass
+    if from_unit.property_name != to_unit.property_name:
+        raise UnitMismatch("Cannot convert %s to %s" % (from_unit.property_name,
+                                                        to_unit.property_name))
+    from_scale, from_offset = scale_offset(from_unit)
+    to_scale, to_offset = scale_offset(to_unit)
+    pair = (from_scale / to_scale, (from_offset - to_offset) / to_scale)
+    _conversions[(from_unit, to_unit)] = pair
+    return pair
+
+
+def convert(value, from_unit, to_unit):
+    """Convert a number, or a NumPy array, between units of same property."""
+    scale, offset = conversion(from_unit, to_unit)
+    if offset:
+        return value * scale + offset
+    return value * scale
@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 """Units shortcuts."""
 
+from __future__ import absolute_import
+
 from units.amount import Liter, KiloGram, CubicMeter, CubicMeterPerKiloGram
 from units.energy import KJPerKg, Joule, KiloJoule
 from units.pressure import (Pascal, KiloPascal, Atmosphere, Bar, PSI,
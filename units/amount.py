@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 """Amount units."""
 
-from units import GenericUnit
+from __future__ import absolute_import
+
+from units import GenericUnit, register
 
 __all__ = ["CubicMeter", "CubicMeterPerKiloGram", "Liter", "KiloGram",
            "CubicMeterPerKiloGram"]
@@ -12,24 +14,26 @@ __dir__ = __all__
 class SpecificVolume(GenericUnit):
     """Abstraction of specific volume units."""
 
+    __slots__ = ()
     property_name = "specific_volume"
 
     def __mul__(self, multiplier):
         """Specific volume versus mass equals volume."""
         if isinstance(multiplier, Mass):
-            return CubicMeter(KiloGram(multiplier).value * self.base_value)
+            return CubicMeter(multiplier.base_value * self.base_value)
         else:
             return super(SpecificVolume, self).__mul__(multiplier)
 
     @property
     def m3_per_kg(self):
         """Pressure using Pascals."""
-        return CubicMeterPerKiloGram(self.base_value)
+        return self.to(CubicMeterPerKiloGram)
 
 
 class CubicMeterPerKiloGram(SpecificVolume):
     """Cubic meter per kilogram unit."""
 
+    __slots__ = ()
     symbol = u"m³/kg"
 
     def __init__(self, value):
@@ -43,29 +47,32 @@ class CubicMeterPerKiloGram(SpecificVolume):
 class Volume(GenericUnit):
     """Abstraction of volume units."""
 
+    __slots__ = ()
     property_name = "volume"
 
     def __div__(self, divisor):
         """Division by specific volume results mass."""
         if isinstance(divisor, SpecificVolume):
-            return KiloGram(self.base_value / CubicMeterPerKiloGram(divisor).value)
+            # liters over cubic meters per kilogram
+            return KiloGram(self.base_value / 1000.0 / divisor.base_value)
         else:
             return super(Volume, self).__mul__(divisor)
 
     @property
     def m3(self):
         """Volume using cubic meters."""
-        return CubicMeter(self.base_value / 1000.0)
+        return self.to(CubicMeter)
 
     @property
     def liter(self):
         """Volume using liters."""
-        return Liter(self.base_value)
+        return self.to(Liter)
 
 
 class Liter(Volume):
     """Liter unit."""
 
+    __slots__ = ()
     symbol = u"l"
 
     def __init__(self, value):
@@ -79,12 +86,18 @@ class Liter(Volume):
 class CubicMeter(Volume):
     """Cubic meter unit."""
 
+    __slots__ = ()
     symbol = u"m³"
 
     def __init__(self, value):
         """Create a volume instance started by cubic meters."""
         if isinstance(value, Volume):
-            value = Liter(value.base_value).m3.value
+            self.base_value = value.base_value
+            if value.__class__ is CubicMeter:
+                self.value = value.value
+            else:
+                self.value = value.base_value / 1000.0
+            return
         self.base_value = value * 1000.0
         self.value = float(value)
 
@@ -92,12 +105,13 @@ class CubicMeter(Volume):
 class Mass(GenericUnit):
     """Abstraction of mass units."""
 
+    __slots__ = ()
     property_name = "mass"
 
     @property
     def kilogram(self):
         """Mass using Kilograms."""
-        return KiloGram(self.base_value)
+        return self.to(KiloGram)
 
     @property
     def kg(self):
@@ -108,6 +122,7 @@ class Mass(GenericUnit):
 class KiloGram(Mass):
     """Kilogram unit."""
 
+    __slots__ = ()
     symbol = u"kg"
 
     def __init__(self, value):
@@ -116,3 +131,9 @@ class KiloGram(Mass):
             value = value.base_value
         self.base_value = float(value)
         self.value = self.base_value
+
+
+register(CubicMeterPerKiloGram)
+register(Liter)
+register(CubicMeter, 1000.0)
+register(KiloGram)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Many values of a unit at once, backed by NumPy arrays."""
+
+from __future__ import absolute_import
+
+import numpy
+
+from units import (GenericUnit, UnitMismatch, UnlogicalOperation, convert,
+                   scale_offset)
+from units.amount import CubicMeter, CubicMeterPerKiloGram, KiloGram
+from units.energy import KJPerKg, KiloJoule
+
+__all__ = ["QuantityArray"]
+__dir__ = __all__
+
+# Cross properties operations, same as the ones of scalar units.
+# (operation, property, other property): (result unit, unit of self values,
+# unit of other values)
+_PRODUCTS = {
+    # SpecificVolume.__mul__
+    ("mul", "specific_volume", "mass"): (CubicMeter, CubicMeterPerKiloGram,
+                                         KiloGram),
+    # SpecificEnergy.__mul__
+    ("mul", "specific_energy", "mass"): (KiloJoule, KJPerKg, KiloGram),
+    # Volume.__div__
+    ("div", "volume", "specific_volume"): (KiloGram, CubicMeter,
+                                           CubicMeterPerKiloGram),
+    # Energy.__div__
+    ("div", "energy", "mass"): (KJPerKg, KiloJoule, KiloGram),
+}
+# mass times specific property is the same product
+for (_operation, _a, _b), (_result, _unit_a, _unit_b) in list(_PRODUCTS.items()):
+    if _operation == "mul":
+        _PRODUCTS[(_operation, _b, _a)] = (_result, _unit_b, _unit_a)
+
+
+class QuantityArray(object):
+    """Array of values of one unit.
+
+    It behaves like the scalar units on a whole array at once: same
+    conversion properties (``kPa``, ``kelvin``, ``m3``...) and same
+    arithmetic, including the cross properties products.
+    """
+
+    __slots__ = ("unit", "value", "base_value")
+
+    def __init__(self, value, unit=None):
+        """Create an array of given unit values.
+
+        ``value`` may be anything NumPy takes as array, another
+        QuantityArray or a scalar unit instance. ``unit`` is the unit class,
+        it can be omitted for the last two to keep their unit.
+        """
+        if isinstance(value, (QuantityArray, GenericUnit)):
+            source = value.unit if isinstance(value, QuantityArray) else value.__class__
+            if unit is None:
+                unit = source
+            elif value.property_name != unit.property_name:
+                raise UnitMismatch("Cannot convert %s to %s" % (
+                                   value.property_name, unit.property_name))
+            self.unit = unit
+            self.base_value = numpy.asanyarray(value.base_value, dtype=float)
+            self.value = numpy.asanyarray(value.value, dtype=float)
+            if unit is not source:
+                self.value = convert(self.value, source, unit)
+        elif unit is None:
+            raise UnitMismatch("A unit is needed for plain values")
+        else:
+            scale, offset = scale_offset(unit)
+            self.unit = unit
+            self.value = numpy.asanyarray(value, dtype=float)
+            self.base_value = self.value * scale + offset
+
+    @property
+    def property_name(self):
+        """Property of the unit."""
+        return self.unit.property_name
+
+    @property
+    def symbol(self):
+        """Symbol of the unit."""
+        return self.unit.symbol
+
+    def to(self, unit):
+        """Same values in another unit of same property."""
+        if unit is self.unit:
+            return self
+        return QuantityArray(self, unit)
+
+    def __getattr__(self, name):
+        """Conversion properties of the scalar unit, like kPa or kelvin."""
+        if name in QuantityArray.__slots__:
+            # not set yet, while unpickling
+            raise AttributeError(name)
+        if not name.startswith("_") and isinstance(getattr(self.unit, name, None),
+                                                   property):
+            converted = getattr(self.unit(0), name)
+            if isinstance(converted, GenericUnit):
+                return self.to(converted.__class__)
+        raise AttributeError("%s has no attribute %s" % (self.unit, name))
+
+    def __getstate__(self):
+        """State for pickle, slots have no __dict__."""
+        return (self.unit, self.value, self.base_value)
+
+    def __setstate__(self, state):
+        """Restore pickled state."""
+        self.unit, self.value, self.base_value = state
+
+    def __unicode__(self):
+        """Unicode representation."""
+        return u"%s %s" % (self.value, self.symbol)
+
+    def __str__(self):
+        """String representation."""
+        return self.__unicode__().encode("utf-8")
+
+    def __repr__(self):
+        """Short representation."""
+        return self.__str__()
+
+    def __array__(self, dtype=None):
+        """Values in the array unit, used by numpy.asarray()."""
+        return numpy.asarray(self.value, dtype=dtype)
+
+    def __len__(self):
+        """Amount of values."""
+        return len(self.value)
+
+    def __getitem__(self, key):
+        """Scalar unit for an index, QuantityArray for slices and masks."""
+        value = self.value[key]
+        if numpy.ndim(value):
+            return QuantityArray(value, self.unit)
+        return self.unit(value)
+
+    def __iter__(self):
+        """Iterate over scalar units."""
+        for value in self.value:
+            yield self.unit(value)
+
+    def issameproperty(self, other):
+        """Check if these are the same kind of property as other one."""
+        try:
+            return self.property_name == other.property_name
+        except AttributeError:
+            return False
+
+    def _cross(self, operation, other):
+        """Operation with another property or None if there isn't one."""
+        try:
+            result, unit, other_unit = _PRODUCTS[(operation, self.property_name,
+                                                  other.property_name)]
+        except (KeyError, AttributeError):
+            return None
+        a = self.to(unit).value
+        b = QuantityArray(other, other_unit).value
+        return QuantityArray(a * b if operation == "mul" else a / b, result)
+
+    def __mul__(self, multiplier):
+        """Multiply method."""
+        result = self._cross("mul", multiplier)
+        if result is not None:
+            return result
+        if isinstance(multiplier, (QuantityArray, GenericUnit)):
+            raise UnlogicalOperation(self, multiplier)
+        return QuantityArray(self.value * multiplier, self.unit)
+
+    def __rmul__(self, multiplier):
+        """Multiply method when a number comes first."""
+        return self * multiplier
+
+    def __imul__(self, multiplier):
+        """Multiply method."""
+        self = self * multiplier
+        return self
+
+    def __div__(self, divisor):
+        """Division method."""
+        result = self._cross("div", divisor)
+        if result is not None:
+            return result
+        if isinstance(divisor, (QuantityArray, GenericUnit)):
+            raise UnlogicalOperation(self, divisor)
+        return QuantityArray(self.value / numpy.asanyarray(divisor, dtype=float),
+                             self.unit)
+
+    __truediv__ = __div__
+
+    def __idiv__(self, divisor):
+        """Division method."""
+        self = self / divisor
+        return self
+
+    __itruediv__ = __idiv__
+
+    def __add__(self, added):
+        """Addition method."""
+        if self.issameproperty(added):
+            return QuantityArray(self.value + QuantityArray(added, self.unit).value,
+                                 self.unit)
+        elif isinstance(added, (QuantityArray, GenericUnit)):
+            raise UnlogicalOperation(self, added)
+        return QuantityArray(self.value + added, self.unit)
+
+    def __iadd__(self, added):
+        """Addition method."""
+        self = self + added
+        return self
+
+    def __sub__(self, subtractor):
+        """Subtraction method."""
+        return self + (subtractor * -1)
+
+    def __isub__(self, subtractor):
+        """Subtraction method."""
+        self = self - subtractor
+        return self
@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 """Energy units."""
 
-from units import GenericUnit
+from __future__ import absolute_import
+
+from units import GenericUnit, register
 from units.amount import Mass, KiloGram
 
 __all__ = ["KJPerKg", "Joule", "KiloJoule"]
@@ -12,15 +14,17 @@ __dir__ = __all__
 class SpecificEnergy(GenericUnit):
     """Abstraction of Specific energy."""
 
+    __slots__ = ()
+
     @property
     def kJperkg(self):
-        """Specific energy using Joules."""
-        return Joule(self.base_value)
+        """Specific energy using kJ/kg."""
+        return self.to(KJPerKg)
 
     def __mul__(self, multiplier):
         """Specific volume versus mass equals volume."""
         if isinstance(multiplier, Mass):
-            return KiloJoule(KiloGram(multiplier).value * self.base_value)
+            return KiloJoule(multiplier.base_value * self.base_value)
         else:
             return super(SpecificEnergy, self).__mul__(multiplier)
 
@@ -29,6 +33,7 @@ class SpecificEnergy(GenericUnit):
 
 class KJPerKg(SpecificEnergy):
 
+    __slots__ = ()
     symbol = u"kJ/kg"
 
     def __init__(self, value):
@@ -42,27 +47,29 @@ class KJPerKg(SpecificEnergy):
 class Energy(GenericUnit):
     """Abstraction of energy."""
 
+    __slots__ = ()
     property_name = "energy"
 
     @property
     def joule(self):
         """Energy using Joules."""
-        return Joule(self.base_value)
+        return self.to(Joule)
 
     @property
     def kJ(self):
         """Energy using Kilo Joules."""
-        return KiloJoule(self.base_value / 1000.0)
+        return self.to(KiloJoule)
 
     def __div__(self, divisor):
         """Division method."""
         if isinstance(divisor, Mass):
-            return KJPerKg(self.kJ.value / divisor.kg.value)
+            return KJPerKg(self.base_value / 1000.0 / divisor.base_value)
         return super(self.__class__, self).__div__(divisor)
 
 
 class Joule(Energy):
 
+    __slots__ = ()
     symbol = u"J"
 
     def __init__(self, value):
@@ -75,11 +82,22 @@ class Joule(Energy):
 
 class KiloJoule(Energy):
 
+    __slots__ = ()
     symbol = u"kJ"
 
     def __init__(self, value):
         """Create a energy instance started by kiloJoules."""
         if isinstance(value, Energy):
-            value = Joule(value.base_value).kJ.value
+            self.base_value = value.base_value
+            if value.__class__ is KiloJoule:
+                self.value = value.value
+            else:
+                self.value = value.base_value / 1000.0
+            return
         self.base_value = value * 1000.0
         self.value = float(value)
+
+
+register(KJPerKg)
+register(Joule)
+register(KiloJoule, 1000.0)
@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 """Pressure units."""
 
-from units import GenericUnit
+from __future__ import absolute_import
+
+from units import GenericUnit, register
 
 __all__ = ["Pascal", "KiloPascal", "Atmosphere", "Bar", "PSI",
            "PoundSquareInch"]
@@ -12,32 +14,33 @@ __dir__ = __all__
 class Pressure(GenericUnit):
     """Abstraction of pressure units."""
 
+    __slots__ = ()
     property_name = "pressure"
 
     @property
     def pascal(self):
         """Pressure using Pascals."""
-        return Pascal(self.base_value)
+        return self.to(Pascal)
 
     @property
     def bar(self):
         """Pressure using Bar."""
-        return Bar(self.base_value / 100000.0)
+        return self.to(Bar)
 
     @property
     def atmosphere(self):
         """Pressure using Atmosferes."""
-        return Atmosphere(self.base_value / 101325.0)
+        return self.to(Atmosphere)
 
     @property
     def kPa(self):
         """Pressure using Kilo Pascal."""
-        return KiloPascal(self.base_value / 1000.0)
+        return self.to(KiloPascal)
 
     @property
     def psi(self):
         """Pressure using Pound per square inch."""
-        return PoundSquareInch(self.base_value / 6894.76)
+        return self.to(PoundSquareInch)
 
     @property
     def kilo_pascal(self):
@@ -48,6 +51,7 @@ class Pressure(GenericUnit):
 class Pascal(Pressure):
     """Pascal unit."""
 
+    __slots__ = ()
     symbol = u"Pa"
 
     def __init__(self, value):
@@ -61,12 +65,18 @@ class Pascal(Pressure):
 class KiloPascal(Pressure):
     """Kilo Pascal unit."""
 
+    __slots__ = ()
     symbol = u"kPa"
 
     def __init__(self, value):
         """Create a pressure instance started by Pascals."""
         if isinstance(value, Pressure):
-            value = Pascal(value.base_value).kPa.value
+            self.base_value = value.base_value
+            if value.__class__ is KiloPascal:
+                self.value = value.value
+            else:
+                self.value = value.base_value / 1000.0
+            return
         self.base_value = value * 1000.0
         self.value = float(value)
 
@@ -74,12 +84,18 @@ class KiloPascal(Pressure):
 class Bar(Pressure):
     """Bar unit."""
 
+    __slots__ = ()
     symbol = u"bar"
 
     def __init__(self, value):
         """Create a pressure instance started by Bars."""
         if isinstance(value, Pressure):
-            value = Pascal(value.base_value).bar.value
+            self.base_value = value.base_value
+            if value.__class__ is Bar:
+                self.value = value.value
+            else:
+                self.value = value.base_value / 100000.0
+            return
         self.base_value = value * 100000.0
         self.value = float(value)
 
@@ -87,12 +103,18 @@ class Bar(Pressure):
 class Atmosphere(Pressure):
     """Atmosfere unit."""
 
+    __slots__ = ()
     symbol = u"atm"
 
     def __init__(self, value):
         """Create a pressure instance started by atms."""
         if isinstance(value, Pressure):
-            value = Pascal(value.base_value).atmosphere.value
+            self.base_value = value.base_value
+            if value.__class__ is Atmosphere:
+                self.value = value.value
+            else:
+                self.value = value.base_value / 101325.0
+            return
         self.base_value = value * 101325.0
         self.value = float(value)
 
@@ -100,12 +122,18 @@ class Atmosphere(Pressure):
 class PoundSquareInch(Pressure):
     """Pound per Square inch unit."""
 
+    __slots__ = ()
     symbol = u"psi"
 
     def __init__(self, value):
         """Create a pressure instance started by psi."""
         if isinstance(value, Pressure):
-            value = Pascal(value.base_value).psi.value
+            self.base_value = value.base_value
+            if isinstance(value, PoundSquareInch):
+                self.value = value.value
+            else:
+                self.value = value.base_value / 6894.76
+            return
         self.base_value = value * 6894.76
         self.value = float(value)
 
@@ -113,4 +141,11 @@ class PoundSquareInch(Pressure):
 class PSI(PoundSquareInch):
     """Alias for PoundSquareInch."""
 
-    pass
+    __slots__ = ()
+
+
+register(Pascal)
+register(KiloPascal, 1000.0)
+register(Bar, 100000.0)
+register(Atmosphere, 101325.0)
+register(PoundSquareInch, 6894.76)
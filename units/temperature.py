@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 """Temperature units."""
 
-from units import GenericUnit
+from __future__ import absolute_import
+
+from units import GenericUnit, register
 
 __all__ = ["Celcius", "Kelvin", "Fahrenheit"]
 __dir__ = __all__
@@ -11,33 +13,40 @@ __dir__ = __all__
 class Temperature(GenericUnit):
     """Comparative measurement of hot or cold."""
 
+    __slots__ = ()
     property_name = "temperature"
 
     @property
     def kelvin(self):
         """Temperature using Kelvin scale."""
-        return Kelvin(self.base_value)
+        return self.to(Kelvin)
 
     @property
     def celcius(self):
         """Temperature using Celcius scale."""
-        return Celcius(self.base_value - 273.15)
+        return self.to(Celcius)
 
     @property
     def fahrenheit(self):
         """Temperature using Fahrenheit scale."""
-        return Fahrenheit((self.base_value * (9/5.0)) - 459.67)
+        return self.to(Fahrenheit)
 
 
 class Celcius(Temperature):
     """Temperature on Celcius degress."""
 
+    __slots__ = ()
     symbol = u"°C"
 
     def __init__(self, value):
         """Create a temperature instance started by celcius degress."""
         if isinstance(value, Temperature):
-            value = Kelvin(value.base_value).celcius.value
+            self.base_value = value.base_value
+            if value.__class__ is Celcius:
+                self.value = value.value
+            else:
+                self.value = value.base_value - 273.15
+            return
         self.base_value = value + 273.15
         self.value = float(value)
 
@@ -45,6 +54,7 @@ class Celcius(Temperature):
 class Kelvin(Temperature):
     """Temperature on Kelvin degress."""
 
+    __slots__ = ()
     symbol = u"°K"
 
     def __init__(self, value):
@@ -58,11 +68,22 @@ class Kelvin(Temperature):
 class Fahrenheit(Temperature):
     """Temperature on Fahrenheit degress."""
 
+    __slots__ = ()
     symbol = u"°F"
 
     def __init__(self, value):
         """Create a temperature instance started by celcius degress."""
         if isinstance(value, Temperature):
-            value = Kelvin(value.base_value).fahrenheit.value
+            self.base_value = value.base_value
+            if value.__class__ is Fahrenheit:
+                self.value = value.value
+            else:
+                self.value = (value.base_value * (9/5.0)) - 459.67
+            return
         self.base_value = (value + 459.67) * 5/9.0
         self.value = float(value)
+
+
+register(Kelvin)
+register(Celcius, 1.0, 273.15)
+register(Fahrenheit, 5 / 9.0, 459.67 * 5 / 9.0)